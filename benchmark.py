@@ -0,0 +1,252 @@
+# benchmark.py
+
+# Suíte de benchmarks do interpretador, com um acervo de programas gerados.
+#
+# Cada cenário gera um programa SCL que estressa uma parte diferente do interpretador
+# (expressões profundas, muitas atribuições seguidas, laços aninhados, muitos IFs,
+# blocos grandes de declarações, e o laço FOR "pesado" que rodamos em produção).
+# Para cada um são medidos, separadamente:
+#   - a análise léxica (tokenize), em segundos e em tokens/s;
+#   - a análise sintática (build_ast sobre os tokens já prontos);
+#   - a execução completa em cada motor de ENGINES.
+# Cada medida é a melhor de algumas repetições, para reduzir o ruído da máquina.
+#
+# Os resultados podem ser gravados em JSON e comparados com uma base salva antes:
+#   python benchmark.py                          # Roda e mostra a tabela.
+#   python benchmark.py --json resultado.json    # Também grava o JSON.
+#   python benchmark.py --comparar base.json     # Compara com a base (código de saída 1 se piorou além do limite).
+#   python benchmark.py --cenarios ifs,laco_for --escala 2 --repeticoes 5
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import platform
+import sys
+import time
+
+from scl_parser import SCLParser, tokenize, ENGINES
+
+FORMATO_JSON = 1 # Versão do formato do arquivo de resultados.
+
+
+# --- Acervo de programas ---
+# Cada gerador recebe um "tamanho" e devolve o código-fonte. Os tamanhos padrão foram
+# escolhidos para cada cenário rodar em poucas centenas de milissegundos.
+
+def gera_programa_laco(iteracoes):
+    """Um programa "pesado em laços", parecido com os programas gerados que rodamos em produção."""
+    return f"""
+    REAL a;
+    REAL c;
+    INT i;
+    a := 2.0;
+    c := 0.0;
+    FOR i := 1 TO {iteracoes} DO
+        // Comentário dentro do laço: é lido uma única vez, na tokenização.
+        c := c + i * a - (a + 1.0) / 3.0;
+        IF c > 1000.0 THEN c := c - i; ELSE c := c + 1.0; END_IF;
+    END_FOR;
+    PRINT c;
+    """
+
+
+def gera_expressoes_aninhadas(comandos, profundidade=30):
+    """Expressões com muitos parênteses aninhados e cadeias longas de operadores."""
+    linhas = ["REAL x;", "REAL y;", "BOOL b;", "x := 1.5;", "b := FALSE;"]
+    aninhada = "x"
+    for nivel in range(profundidade): aninhada = f"({aninhada} {'+-*'[nivel % 3]} {nivel % 7 + 1}.0)"
+    cadeia = " + ".join(f"x * {k}.0" for k in range(1, profundidade * 4))
+    for k in range(comandos):
+        linhas.append(f"y := {aninhada};" if k % 2 == 0 else f"y := {cadeia};")
+        linhas.append(f"b := NOT (y > x) OR ((x < {k}.0) AND (y <> x)) OR (x >= 2.0 AND NOT b = FALSE);")
+    linhas.append("PRINT y;")
+    return "\n".join(linhas)
+
+
+def gera_atribuicoes_em_linha(comandos):
+    """Um bloco longo de atribuições simples, sem laços: tudo executa uma única vez."""
+    linhas = [f"INT v{k};" for k in range(10)] + [f"v{k} := {k};" for k in range(10)]
+    for k in range(comandos):
+        destino, a, b = k % 10, (k * 3) % 10, (k * 7) % 10
+        linhas.append(f"v{destino} := v{a} + v{b} * 2 - {k % 100};")
+    linhas.append("PRINT v0;")
+    return "\n".join(linhas)
+
+
+def gera_lacos_aninhados(tamanho):
+    """FOR dentro de FOR dentro de WHILE: a execução domina, a análise é pequena."""
+    return f"""
+    INT i; INT j; INT k; INT total;
+    total := 0; k := 0;
+    WHILE k < 4 DO
+        FOR i := 1 TO {tamanho} DO
+            FOR j := 1 TO {tamanho} DO
+                total := total + i * j - k;
+            END_FOR;
+        END_FOR;
+        k := k + 1;
+    END_WHILE;
+    PRINT total;
+    """
+
+
+def gera_ifs(iteracoes):
+    """Muitos IFs encadeados e aninhados, com condições que mudam a cada iteração."""
+    ramos = []
+    for k in range(12):
+        ramos.append(f"""
+        IF (i - {k}) * (i + {k}) > {k * 40} AND NOT (i = {k}) THEN
+            IF r > {k}.5 THEN r := r - {k}.25; ELSE r := r + 1.0; END_IF;
+            n := n + 1;
+        ELSE
+            IF (i > {k * 3}) OR (n < {k}) THEN n := n - 1; END_IF;
+        END_IF;""")
+    return f"""
+    INT i; INT n; REAL r;
+    n := 0; r := 0.0;
+    FOR i := 1 TO {iteracoes} DO{''.join(ramos)}
+    END_FOR;
+    PRINT n; PRINT r;
+    """
+
+
+def gera_declaracoes(quantidade):
+    """Um bloco grande de declarações (cada uma vira um slot), seguido de uma atribuição para cada variável."""
+    tipos = ("INT", "REAL", "BOOL")
+    valores = ("1", "1.0", "TRUE")
+    linhas = [f"{tipos[k % 3]} var_{k};" for k in range(quantidade)]
+    linhas += [f"var_{k} := {valores[k % 3]};" for k in range(quantidade)]
+    return "\n".join(linhas)
+
+
+# Nome do cenário -> (gerador, tamanho padrão).
+CENARIOS = {
+    'expressoes_aninhadas': (gera_expressoes_aninhadas, 150),
+    'atribuicoes_em_linha': (gera_atribuicoes_em_linha, 3000),
+    'lacos_aninhados': (gera_lacos_aninhados, 40),
+    'ifs': (gera_ifs, 300),
+    'declaracoes': (gera_declaracoes, 2000),
+    'laco_for': (gera_programa_laco, 5000),
+}
+
+
+# --- Medição ---
+
+def melhor_tempo(funcao, repeticoes, preparo=None):
+    """O menor tempo (em segundos) de 'repeticoes' chamadas; 'preparo()' roda antes de cada uma, fora da medição."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        argumento = preparo() if preparo is not None else None
+        inicio = time.perf_counter()
+        funcao(argumento)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def cronometra_fases(codigo, repeticoes=3, motores=None):
+    """Mede a análise léxica, a análise sintática e a execução (em cada motor) de um programa.
+    Devolve um dicionário pronto para o JSON."""
+    tokens = tokenize(codigo)
+    tempo_lex = melhor_tempo(lambda _: tokenize(codigo), repeticoes)
+
+    def monta_ast(_):
+        parser = SCLParser()
+        parser.inicializa(codigo)
+        parser.tokens = tokens # Só a análise sintática: os tokens já estão prontos (o parser não altera o TokenStore).
+        return parser.build_ast()
+    tempo_parse = melhor_tempo(monta_ast, repeticoes)
+
+    ast = monta_ast(None)
+    tempos_exec = {}
+    for nome in motores or ENGINES:
+        motor = ENGINES[nome]
+        def executa(copia):
+            with contextlib.redirect_stdout(io.StringIO()): motor(copia, {}) # Descarta as saídas do PRINT.
+        # Cada execução recebe uma cópia nova da AST, para que nada do que um motor guarda nos nós
+        # (ex: laços já compilados do 'tiered') seja aproveitado pela repetição seguinte.
+        tempos_exec[nome] = melhor_tempo(executa, repeticoes, preparo=lambda: copy.deepcopy(ast))
+
+    return {
+        'bytes': len(codigo.encode('utf-8')),
+        'tokens': len(tokens),
+        'lexico_s': tempo_lex,
+        'tokens_por_s': len(tokens) / tempo_lex if tempo_lex else 0.0,
+        'parse_s': tempo_parse,
+        'execucao_s': tempos_exec,
+    }
+
+
+def executa_suite(cenarios=None, escala=1.0, repeticoes=3, motores=None):
+    resultados = {}
+    for nome in cenarios or CENARIOS:
+        gerador, tamanho = CENARIOS[nome]
+        tamanho = max(1, int(tamanho * escala))
+        resultados[nome] = {'tamanho': tamanho, **cronometra_fases(gerador(tamanho), repeticoes, motores)}
+    return {
+        'formato': FORMATO_JSON,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticoes': repeticoes,
+        'cenarios': resultados,
+    }
+
+
+# --- Relatórios ---
+
+def metricas_de_tempo(cenario):
+    """Os tempos de um cenário como pares (nome da métrica, segundos), na ordem da tabela."""
+    yield 'lexico', cenario['lexico_s']
+    yield 'parse', cenario['parse_s']
+    for motor, tempo in cenario['execucao_s'].items(): yield f'exec:{motor}', tempo
+
+
+def imprime_tabela(resultado):
+    for nome, cenario in resultado['cenarios'].items():
+        print(f"{nome} (tamanho {cenario['tamanho']}, {cenario['tokens']} tokens, {cenario['bytes']} bytes):")
+        print(f"  {'lexico':<14s} {cenario['lexico_s'] * 1000:10.2f} ms  ({cenario['tokens_por_s']:,.0f} tokens/s)")
+        for metrica, tempo in list(metricas_de_tempo(cenario))[1:]:
+            print(f"  {metrica:<14s} {tempo * 1000:10.2f} ms")
+
+
+def compara(resultado, base, limite):
+    """Mostra a razão (atual / base) de cada tempo e devolve a lista de métricas que pioraram mais do que 'limite'."""
+    pioras = []
+    print(f"\nComparação com a base (razão atual/base; piora se > {1 + limite:.2f}):")
+    for nome, cenario in resultado['cenarios'].items():
+        cenario_base = base['cenarios'].get(nome)
+        if cenario_base is None or cenario_base['tamanho'] != cenario['tamanho']:
+            print(f"  {nome}: sem base comparável"); continue
+        tempos_base = dict(metricas_de_tempo(cenario_base))
+        for metrica, tempo in metricas_de_tempo(cenario):
+            if metrica not in tempos_base: continue
+            razao = tempo / tempos_base[metrica] if tempos_base[metrica] else float('inf')
+            marca = "  <-- PIOROU" if razao > 1 + limite else ("  (melhorou)" if razao < 1 - limite else "")
+            if razao > 1 + limite: pioras.append(f"{nome}/{metrica}")
+            print(f"  {nome + '/' + metrica:<36s} {razao:6.2f}x{marca}")
+    return pioras
+
+
+if __name__ == '__main__':
+    argumentos = argparse.ArgumentParser(description="Benchmarks do interpretador SCL.")
+    argumentos.add_argument('--cenarios', help=f"lista separada por vírgulas (padrão: todos): {', '.join(CENARIOS)}")
+    argumentos.add_argument('--motores', help=f"lista separada por vírgulas (padrão: todos): {', '.join(ENGINES)}")
+    argumentos.add_argument('--escala', type=float, default=1.0, help="multiplica o tamanho de todos os cenários")
+    argumentos.add_argument('--repeticoes', type=int, default=3, help="cada medida é a melhor de N repetições")
+    argumentos.add_argument('--json', help="grava os resultados neste arquivo JSON")
+    argumentos.add_argument('--comparar', help="arquivo JSON de uma execução anterior (a base)")
+    argumentos.add_argument('--limite', type=float, default=0.10, help="piora tolerada na comparação (0.10 = 10%%)")
+    opcoes = argumentos.parse_args()
+
+    resultado = executa_suite(opcoes.cenarios.split(',') if opcoes.cenarios else None, opcoes.escala,
+                              opcoes.repeticoes, opcoes.motores.split(',') if opcoes.motores else None)
+    imprime_tabela(resultado)
+    if opcoes.json:
+        with open(opcoes.json, 'w', encoding='utf-8') as arquivo: json.dump(resultado, arquivo, indent=2)
+    if opcoes.comparar:
+        with open(opcoes.comparar, encoding='utf-8') as arquivo: base = json.load(arquivo)
+        pioras = compara(resultado, base, opcoes.limite)
+        if pioras:
+            print(f"\n{len(pioras)} métrica(s) pioraram: {', '.join(pioras)}")
+            sys.exit(1)
@@ -6,6 +6,9 @@
 # que a "herdam" a implementar certos métodos.
 from abc import ABC, abstractmethod
 
+# A exceção lançada quando o caractere lido não é o esperado (veja scl_errors.py).
+from scl_errors import SCLSyntaxError
+
 # Define a classe FHOParser. Ao herdar de 'ABC', ela se torna uma classe base abstrata.
 class FHOParser(ABC):
     
@@ -64,9 +67,8 @@ class FHOParser(ABC):
                 self.lookAhead = '#'
         else:
             # Se não forem iguais, a sintaxe está incorreta.
-            # Imprime uma mensagem de erro detalhada e encerra o programa.
-            print(f"ERRO SINTATICO (FHOParser char-level): esperado: '{esperado}', lido: '{self.lookAhead}' na posicao {self.posicao}")
-            exit(1) 
+            # Lança um erro de sintaxe com a mensagem detalhada (quem chamou decide o que fazer com ele).
+            raise SCLSyntaxError(f"Erro Sintático (FHOParser char-level): esperado: '{esperado}', lido: '{self.lookAhead}' na posicao {self.posicao}")
     
     # O decorador '@abstractmethod' define um método que NÃO tem implementação
     # nesta classe, mas que OBRIGATORIAMENTE deve ser implementado por qualquer
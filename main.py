@@ -2,6 +2,18 @@
 # de análise léxica, sintática e de execução.
 from scl_parser import SCLParser 
 
+# O cache em disco das ASTs já analisadas (pasta __sclcache__).
+from scl_cache import ProgramCache
+
+# A exceção base dos erros de um programa SCL (veja scl_errors.py).
+from scl_errors import SCLError
+
+# A verificação estática (sem executar o programa).
+from scl_checker import check_source
+
+# Importa a biblioteca sys, para ler o motor de execução escolhido na linha de comando.
+import sys
+
 # Importa a biblioteca JSON. Usaremos ela apenas no final, para imprimir
 # a tabela de símbolos (um dicionário Python) de uma forma bonita e legível.
 import json
@@ -71,7 +83,22 @@ if __name__ == '__main__':
     
     # 1. CRIAÇÃO: Criamos uma instância (um objeto) do nosso interpretador.
     # Neste momento, ele está "vazio", pronto para receber o código.
-    parser = SCLParser()
+    # O motor de execução pode ser escolhido na linha de comando (ex: python main.py vm).
+    # 'ast' percorre a árvore sintática; 'vm' compila para bytecode e usa a máquina virtual;
+    # 'tiered' percorre a árvore, mas compila para código Python os laços que ficarem "quentes".
+    # A opção -O liga o otimizador (dobra de constantes, blocos mortos e invariantes de laço).
+    # A opção --no-cache desliga o cache em disco da AST (ele também pode ser desligado com SCL_NO_CACHE=1).
+    # A opção --profile mede o tempo de cada linha e mostra as linhas mais "quentes" no final.
+    # A opção --check só verifica o código (scl_checker.py), sem executá-lo, e mostra todos os problemas encontrados.
+    if '--check' in sys.argv:
+        diagnosticos = check_source(scl_code)
+        for diagnostico in diagnosticos: print(diagnostico)
+        print(f"\n--- Verificação: {len(diagnosticos)} problema(s) encontrado(s) ---")
+        sys.exit(1 if any(diagnostico.severity == 'error' for diagnostico in diagnosticos) else 0)
+    argumentos = [arg for arg in sys.argv[1:] if arg not in ('-O', '--no-cache', '--profile')]
+    engine = argumentos[0] if argumentos else 'ast'
+    cache = ProgramCache(enabled=False) if '--no-cache' in sys.argv else ProgramCache()
+    parser = SCLParser(engine, optimize='-O' in sys.argv, cache=cache, profile='--profile' in sys.argv)
     
     # 2. INICIALIZAÇÃO: Carregamos a string scl_code para dentro do objeto parser.
     # O método `inicializa` prepara o interpretador para começar a análise,
@@ -91,6 +118,8 @@ if __name__ == '__main__':
         # 4. SUCESSO: Se o método `parse()` terminar sem lançar nenhum erro,
         # significa que todo o código SCL foi analisado e executado com sucesso.
         print("\nAnálise e execução concluídas com sucesso!")
+        if parser.optimization_stats is not None: print(f"Otimizador: {parser.optimization_stats}")
+        if parser.profile_stats is not None: print(f"\n--- Profiler ---\n{parser.profile_stats.report()}")
         
         # Imprimimos o estado final da tabela de símbolos para verificar os valores
         # finais de todas as variáveis. O json.dumps formata o dicionário para
@@ -98,11 +127,12 @@ if __name__ == '__main__':
         print("\n--- Tabela de Símbolos Final (com valores) ---")
         print(json.dumps(parser.symbol_table, indent=4))
         
-    # Este bloco captura os erros que nós mesmos programamos no parser
-    # (com a chamada `exit(1)`).
-    except SystemExit as e:
-        if e.code == 1:
-            print("\n--- Análise falhou ---")
+    # Este bloco captura os erros do próprio programa SCL (léxicos, sintáticos,
+    # semânticos e de execução), que o interpretador lança como SCLError.
+    except SCLError as e:
+        print(f"\n{e}")
+        if e.token is not None: print(f"  Token atual: {e.token}")
+        print("\n--- Análise falhou ---")
             
     # Este bloco captura quaisquer outros erros inesperados do Python que
     # possam ter ocorrido, ajudando na depuração.
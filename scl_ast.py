@@ -0,0 +1,170 @@
+# scl_ast.py
+
+# Este arquivo define os nós da Árvore Sintática Abstrata (AST) da linguagem SCL.
+# O SCLParser lê os tokens UMA única vez e monta uma árvore com estas classes;
+# depois, o SCLEvaluator (scl_evaluator.py) percorre a árvore para executar o programa.
+# Assim, o custo da análise sintática é pago uma só vez, não importa quantas vezes
+# um laço seja repetido ou quantos blocos sejam pulados.
+
+import copy
+
+# Classe base de todos os nós. Cada nó guarda a linha do código onde começou,
+# para que os erros de execução possam apontar a linha correta.
+class Node:
+    def __init__(self, lineno=1):
+        self.lineno = lineno
+
+
+# --- Nós de Comandos (Statements) ---
+
+class Program(Node): # Regra: program -> statement_list
+    def __init__(self, statements, lineno=1):
+        super().__init__(lineno)
+        self.statements = statements  # Lista de comandos do programa, na ordem do código.
+
+class Declaration(Node): # Regra: declaration -> TYPE IDENTIFIER
+    def __init__(self, var_type, name, lineno=1):
+        super().__init__(lineno)
+        self.var_type = var_type  # Um de TokenType.TYPE_INT, TYPE_REAL ou TYPE_BOOL.
+        self.name = name
+
+class Assignment(Node): # Regra: assignment -> ID := expression
+    def __init__(self, name, expr, lineno=1):
+        super().__init__(lineno)
+        self.name = name
+        self.expr = expr
+
+class IfStatement(Node): # Regra: IF expression THEN statement_list (ELSE statement_list)? END_IF
+    def __init__(self, condition, then_body, else_body=None, lineno=1):
+        super().__init__(lineno)
+        self.condition = condition
+        self.then_body = then_body  # Lista de comandos do bloco THEN.
+        self.else_body = else_body  # Lista de comandos do bloco ELSE, ou None se não houver ELSE.
+
+class WhileStatement(Node): # Regra: WHILE expression DO statement_list END_WHILE
+    def __init__(self, condition, body, lineno=1):
+        super().__init__(lineno)
+        self.condition = condition
+        self.body = body
+
+class ForStatement(Node): # Regra: FOR ID := expr TO expr DO statement_list END_FOR
+    def __init__(self, var_name, start, end, body, lineno=1):
+        super().__init__(lineno)
+        self.var_name = var_name
+        self.start = start
+        self.end = end
+        self.body = body
+
+class PrintStatement(Node): # Regra: print_statement -> PRINT expression
+    def __init__(self, expr, lineno=1):
+        super().__init__(lineno)
+        self.expr = expr
+
+
+# --- Nós de Expressões ---
+# Cada nível da gramática de expressões (logic_expr, logic_term, logic_factor,
+# comparison, arith_expr, term, factor) tem o seu tipo de nó correspondente. No parser
+# esses níveis são as precedências da tabela OPERATORS (scl_parser.py).
+
+class BinaryOp(Node): # Base comum dos operadores binários; 'op' é um TokenType (ex: TokenType.PLUS).
+    def __init__(self, op, left, right, lineno=1):
+        super().__init__(lineno)
+        self.op = op
+        self.left = left
+        self.right = right
+
+class LogicOp(BinaryOp): # logic_expr (OR) e logic_term (AND).
+    pass
+
+class Comparison(BinaryOp): # comparison (=, <>, <, <=, >, >=).
+    pass
+
+class ArithOp(BinaryOp): # arith_expr (+, -) e term (*, /).
+    pass
+
+class NotOp(Node): # logic_factor (NOT).
+    def __init__(self, operand, lineno=1):
+        super().__init__(lineno)
+        self.operand = operand
+
+class Literal(Node): # factor: literal numérico (INT/REAL) ou booleano (TRUE/FALSE).
+    def __init__(self, value, lineno=1):
+        super().__init__(lineno)
+        self.value = value
+
+class Variable(Node): # factor: leitura de uma variável.
+    def __init__(self, name, lineno=1):
+        super().__init__(lineno)
+        self.name = name
+
+class Convert(Node): # Conversão de tipo inserida pela inferência de tipos (scl_types.py); não vem da gramática.
+    def __init__(self, target, operand, lineno=1):
+        super().__init__(lineno)
+        self.target = target    # O tipo de destino: TokenType.TYPE_INT, TYPE_REAL ou TYPE_BOOL.
+        self.operand = operand
+
+
+# --- Percursos sem recursão ---
+# O parser aceita expressões de qualquer profundidade (milhares de parênteses aninhados, ou uma
+# cadeia 'x + x + ... + x', que vira uma árvore com um nível por operador). Por isso as passagens
+# sobre as expressões usam uma pilha explícita, e não a recursão do Python: a profundidade da
+# árvore não fica limitada pelo tamanho da pilha de chamadas.
+
+def operands(node):
+    """Os operandos de um nó de expressão, da esquerda para a direita (nenhum para Literal e Variable)."""
+    if isinstance(node, BinaryOp): return (node.left, node.right)
+    if type(node) is NotOp or type(node) is Convert: return (node.operand,)
+    return ()
+
+
+def reduce_expression(node, visit):
+    """Calcula visit(nó, *valores_dos_operandos) de baixo para cima e devolve o valor da raiz.
+    Os nós são visitados na mesma ordem de uma função recursiva (pós-ordem, da esquerda para a direita).
+    Na pilha, abaixo dos operandos de cada nó, fica o próprio nó marcado como (nó,): quando ele sai,
+    os valores dos operandos são os últimos de 'values'."""
+    values, pending = [], [node]
+    while pending:
+        node = pending.pop()
+        node_type = type(node)
+        if node_type is tuple:
+            node = node[0]
+            if type(node) is NotOp or type(node) is Convert: values[-1] = visit(node, values[-1])
+            else: right = values.pop(); values[-1] = visit(node, values[-1], right)
+        elif node_type is Variable or node_type is Literal: values.append(visit(node))
+        elif node_type is NotOp or node_type is Convert: pending.append((node,)); pending.append(node.operand)
+        else:
+            left, right = node.left, node.right
+            if (type(left) is Variable or type(left) is Literal) and (type(right) is Variable or type(right) is Literal):
+                values.append(visit(node, visit(left), visit(right))) # Atalho: os dois operandos são folhas.
+            else: pending.append((node,)); pending.append(right); pending.append(left)
+    return values[0]
+
+
+def walk_expression(node):
+    """Todos os nós de uma expressão, em pré-ordem (cada nó antes dos seus operandos, da esquerda para a direita)."""
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        yield node
+        pending.extend(reversed(operands(node)))
+
+
+def copy_tree(root):
+    """Cópia profunda de um nó ou de uma lista de nós (ex: os comandos de um Program), sem recursão:
+    o copy.deepcopy do Python desce um nível da pilha de chamadas por nível da árvore."""
+    copies = {} # id do original -> cópia (um nó referenciado duas vezes continua sendo um só).
+    pending = []
+    def copied(value):
+        if isinstance(value, Node):
+            if id(value) not in copies: copies[id(value)] = copy.copy(value); pending.append(copies[id(value)])
+            return copies[id(value)]
+        if type(value) is list: value = list(value); pending.append(value)
+        return value
+    result = copied(root)
+    while pending:
+        item = pending.pop()
+        if type(item) is list: item[:] = [copied(value) for value in item]
+        else:
+            for name, value in vars(item).items():
+                if isinstance(value, Node) or type(value) is list: setattr(item, name, copied(value))
+    return result
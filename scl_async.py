@@ -0,0 +1,151 @@
+# scl_async.py
+
+# Muitos programas SCL no mesmo processo, como tarefas do asyncio (ex: um programa por dispositivo
+# simulado), sem uma thread ou um processo por programa.
+#
+# Cada programa é compilado para bytecode (scl_bytecode.py) e roda em uma SCLTask, com os seus próprios
+# slots. A VM executa o programa em fatias: no fim de uma volta de laço (instrução JUMP_BACK), depois de
+# cerca de 'budget' instruções, ela devolve o controle, e a tarefa cede a vez às outras (await). Assim um
+# WHILE longo não trava o event loop, e as tarefas se revezam em ordem (a fila de prontos do asyncio é FIFO).
+#
+#   - A saída do PRINT vai para um "sink" assíncrono por tarefa: async def sink(tarefa, valor). Os valores
+#     de uma fatia são entregues em ordem no fim dela, antes de a tarefa ceder a vez; um sink lento (ex:
+#     queue_sink() com uma fila limitada) segura a sua tarefa, e não as outras. Sem sink, os valores
+#     ficam em task.output.
+#   - Cada tarefa guarda o tempo de CPU gasto nas suas fatias (time.thread_time, então o tempo esperando
+#     o sink não conta), o número de fatias e o resultado: ok, o erro ({'type', 'lineno', 'message'},
+#     como no scl_runner.py) e a Tabela de Símbolos final.
+#
+# Uso pela linha de comando:
+#   python scl_async.py arquivo.scl [outro.scl ...] [--copias 1000] [--budget 1000] [-O]
+
+import argparse
+import asyncio
+import sys
+import time
+
+from scl_bytecode import SCLVirtualMachine, compile_program
+from scl_optimizer import optimize as optimize_program
+from scl_errors import SCLError, SCLSemanticError
+
+DEFAULT_BUDGET = 1000 # Instruções por fatia.
+
+
+def queue_sink(queue):
+    """Um sink que põe (nome da tarefa, valor) em uma asyncio.Queue (com 'maxsize', a fila cheia segura a tarefa)."""
+    async def sink(task, value): await queue.put((task.name, value))
+    return sink
+
+
+class SCLTask:
+    def __init__(self, name, code, sink=None, budget=DEFAULT_BUDGET):
+        # 'code' é o CodeObject do programa (veja compile_program); várias tarefas podem compartilhar o mesmo,
+        # porque o estado (slots e pilha) fica na VM de cada uma.
+        self.name = name
+        self.code = code
+        self.sink = sink
+        self.budget = budget
+        self.output = []           # Os valores do PRINT, quando não há sink.
+        self.vm = None             # A VM da tarefa, criada em run().
+        self.cpu_time = 0.0        # Tempo de CPU das fatias, em segundos.
+        self.slices = 0            # Quantas fatias a execução levou.
+        self.done = False
+        self.error = None          # O erro estruturado, se o programa falhou.
+
+    @property
+    def ok(self):
+        return self.done and self.error is None
+
+    @property
+    def symbol_table(self):
+        return self.vm.symbol_table if self.vm is not None else {}
+
+    async def run(self):
+        """Executa o programa até o fim, cedendo a vez às outras tarefas a cada fatia."""
+        pending = [] # Os valores do PRINT da fatia atual, entregues ao sink no fim dela.
+        self.vm = vm = SCLVirtualMachine(output=pending.append if self.sink is not None else self.output.append)
+        code, budget = self.code, self.budget
+        try:
+            if code.resolve_errors: vm._runtime_error(code.resolve_errors[0][1], code.resolve_errors[0][0], SCLSemanticError)
+            vm.layout, vm.slots = code.layout, code.layout.new_slots()
+            state = (0, None)
+            while state is not None:
+                start, failure = time.thread_time(), None
+                try: state = vm._execute(code, *state, budget)
+                except Exception as error: failure = error # Lançado de novo depois de entregar a saída da fatia.
+                self.cpu_time += time.thread_time() - start; self.slices += 1
+                try:
+                    for value in pending: await self.sink(self, value) # Também a saída de antes de um erro.
+                except Exception:
+                    if failure is None: raise # Um erro do sink não esconde o erro do programa.
+                pending.clear()
+                if failure is not None: raise failure
+                if state is not None: await asyncio.sleep(0) # Cede a vez.
+        except SCLError as error: self.error = error.as_dict()
+        except Exception as error: # Erros inesperados do próprio Python (divisão por zero etc. já chegam como SCLRuntimeError).
+            self.error = {'type': 'runtime', 'lineno': None, 'message': f"{type(error).__name__}: {error}"}
+        self.done = True
+        return self
+
+    def as_dict(self):
+        return {'name': self.name, 'ok': self.ok, 'error': self.error, 'output': self.output,
+                'symbol_table': self.symbol_table, 'cpu_s': self.cpu_time, 'slices': self.slices}
+
+
+class AsyncRuntime:
+    """Um conjunto de SCLTasks que rodam juntas no mesmo event loop."""
+
+    def __init__(self, budget=DEFAULT_BUDGET, sink=None, optimize=False):
+        # 'budget' e 'sink' são os padrões das tarefas adicionadas (cada add() pode trocá-los).
+        self.budget, self.sink, self.optimize = budget, sink, optimize
+        self.tasks = []
+        self._compiled = {} # id(nó Program) -> (nó, CodeObject): o mesmo programa é compilado uma vez só.
+
+    def add(self, program, name=None, sink=None, budget=None):
+        """Acrescenta um programa (nó Program, ex: de parse_program) e devolve a sua SCLTask."""
+        if id(program) not in self._compiled:
+            self._compiled[id(program)] = (program, compile_program(optimize_program(program)[0] if self.optimize else program))
+        task = SCLTask(name if name is not None else f"tarefa{len(self.tasks)}", self._compiled[id(program)][1],
+                       sink if sink is not None else self.sink, budget or self.budget)
+        self.tasks.append(task)
+        return task
+
+    async def run_async(self):
+        """Executa todas as tarefas (dentro de um event loop que já está rodando) e devolve a lista delas."""
+        return await asyncio.gather(*(task.run() for task in self.tasks))
+
+    def run(self):
+        """Executa todas as tarefas em um event loop novo e devolve o resumo (veja summary())."""
+        start = time.perf_counter()
+        asyncio.run(self.run_async())
+        return self.summary(time.perf_counter() - start)
+
+    def summary(self, wall_time=None):
+        cpu_times = [task.cpu_time for task in self.tasks]
+        failed = sum(1 for task in self.tasks if task.done and not task.ok)
+        return {'tasks': len(self.tasks), 'ok': len(self.tasks) - failed, 'failed': failed, 'wall_s': wall_time,
+                'cpu_s': sum(cpu_times), 'cpu_max_s': max(cpu_times, default=0.0),
+                'slices': sum(task.slices for task in self.tasks)}
+
+
+if __name__ == '__main__':
+    from scl_parser import parse_program
+
+    arguments = argparse.ArgumentParser(description="Executa vários programas SCL como tarefas do asyncio.")
+    arguments.add_argument('paths', nargs='+', help="arquivos .scl")
+    arguments.add_argument('--copias', type=int, default=1, help="quantas tarefas rodam cada arquivo (padrão: 1)")
+    arguments.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help=f"instruções por fatia (padrão: {DEFAULT_BUDGET})")
+    arguments.add_argument('-O', dest='optimize', action='store_true', help="liga o otimizador")
+    options = arguments.parse_args()
+
+    runtime = AsyncRuntime(options.budget, optimize=options.optimize)
+    for path in options.paths:
+        with open(path, encoding='utf-8') as source_file: program = parse_program(source_file.read())
+        for copy in range(options.copias): runtime.add(program, f"{path}#{copy}")
+    summary = runtime.run()
+    for task in runtime.tasks:
+        if not task.ok: print(f"ERRO  {task.name}: {task.error['type']}: {task.error['message']}")
+    print(f"{summary['tasks']} tarefas, {summary['ok']} OK, {summary['failed']} com erro | "
+          f"{summary['wall_s'] * 1000:.1f} ms no total, CPU {summary['cpu_s'] * 1000:.1f} ms "
+          f"(máx {summary['cpu_max_s'] * 1000:.3f} ms por tarefa), {summary['slices']} fatias")
+    sys.exit(1 if summary['failed'] else 0)
@@ -0,0 +1,263 @@
+# scl_batch.py
+
+# Execução em lote: o mesmo programa SCL rodando sobre N instâncias independentes
+# (ex: milhares de equipamentos iguais, cada um com os seus próprios valores).
+#
+# Em vez de N interpretadores, cada variável vira uma coluna NumPy com N posições e cada
+# nó da AST é avaliado uma única vez para todas as instâncias ao mesmo tempo:
+#   - aritmética, comparações e AND/OR/NOT são operações vetorizadas;
+#   - IF com condição que depende dos dados usa máscaras: o THEN roda só para as instâncias
+#     em que a condição é verdadeira e o ELSE para as demais (cada bloco no máximo uma vez);
+#   - WHILE repete enquanto alguma instância ainda está no laço, e FOR percorre do menor
+#     início ao maior fim, cada instância participando só das iterações do seu próprio intervalo.
+#
+# Um erro de execução (divisão por zero, variável sem valor...) derruba apenas as instâncias em
+# que aconteceu: elas saem da máscara e o erro fica em 'errors[k]'. Erros que não dependem
+# dos dados (detectados pelo resolvedor) encerram o lote inteiro, como nos outros motores.
+#
+# Diferença conhecida: as colunas usam os tipos do NumPy (INT = int64), então contas inteiras
+# que passem de 64 bits estouram (assim como um REAL finito grande demais convertido para INT),
+# enquanto os outros motores usam os inteiros ilimitados do Python.
+#
+# O NumPy é opcional: só este módulo depende dele.
+
+try:
+    import numpy as np
+except ImportError: # Sem NumPy o resto do interpretador funciona; só o modo em lote fica indisponível.
+    np = None
+
+from token_definitions import TokenType
+from scl_ast import (Node, Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     LogicOp, Comparison, ArithOp, NotOp, Literal, Variable, Convert)
+from scl_resolver import resolve_program
+from scl_errors import SCLSemanticError
+from scl_types import INT, INT_DIV
+
+# Etapas de um nó na pilha de BatchEvaluator.evaluate().
+VISIT, RIGHT, APPLY = 0, 1, 2
+
+# Tipo NumPy de cada tipo SCL (o valor inicial da coluna; o conteúdo pode ser promovido depois).
+COLUMN_TYPES = {TokenType.TYPE_INT: 'int64', TokenType.TYPE_REAL: 'float64', TokenType.TYPE_BOOL: 'bool'}
+
+
+class BatchEvaluator:
+    def __init__(self, instances, inputs=None):
+        # 'inputs' mapeia nome -> valores iniciais (um por instância, ou um só para todas).
+        # Quando a declaração da variável é executada, ela já recebe esses valores em vez de ficar nula.
+        if np is None: raise ImportError("O modo em lote (scl_batch.py) precisa do NumPy: pip install numpy")
+        self.instances = instances
+        self.inputs = {name: np.broadcast_to(np.asarray(values), (instances,)) for name, values in (inputs or {}).items()}
+        self.layout = None
+        self.columns = []      # slot -> valores da variável (np.ndarray com N posições)
+        self.declared = []     # slot -> máscara das instâncias em que a variável já foi declarada
+        self.initialized = []  # slot -> máscara das instâncias em que a variável já tem valor
+        self.alive = np.ones(instances, dtype=bool) # Instâncias que ainda não tiveram erro.
+        self.errors = [None] * instances            # Mensagem de erro de cada instância (ou None).
+        self.prints = []       # Saídas do PRINT, na ordem: (valores, máscara das instâncias que imprimiram).
+
+        self._statement_handlers = {
+            Declaration: self.declaration, Assignment: self.assignment, IfStatement: self.if_statement,
+            WhileStatement: self.while_statement, ForStatement: self.for_statement, PrintStatement: self.print_statement,
+        }
+        self._expression_handlers = {
+            LogicOp: self.logic_op, Comparison: self.binary_op, ArithOp: self.binary_op,
+            NotOp: self.not_op, Literal: self.literal, Variable: self.variable, Convert: self.convert,
+        }
+
+    def _runtime_error(self, message, node, error_type=SCLSemanticError):
+        """Erro que vale para o lote inteiro: lançado como nos outros motores."""
+        raise error_type(message, node.lineno)
+
+    def _instance_error(self, message, node, where):
+        """Registra o erro nas instâncias de 'where' (que ainda estavam vivas) e as tira da execução."""
+        where = where & self.alive
+        for k in np.flatnonzero(where): self.errors[k] = f"ERRO (linha {node.lineno}): {message}"
+        self.alive &= ~where
+
+    # --- Resultados por instância ---
+
+    def symbol_table(self, k):
+        """A Tabela de Símbolos da instância k, no mesmo formato do SCLEvaluator."""
+        return {name: {'type': var_type, 'value': self.columns[slot][k].item() if self.initialized[slot][k] else None}
+                for slot, (name, var_type) in enumerate(zip(self.layout.names, self.layout.types))
+                if self.declared[slot][k] and not name.startswith('$')}
+
+    def output(self, k):
+        """As linhas que o PRINT teria mostrado na instância k."""
+        return [f"[SAÍDA SCL] {values[k].item()}" for values, mask in self.prints if mask[k]]
+
+    # --- Execução de Comandos ---
+
+    def run(self, program):
+        self.layout, errors = resolve_program(program)
+        if errors: self._runtime_error(errors[0][1], Node(errors[0][0]))
+        n = self.instances
+        self.columns = [np.zeros(n, dtype=COLUMN_TYPES.get(var_type, 'float64')) for var_type in self.layout.types]
+        self.declared = [np.zeros(n, dtype=bool) for _ in self.layout.names]
+        self.initialized = [np.zeros(n, dtype=bool) for _ in self.layout.names]
+        self.statement_list(program.statements, self.alive.copy())
+
+    def statement_list(self, statements, mask):
+        handlers = self._statement_handlers
+        for statement in statements:
+            mask = mask & self.alive # Instâncias que falharam no comando anterior param aqui.
+            if not mask.any(): return
+            handlers[type(statement)](statement, mask)
+
+    def _store(self, slot, value, mask):
+        """Escreve 'value' na coluna só nas instâncias de 'mask' (as demais mantêm o valor antigo)."""
+        mask = mask & self.alive
+        self.columns[slot] = np.where(mask, value, self.columns[slot])
+        self.initialized[slot] |= mask
+
+    def _check_declared(self, name, slot, node, mask):
+        self._instance_error(f"Erro Semântico: Variável '{name}' não declarada.", node, mask & ~self.declared[slot])
+
+    def declaration(self, node, mask):
+        slot = node.slot
+        self._instance_error(f"Erro Semântico: Variável '{node.name}' já declarada.", node, mask & self.declared[slot])
+        mask = mask & self.alive
+        self.declared[slot] |= mask
+        self.initialized[slot] &= ~mask # Declarada, com valor inicial nulo...
+        if node.name in self.inputs: self._store(slot, self.inputs[node.name], mask) # ...ou com o valor de entrada.
+
+    def assignment(self, node, mask):
+        if node.checked: self._check_declared(node.name, node.slot, node, mask)
+        self._store(node.slot, self.evaluate(node.expr, mask), mask)
+
+    def print_statement(self, node, mask):
+        value = self.evaluate(node.expr, mask)
+        self.prints.append((np.broadcast_to(value, (self.instances,)), mask & self.alive))
+
+    def if_statement(self, node, mask):
+        condition = truth(self.evaluate(node.condition, mask))
+        self.statement_list(node.then_body, mask & condition)
+        if node.else_body is not None: self.statement_list(node.else_body, mask & ~condition)
+
+    def while_statement(self, node, mask):
+        while True:
+            mask = mask & self.alive
+            mask = mask & truth(self.evaluate(node.condition, mask)) # Quem saiu do laço não volta mais.
+            if not mask.any(): return
+            self.statement_list(node.body, mask)
+
+    def for_statement(self, node, mask):
+        if node.checked: self._check_declared(node.var_name, node.slot, node, mask)
+        start_val = np.broadcast_to(self.evaluate(node.start, mask), (self.instances,))
+        end_val = np.broadcast_to(self.evaluate(node.end, mask), (self.instances,))
+        bounds_error = mask & ~(is_integer(start_val) & is_integer(end_val))
+        if bounds_error.any(): self._instance_error("Erro de Execução: Os limites do FOR devem ser inteiros.", node, bounds_error)
+        mask = mask & self.alive
+        if not mask.any(): return
+        slot = node.slot
+        for i in range(int(start_val[mask].min()), int(end_val[mask].max()) + 1):
+            iteration = mask & self.alive & (start_val <= i) & (i <= end_val)
+            if not iteration.any(): continue
+            self._store(slot, i, iteration) # Atualiza a variável de controle.
+            self.statement_list(node.body, iteration)
+
+    # --- Avaliação de Expressões ---
+
+    def evaluate(self, node, mask):
+        """Calcula o valor da expressão para todas as instâncias (um array, ou um escalar se for constante).
+        'mask' diz em quais instâncias a expressão realmente executa: só elas podem gerar erro.
+        A árvore é percorrida com uma pilha explícita, sem recursão (como em scl_ast.reduce_expression()):
+        cada item é (nó, máscara, etapa), e os valores dos operandos já calculados ficam em 'values'."""
+        handlers = self._expression_handlers
+        values, pending = [], [(node, mask, VISIT)]
+        while pending:
+            node, mask, stage = pending.pop()
+            node_type = type(node)
+            if stage == APPLY: # Os operandos já estão no topo de 'values'.
+                if node_type is NotOp or node_type is Convert: values[-1] = handlers[node_type](node, mask, values[-1])
+                else: right = values.pop(); values[-1] = handlers[node_type](node, mask, values[-1], right)
+            elif stage == RIGHT: # AND/OR: o lado direito só "executa" onde o esquerdo não decide.
+                left_true = truth(values[-1])
+                pending.append((node, mask, APPLY))
+                pending.append((node.right, mask & ~left_true if node.op == TokenType.OR else mask & left_true, VISIT))
+            elif node_type is Literal or node_type is Variable: values.append(handlers[node_type](node, mask))
+            elif node_type is NotOp or node_type is Convert:
+                pending.append((node, mask, APPLY)); pending.append((node.operand, mask, VISIT))
+            elif node_type is LogicOp:
+                pending.append((node, mask, RIGHT)); pending.append((node.left, mask, VISIT))
+            else: pending += ((node, mask, APPLY), (node.right, mask, VISIT), (node.left, mask, VISIT))
+        return values[0]
+
+    def logic_op(self, node, mask, left, right): # OR e AND, já com o lado direito calculado só onde precisava.
+        if node.op == TokenType.OR: return np.where(truth(left), left, right)
+        return np.where(truth(left), right, left)
+
+    def binary_op(self, node, mask, left, right): # Comparações e operadores aritméticos.
+        op = node.op
+        if op == TokenType.DIV or op == INT_DIV:
+            zero = mask & (np.asarray(right) == 0)
+            if zero.any(): self._instance_error("Erro de Execução: Divisão por zero.", node, zero)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if op == TokenType.DIV: return np.true_divide(left, right)
+                # Divisão de INTs truncada em direção a zero (o floor_divide arredonda para baixo).
+                quotient = np.floor_divide(left, right)
+                return quotient + ((quotient < 0) & (quotient * right != left))
+        if op in ARITHMETIC: # No Python, TRUE + TRUE = 2; no NumPy bool + bool seria um OR.
+            left, right = as_number(left), as_number(right)
+        return NUMPY_OPERATORS[op](left, right)
+
+    def convert(self, node, mask, value):
+        value = np.asarray(value)
+        if node.target == INT and value.dtype.kind == 'f': # Nos outros motores, int() de nan ou inf é um erro.
+            invalid = ~np.isfinite(value)
+            if invalid.any():
+                nan, inf = mask & np.isnan(value), mask & np.isinf(value)
+                if nan.any(): self._instance_error("Erro de Execução: Valor inválido (NaN) convertido para INT.", node, nan)
+                if inf.any(): self._instance_error("Erro de Execução: Valor fora da faixa numérica.", node, inf)
+                value = np.where(invalid, 0.0, value) # O astype() daria lixo (e um aviso) nessas posições.
+        return value.astype(COLUMN_TYPES[node.target]) # Float -> int64 trunca.
+
+    def not_op(self, node, mask, value):
+        return np.logical_not(truth(value))
+
+    def literal(self, node, mask):
+        return node.value
+
+    def variable(self, node, mask):
+        slot = node.slot
+        if node.checked: # Mesmas verificações do SCLEvaluator, instância por instância.
+            self._check_declared(node.name, slot, node, mask)
+            self._instance_error(f"Erro de Execução: Variável '{node.name}' usada antes de ser inicializada.", node,
+                                 mask & ~self.initialized[slot])
+        return self.columns[slot]
+
+
+def truth(value):
+    """O valor lógico (como o 'if' do Python) de cada posição."""
+    return np.asarray(value).astype(bool)
+
+
+def as_number(value):
+    value = np.asarray(value)
+    return value.astype('int64') if value.dtype == bool else value
+
+
+def is_integer(values):
+    return np.full(values.shape, np.issubdtype(values.dtype, np.integer) and values.dtype != bool)
+
+
+if np is not None:
+    NUMPY_OPERATORS = {
+        TokenType.EQ: np.equal, TokenType.NEQ: np.not_equal,
+        TokenType.LT: np.less, TokenType.LTE: np.less_equal,
+        TokenType.GT: np.greater, TokenType.GTE: np.greater_equal,
+        TokenType.PLUS: np.add, TokenType.MINUS: np.subtract, TokenType.MUL: np.multiply,
+    }
+ARITHMETIC = (TokenType.PLUS, TokenType.MINUS, TokenType.MUL)
+
+
+def run_batch(source, instances, inputs=None, optimize=False):
+    """Atalho: analisa o código-fonte e o executa sobre 'instances' instâncias. Devolve o BatchEvaluator."""
+    from scl_parser import parse_program
+    from scl_optimizer import optimize as optimize_program
+
+    program = parse_program(source)
+    if optimize: program, _ = optimize_program(program)
+    evaluator = BatchEvaluator(instances, inputs)
+    evaluator.run(program)
+    return evaluator
@@ -0,0 +1,325 @@
+# scl_bytecode.py
+
+# Um segundo motor de execução para a linguagem SCL: em vez de percorrer a AST
+# recursivamente (como o SCLEvaluator), o BytecodeCompiler "achata" a árvore em uma
+# sequência de instruções simples para uma máquina de pilha, e o SCLVirtualMachine
+# executa essas instruções em um único laço de despacho.
+#
+# Cada instrução ocupa 2 inteiros no array 'ops': (código da operação, argumento).
+# Os saltos (IF/ELSE/WHILE/FOR) guardam no argumento o índice de destino dentro de 'ops'.
+
+import operator
+import sys
+from array import array
+
+from token_definitions import TokenType
+from scl_resolver import UNDECLARED, resolve_program
+from scl_evaluator import print_output
+from scl_errors import SCLSemanticError, SCLRuntimeError, PYTHON_RUNTIME_ERRORS, runtime_error_message
+from scl_types import INT_DIV, int_div, CONVERSIONS
+from scl_closedform import plan_loop
+from scl_ast import (Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     LogicOp, Comparison, ArithOp, NotOp, Literal, Variable, Convert)
+
+# --- Códigos das Operações (opcodes) ---
+LOAD_CONST = 0            # Empilha consts[arg].
+LOAD_VAR = 1              # Empilha o valor do slot arg (acesso que o resolvedor provou seguro).
+LOAD_VAR_CHECKED = 2      # Igual ao LOAD_VAR, mas verifica se a variável foi declarada e inicializada.
+STORE_VAR = 3             # Desempilha um valor e o guarda no slot arg.
+STORE_VAR_CHECKED = 4     # Igual ao STORE_VAR, mas verifica se a variável foi declarada.
+DECLARE = 5               # Declara a variável do slot arg.
+CHECK_DECLARED = 6        # Apenas verifica se a variável do slot arg foi declarada (usado pelo FOR).
+BINARY_OP = 7             # Desempilha o operando direito e aplica o operador 'arg' ao topo da pilha.
+BINARY_OP_CONST = 8       # Igual ao BINARY_OP, mas o operando direito é consts[arg >> 4] (operador em arg & 15).
+BINARY_OP_VAR = 9         # Igual ao BINARY_OP, mas o operando direito é o slot arg >> 4 (só para acessos seguros).
+NOT = 10
+JUMP = 11                 # Salta para arg.
+POP_JUMP_IF_FALSE = 12    # Desempilha a condição; se for falsa, salta para arg.
+JUMP_IF_FALSE_OR_POP = 13 # AND: se o topo for falso, salta para arg mantendo-o; senão o desempilha.
+JUMP_IF_TRUE_OR_POP = 14  # OR: se o topo for verdadeiro, salta para arg mantendo-o; senão o desempilha.
+FOR_PREP = 15             # Desempilha (início, fim) e empilha o iterador do laço FOR.
+FOR_ITER = 16             # Empilha o próximo valor do iterador do topo; se acabou, o remove e salta para arg.
+PRINT = 17                # Desempilha um valor e o imprime.
+CONVERT = 18              # Converte o topo da pilha para o tipo CONVERSION_TYPES[arg].
+FOR_CLOSED = 19           # Com (início, fim) no topo, tenta o laço em forma fechada; se der certo, desempilha e salta para arg.
+JUMP_BACK = 20            # Salta para arg, o início do laço (fim de uma volta do WHILE/FOR): a execução pode ser suspensa aqui.
+
+OPCODE_NAMES = {value: name for name, value in globals().items() if name.isupper() and isinstance(value, int)}
+
+# Os operadores binários são numerados (0 a 10) e codificados nos 4 bits mais baixos do argumento
+# das instruções BINARY_OP*. BINARY_FUNCTIONS[número] é a função Python que implementa cada um.
+BINARY_OPERATORS = [TokenType.PLUS, TokenType.MINUS, TokenType.MUL, TokenType.DIV,
+                    TokenType.EQ, TokenType.NEQ, TokenType.LT, TokenType.LTE, TokenType.GT, TokenType.GTE, INT_DIV]
+BINARY_FUNCTIONS = [operator.add, operator.sub, operator.mul, operator.truediv,
+                    operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge, int_div]
+BINARY_OPERATOR_INDEX = {op: index for index, op in enumerate(BINARY_OPERATORS)}
+
+# Os tipos de destino do CONVERT, numerados pelo argumento da instrução.
+CONVERSION_TYPES = list(CONVERSIONS)
+CONVERSION_FUNCTIONS = [CONVERSIONS[target] for target in CONVERSION_TYPES]
+
+_FIM_DO_LACO = object() # Sentinela devolvida pelo iterador do FOR quando não há mais valores.
+
+
+class CodeObject:
+    """O resultado da compilação: as instruções e as tabelas auxiliares que elas referenciam."""
+    def __init__(self):
+        self.ops = array('i')    # Instruções: pares (opcode, argumento).
+        self.lines = array('i')  # Linha do código SCL de cada instrução (uma entrada por par em 'ops').
+        self.consts = []         # Valores literais (LOAD_CONST).
+        self.layout = None       # O SymbolLayout do programa: os argumentos *_VAR, DECLARE etc. são slots dele.
+        self.resolve_errors = [] # Erros encontrados na resolução das variáveis (reportados pela VM).
+        self.loop_plans = {}     # Posição de cada FOR_CLOSED -> LoopPlan do laço (scl_closedform.py).
+        self._dispatch_ops = None # 'ops' como lista Python (veja dispatch_ops()).
+
+    def dispatch_ops(self):
+        """'ops' como lista Python, que o laço de despacho indexa mais rápido que o array compacto. A lista é
+        criada uma vez só: uma execução retomada (scl_async.py) não paga o tamanho do programa a cada fatia."""
+        if self._dispatch_ops is None: self._dispatch_ops = self.ops.tolist()
+        return self._dispatch_ops
+
+
+class BytecodeCompiler:
+    def __init__(self):
+        self.code = CodeObject()
+        self._const_index = {}
+
+    def compile(self, program):
+        """Compila um nó Program e devolve o CodeObject correspondente."""
+        self.code.layout, self.code.resolve_errors = resolve_program(program)
+        if not self.code.resolve_errors: self.statement_list(program.statements)
+        return self.code
+
+    # --- Utilitários de emissão ---
+
+    def emit(self, opcode, arg, lineno):
+        """Acrescenta uma instrução e devolve a sua posição (útil para corrigir saltos depois)."""
+        position = len(self.code.ops)
+        self.code.ops.append(opcode); self.code.ops.append(arg); self.code.lines.append(lineno)
+        return position
+
+    def patch(self, position, target):
+        """Corrige o destino de um salto já emitido."""
+        self.code.ops[position + 1] = target
+
+    def here(self):
+        return len(self.code.ops)
+
+    def const(self, value):
+        # Chave com o tipo, para que 1, 1.0 e TRUE não virem a mesma constante.
+        key = (type(value), value)
+        if key not in self._const_index: self._const_index[key] = len(self.code.consts); self.code.consts.append(value)
+        return self._const_index[key]
+
+    # --- Comandos ---
+
+    def statement_list(self, statements):
+        for statement in statements: self.statement(statement)
+
+    def statement(self, node):
+        node_type = type(node)
+        if node_type is Assignment:
+            self.expression(node.expr); self.emit(STORE_VAR_CHECKED if node.checked else STORE_VAR, node.slot, node.lineno)
+        elif node_type is Declaration:
+            self.emit(DECLARE, node.slot, node.lineno)
+        elif node_type is PrintStatement:
+            self.expression(node.expr); self.emit(PRINT, 0, node.lineno)
+        elif node_type is IfStatement:
+            self.expression(node.condition)
+            jump_else = self.emit(POP_JUMP_IF_FALSE, 0, node.lineno)
+            self.statement_list(node.then_body)
+            if node.else_body is not None:
+                jump_end = self.emit(JUMP, 0, node.lineno)
+                self.patch(jump_else, self.here())
+                self.statement_list(node.else_body)
+                self.patch(jump_end, self.here())
+            else: self.patch(jump_else, self.here())
+        elif node_type is WhileStatement:
+            loop_start = self.here()
+            self.expression(node.condition)
+            jump_end = self.emit(POP_JUMP_IF_FALSE, 0, node.lineno)
+            self.statement_list(node.body)
+            self.emit(JUMP_BACK, loop_start, node.lineno)
+            self.patch(jump_end, self.here())
+        elif node_type is ForStatement:
+            if node.checked: self.emit(CHECK_DECLARED, node.slot, node.lineno)
+            self.expression(node.start); self.expression(node.end)
+            plan = plan_loop(node, self.code.layout)
+            if plan is not None: closed = self.emit(FOR_CLOSED, 0, node.lineno); self.code.loop_plans[closed] = plan
+            self.emit(FOR_PREP, 0, node.lineno)
+            loop_start = self.emit(FOR_ITER, 0, node.lineno)
+            self.emit(STORE_VAR, node.slot, node.lineno) # Atualiza a variável de controle.
+            self.statement_list(node.body)
+            self.emit(JUMP_BACK, loop_start, node.lineno)
+            self.patch(loop_start, self.here())
+            if plan is not None: self.patch(closed, self.here())
+
+    # --- Expressões ---
+
+    def expression(self, node):
+        """Emite o código da expressão, percorrendo a árvore com uma pilha explícita (sem recursão). Na pilha ficam
+        os nós ainda não emitidos e, abaixo dos operandos de cada operador, a ação que o emite depois deles."""
+        pending, jumps = [node], [] # 'jumps': saltos do AND/OR ainda sem destino (o mais interno no topo).
+        while pending:
+            node = pending.pop()
+            node_type = type(node)
+            if node_type is tuple: # Ação adiada: (função, argumentos...).
+                node[0](*node[1:])
+            elif node_type is Literal: self.emit(LOAD_CONST, self.const(node.value), node.lineno)
+            elif node_type is Variable: self.emit(LOAD_VAR_CHECKED if node.checked else LOAD_VAR, node.slot, node.lineno)
+            elif node_type is NotOp: pending += ((self.emit, NOT, 0, node.lineno), node.operand)
+            elif node_type is Convert: pending += ((self.emit, CONVERT, CONVERSION_TYPES.index(node.target), node.lineno), node.operand)
+            elif node_type is LogicOp: # AND/OR com curto-circuito: o lado direito só roda se necessário.
+                opcode = JUMP_IF_TRUE_OR_POP if node.op == TokenType.OR else JUMP_IF_FALSE_OR_POP
+                pending += ((self._patch_jump, jumps), node.right, (self._emit_jump, jumps, opcode, node.lineno), node.left)
+            else: # Comparison e ArithOp
+                left, right = node.left, node.right
+                # Quando o operando direito é um literal ou uma variável, ele vai direto no argumento
+                # da instrução (veja _emit_binary()), economizando um LOAD_* e uma ida à pilha.
+                inline = type(right) is Literal or (type(right) is Variable and not right.checked)
+                if inline and type(left) is Variable: # Atalho para o caso comum 'x * 2': nada a adiar.
+                    self.emit(LOAD_VAR_CHECKED if left.checked else LOAD_VAR, left.slot, left.lineno)
+                    self._emit_binary(node)
+                    continue
+                pending.append((self._emit_binary, node))
+                if not inline: pending.append(right)
+                pending.append(left)
+
+    def _emit_binary(self, node):
+        op_index, right = BINARY_OPERATOR_INDEX[node.op], node.right
+        if type(right) is Literal: self.emit(BINARY_OP_CONST, self.const(right.value) << 4 | op_index, node.lineno)
+        elif type(right) is Variable and not right.checked: self.emit(BINARY_OP_VAR, right.slot << 4 | op_index, right.lineno)
+        else: self.emit(BINARY_OP, op_index, node.lineno) # O operando direito já está na pilha.
+
+    def _emit_jump(self, jumps, opcode, lineno):
+        jumps.append(self.emit(opcode, 0, lineno))
+
+    def _patch_jump(self, jumps):
+        self.patch(jumps.pop(), self.here())
+
+
+def compile_program(program):
+    """Atalho: compila um nó Program para bytecode."""
+    return BytecodeCompiler().compile(program)
+
+
+def disassemble(code):
+    """Devolve uma listagem legível das instruções, útil para depuração."""
+    lines = []
+    for pc in range(0, len(code.ops), 2):
+        opcode, arg = code.ops[pc], code.ops[pc + 1]
+        if opcode in (BINARY_OP_CONST, BINARY_OP_VAR): arg = f"{arg >> 4} ({BINARY_OPERATORS[arg & 15]})"
+        elif opcode == BINARY_OP: arg = f"({BINARY_OPERATORS[arg]})"
+        elif opcode == CONVERT: arg = f"({CONVERSION_TYPES[arg]})"
+        lines.append(f"{pc:6d}  linha {code.lines[pc // 2]:<5d} {OPCODE_NAMES[opcode]:<22s} {arg}")
+    return "\n".join(lines)
+
+
+class SCLVirtualMachine:
+    def __init__(self, symbol_table=None, output=print_output):
+        # Como no SCLEvaluator, os valores ficam em 'slots'; se uma Tabela de Símbolos (dict) for
+        # passada aqui, ela é preenchida no formato {nome: {'type': ..., 'value': ...}} ao fim de run().
+        self.output_table = symbol_table
+        self.output = output # Função chamada pelo PRINT com cada valor.
+        self.layout = None
+        self.slots = []
+
+    @property
+    def symbol_table(self):
+        """Visão da Tabela de Símbolos montada a partir dos slots (para inspeção e JSON)."""
+        return self.layout.symbol_table(self.slots) if self.layout is not None else {}
+
+    def _runtime_error(self, message, lineno, error_type=SCLRuntimeError):
+        """Lança o erro (com a linha da instrução), interrompendo a execução."""
+        raise error_type(message, lineno)
+
+    def run(self, code):
+        """Executa um CodeObject do início ao fim."""
+        if code.resolve_errors: self._runtime_error(code.resolve_errors[0][1], code.resolve_errors[0][0], SCLSemanticError)
+        self.layout = code.layout
+        self.slots = code.layout.new_slots()
+        try:
+            self._execute(code)
+        finally:
+            if self.output_table is not None: self.output_table.clear(); self.output_table.update(self.symbol_table)
+
+    def _execute(self, code, pc=0, stack=None, budget=None):
+        """Executa as instruções a partir de 'pc' (com a pilha 'stack') até o fim, e devolve None.
+        Com 'budget', a execução é suspensa no primeiro fim de volta de laço (JUMP_BACK) depois de cerca de
+        'budget' instruções e devolve (pc, pilha), para continuar depois com _execute(code, pc, pilha, budget).
+        As instruções são contadas pelo tamanho do corpo de cada volta (um IF que pula parte do corpo conta
+        o corpo inteiro): a conta custa uma subtração por volta, e não uma por instrução."""
+        ops, consts, names, slots = code.dispatch_ops(), code.consts, code.layout.names, self.slots
+        functions = BINARY_FUNCTIONS
+        if stack is None: stack = []
+        push = stack.append; pop = stack.pop
+        end = len(ops)
+        remaining = 2 * budget if budget else sys.maxsize # Em posições de 'ops' (2 por instrução).
+        # Os opcodes são copiados para variáveis locais: comparar com locais é bem mais barato que com globais.
+        _LOAD_VAR, _LOAD_CONST, _STORE_VAR, _BINARY_OP, _BINARY_OP_CONST, _BINARY_OP_VAR = LOAD_VAR, LOAD_CONST, STORE_VAR, BINARY_OP, BINARY_OP_CONST, BINARY_OP_VAR
+        _JUMP, _POP_JUMP_IF_FALSE, _FOR_ITER, _NOT, _JUMP_IF_FALSE_OR_POP, _JUMP_IF_TRUE_OR_POP = JUMP, POP_JUMP_IF_FALSE, FOR_ITER, NOT, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP
+        _LOAD_VAR_CHECKED, _STORE_VAR_CHECKED, _PRINT, _FOR_PREP, _CHECK_DECLARED, _CONVERT = LOAD_VAR_CHECKED, STORE_VAR_CHECKED, PRINT, FOR_PREP, CHECK_DECLARED, CONVERT
+        _FOR_CLOSED, _JUMP_BACK = FOR_CLOSED, JUMP_BACK
+        output = self.output
+        # Só as operações que podem falhar com um erro do Python (aritmética, CONVERT e o range() do FOR_PREP)
+        # ficam dentro de um try (que não custa nada enquanto nada falha): um erro da saída do PRINT, por
+        # exemplo, chega a quem chamou como aconteceu. 'pc' já passou da instrução que falhou.
+        while pc < end:
+            op = ops[pc]; arg = ops[pc + 1]; pc += 2
+            # As operações mais frequentes vêm primeiro na cadeia de comparações.
+            if op == _LOAD_VAR: push(slots[arg])
+            elif op == _BINARY_OP_CONST:
+                try: stack[-1] = functions[arg & 15](stack[-1], consts[arg >> 4])
+                except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), code.lines[pc // 2 - 1]) # Ex: divisão por zero.
+            elif op == _BINARY_OP_VAR:
+                try: stack[-1] = functions[arg & 15](stack[-1], slots[arg >> 4])
+                except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), code.lines[pc // 2 - 1])
+            elif op == _STORE_VAR: slots[arg] = pop()
+            elif op == _BINARY_OP:
+                right = pop()
+                try: stack[-1] = functions[arg](stack[-1], right)
+                except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), code.lines[pc // 2 - 1])
+            elif op == _LOAD_CONST: push(consts[arg])
+            elif op == _POP_JUMP_IF_FALSE:
+                if not pop(): pc = arg
+            elif op == _JUMP: pc = arg
+            elif op == _JUMP_BACK:
+                remaining -= pc - arg; pc = arg
+                if remaining <= 0: return pc, stack
+            elif op == _FOR_ITER:
+                value = next(stack[-1], _FIM_DO_LACO)
+                if value is _FIM_DO_LACO: pop(); pc = arg
+                else: push(value)
+            elif op == _LOAD_VAR_CHECKED:
+                value = slots[arg]
+                if value is None or value is UNDECLARED: self._access_error(names[arg], value, code.lines[pc // 2 - 1])
+                push(value)
+            elif op == _STORE_VAR_CHECKED:
+                if slots[arg] is UNDECLARED: self._access_error(names[arg], UNDECLARED, code.lines[pc // 2 - 1])
+                slots[arg] = pop()
+            elif op == _NOT: stack[-1] = not stack[-1]
+            elif op == _JUMP_IF_FALSE_OR_POP:
+                if not stack[-1]: pc = arg
+                else: pop()
+            elif op == _JUMP_IF_TRUE_OR_POP:
+                if stack[-1]: pc = arg
+                else: pop()
+            elif op == _PRINT: output(pop())
+            elif op == _FOR_PREP:
+                end_val = pop(); start_val = pop()
+                try: push(iter(range(start_val, end_val + 1)))
+                except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), code.lines[pc // 2 - 1]) # Limites REAL.
+            elif op == _CONVERT:
+                try: stack[-1] = CONVERSION_FUNCTIONS[arg](stack[-1])
+                except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), code.lines[pc // 2 - 1]) # int() de inf ou nan.
+            elif op == _CHECK_DECLARED:
+                if slots[arg] is UNDECLARED: self._access_error(names[arg], UNDECLARED, code.lines[pc // 2 - 1])
+            elif op == _FOR_CLOSED:
+                if code.loop_plans[pc - 2].run(slots, stack[-2], stack[-1]): del stack[-2:]; pc = arg
+            else: # DECLARE
+                if slots[arg] is not UNDECLARED: self._runtime_error(f"Erro Semântico: Variável '{names[arg]}' já declarada.", code.lines[pc // 2 - 1], SCLSemanticError)
+                slots[arg] = None # Declarada, com valor inicial nulo
+
+    def _access_error(self, var_name, value, lineno):
+        if value is UNDECLARED: self._runtime_error(f"Erro Semântico: Variável '{var_name}' não declarada.", lineno, SCLSemanticError)
+        self._runtime_error(f"Erro de Execução: Variável '{var_name}' usada antes de ser inicializada.", lineno)
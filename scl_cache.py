@@ -0,0 +1,106 @@
+# scl_cache.py
+
+# Cache em disco dos programas já analisados, no mesmo espírito do __pycache__ do Python.
+#
+# Analisar um programa (tokenização + AST + resolução das variáveis + otimizador) custa
+# bem mais do que ler o resultado pronto. Na primeira execução a AST resolvida é gravada
+# em '__sclcache__/<hash>.sclc'; nas próximas, com o mesmo código-fonte e a mesma versão
+# do interpretador, ela é lida com uma única leitura do arquivo e desserializada com pickle.
+#
+# - A chave é o SHA-256 do código-fonte + SCL_VERSION + versão do Python + opção de otimização.
+# - A gravação é atômica (arquivo temporário + os.replace), então vários processos podem
+#   gravar a mesma entrada ao mesmo tempo sem que ninguém leia um arquivo pela metade.
+# - O diretório tem tamanho máximo: ao passar do limite, as entradas usadas há mais tempo são apagadas.
+# - Para desligar: ProgramCache(enabled=False) ou a variável de ambiente SCL_NO_CACHE=1.
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+# Versão do formato da AST/resolvedor/otimizador. Aumente sempre que algum deles mudar:
+# entradas gravadas por outra versão simplesmente deixam de ser encontradas.
+SCL_VERSION = "2"
+
+MAGIC = b"SCLC" # Assinatura no início de cada arquivo do cache.
+DEFAULT_DIRECTORY = "__sclcache__"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ProgramCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, enabled=None):
+        self.directory = directory or os.environ.get("SCL_CACHE_DIR") or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.enabled = (not os.environ.get("SCL_NO_CACHE")) if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source, optimize=False):
+        digest = hashlib.sha256()
+        digest.update(f"{SCL_VERSION}|{sys.implementation.cache_tag}|{int(bool(optimize))}|".encode())
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.sclc")
+
+    def load(self, source, optimize=False):
+        """Devolve o objeto guardado para este código-fonte, ou None se não houver (ou se o cache estiver desligado)."""
+        if not self.enabled: return None
+        path = self._path(self.key(source, optimize))
+        try:
+            with open(path, "rb") as cache_file: data = cache_file.read() # Uma única leitura.
+            if not data.startswith(MAGIC): raise ValueError("assinatura inválida")
+            value = pickle.loads(data[len(MAGIC):])
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception: # Arquivo corrompido ou de outra versão do Python: descarta e recompila.
+            self._remove(path)
+            self.misses += 1
+            return None
+        try: os.utime(path) # Marca a entrada como usada agora (para a remoção das mais antigas).
+        except OSError: pass
+        self.hits += 1
+        return value
+
+    def store(self, source, value, optimize=False):
+        """Grava o objeto no cache de forma atômica e, se preciso, apaga as entradas mais antigas."""
+        if not self.enabled: return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            data = MAGIC + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as temp_file: temp_file.write(data)
+                os.replace(temp_path, self._path(self.key(source, optimize)))
+            except BaseException:
+                self._remove(temp_path)
+                raise
+            self._evict()
+        except (OSError, pickle.PicklingError, RecursionError):
+            pass # O cache é só uma otimização: se não der para gravar, o programa roda normalmente.
+
+    def _evict(self):
+        """Mantém o diretório abaixo de max_bytes, apagando primeiro as entradas usadas há mais tempo."""
+        entries, total = [], 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".sclc"): continue
+            try: stat = entry.stat()
+            except FileNotFoundError: continue # Outro processo já apagou.
+            entries.append((stat.st_mtime, stat.st_size, entry.path)); total += stat.st_size
+        if total <= self.max_bytes: return
+        for _, size, path in sorted(entries):
+            self._remove(path); total -= size
+            if total <= self.max_bytes: break
+
+    def clear(self):
+        """Apaga todas as entradas do cache."""
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith((".sclc", ".tmp")): self._remove(entry.path)
+
+    def _remove(self, path):
+        try: os.remove(path)
+        except OSError: pass
@@ -0,0 +1,267 @@
+# scl_checker.py
+
+# Verificação estática: valida um programa SCL sem executá-lo.
+#
+# Os erros semânticos normalmente só aparecem quando a execução chega até eles: um ramo de IF
+# que não é tomado nunca é verificado, e validar um arquivo significa rodar todos os seus laços.
+# O verificador faz uma única passagem linear pelo programa inteiro (todos os ramos, cada corpo
+# de laço uma vez) e reporta, de uma só vez:
+#
+#   - erros léxicos e sintáticos, com recuperação: o caractere inválido é pulado, e um comando
+#     com erro de sintaxe é descartado até o próximo ';' (ou até o fim do bloco que ele abriu);
+#   - variáveis não declaradas e declarações duplicadas;
+#   - tipos incompatíveis entre INT, REAL e BOOL (operandos, atribuições, condições, FOR). Entre INT e
+#     REAL valem as conversões de scl_types.py (INT := REAL trunca, REAL := INT promove, e o mesmo nos
+#     limites de um FOR). O verificador só é mais rígido que os motores entre BOOL e números (BOOL := 1
+#     roda como bool(1), mas é reportado) e numa variável de controle de FOR que não é INT;
+#   - uso de variáveis antes da inicialização.
+#
+# A análise de fluxo é a mesma do resolvedor (scl_resolver.py): o que certamente acontece em
+# todos os caminhos é um erro; o que só acontece em alguns (ex: variável atribuída apenas no THEN)
+# é um aviso.
+#
+# Uso pela linha de comando:
+#   python scl_checker.py pasta/ [arquivo.scl ...] [--workers 8] [--json relatorio.json]
+# O código de saída é 1 se algum arquivo tem erros (avisos não contam).
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from token_definitions import TokenType, TokenCode
+from scl_ast import (Program, Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     LogicOp, Comparison, ArithOp, NotOp, Literal, Variable, Convert, reduce_expression)
+from scl_parser import SCLParser, BLOCK_STARTERS, STATEMENT_STARTERS
+from scl_resolver import NO, MAYBE, YES, meet, loop_head_state
+from scl_errors import SCLLexicalError, SCLSyntaxError
+from scl_types import INT, BOOL, NUMERIC, literal_type, arithmetic_type
+
+BLOCK_ENDS = (TokenCode.END_IF, TokenCode.END_WHILE, TokenCode.END_FOR, TokenCode.ELSE)
+
+
+class Diagnostic:
+    """Um problema encontrado: 'kind' é lexical, syntax, semantic, type ou init; 'severity' é error ou warning."""
+
+    def __init__(self, lineno, message, kind, severity='error'):
+        self.lineno, self.message, self.kind, self.severity = lineno, message, kind, severity
+
+    def as_dict(self):
+        return {'lineno': self.lineno, 'kind': self.kind, 'severity': self.severity, 'message': self.message}
+
+    def __str__(self):
+        return f"{'ERRO' if self.severity == 'error' else 'AVISO'} (linha {self.lineno}): {self.message}"
+
+
+class _RecoveringParser(SCLParser):
+    """O SCLParser que, em vez de parar no primeiro erro léxico/sintático, o registra e continua."""
+
+    def __init__(self, diagnostics):
+        super().__init__()
+        self.diagnostics = diagnostics
+
+    def _parser_error(self, message, error_type=SCLSyntaxError):
+        if error_type is SCLLexicalError: # Registra e pula o caractere; o lexer continua no próximo.
+            self.diagnostics.append(Diagnostic(self.lineno, message, 'lexical'))
+            self._lexer_advance_char()
+            return
+        super()._parser_error(message, error_type)
+
+    def _statement_error(self, error, opens_block):
+        """Registra o erro e descarta o comando, continuando a análise depois dele."""
+        self.diagnostics.append(Diagnostic(error.lineno, error.message, 'syntax'))
+        # Um bloco completo sem o ';' depois do END_*: se já vem outro comando, não há nada a pular.
+        if opens_block is None and self.current_code in STATEMENT_STARTERS: return
+        self._synchronize(1 if opens_block else 0)
+
+    def _synchronize(self, depth):
+        """Pula os tokens do comando com erro: até o ';' que o termina, ou até o fim do bloco que o contém.
+        Com depth=1 (o comando abriu um IF/WHILE/FOR), o END_* desse bloco também é pulado."""
+        while self.current_code != TokenCode.EOF:
+            code = self.current_code
+            if code in BLOCK_STARTERS: depth += 1
+            elif code in BLOCK_ENDS:
+                if depth == 0: return # Fim do bloco que contém o comando: quem o abriu continua daqui.
+                if code != TokenCode.ELSE: depth -= 1
+            elif code == TokenCode.SEMICOLON and depth == 0:
+                self._advance(); return
+            self._advance()
+
+    def program(self):
+        statements = self.statement_list()
+        while self.current_code != TokenCode.EOF: # Sobrou algo que não começa um comando (ex: END_IF solto).
+            self.diagnostics.append(Diagnostic(self.current_token.lineno, "Comando inválido.", 'syntax'))
+            self._advance(); self._synchronize(0)
+            statements += self.statement_list()
+        return Program(statements, self.current_token.lineno)
+
+
+class Checker:
+    def __init__(self, diagnostics=None):
+        self.diagnostics = [] if diagnostics is None else diagnostics
+        self.types = {}         # Nome -> tipo da declaração mais recente (na ordem do texto).
+        self.undeclared = set() # Nomes já reportados como não declarados (cada um só uma vez).
+        self.reported = set()   # (linha, mensagem) já reportados: a mesma mensagem não se repete na mesma linha.
+
+    def _report(self, node, message, kind, severity='error'):
+        if (node.lineno, message) in self.reported: return
+        self.reported.add((node.lineno, message))
+        self.diagnostics.append(Diagnostic(node.lineno, message, kind, severity))
+
+    def _access(self, name, state, node, reads):
+        """Verifica um acesso a 'name' e devolve o seu tipo (ou None, se não se sabe)."""
+        declared, initialized = state.get(name, (NO, NO))
+        if declared == NO:
+            if name not in self.undeclared:
+                self.undeclared.add(name); self._report(node, f"Erro Semântico: Variável '{name}' não declarada.", 'semantic')
+            return None
+        if declared == MAYBE: self._report(node, f"Variável '{name}' pode não estar declarada neste ponto.", 'semantic', 'warning')
+        if reads and initialized == NO: self._report(node, f"Erro de Execução: Variável '{name}' usada antes de ser inicializada.", 'init')
+        elif reads and initialized == MAYBE: self._report(node, f"Variável '{name}' pode ser usada antes de ser inicializada.", 'init', 'warning')
+        return self.types.get(name)
+
+    def _expect(self, node, actual, expected, what):
+        """Reporta um erro de tipo se 'actual' (quando conhecido) não está entre os tipos 'expected'."""
+        if actual is not None and actual not in expected:
+            self._report(node, f"Erro de Tipo: {what} deve ser {' ou '.join(expected)}, mas é {actual}.", 'type')
+
+    def check(self, program):
+        """Verifica o programa e devolve a lista de diagnósticos, na ordem das linhas."""
+        self.block(program.statements, {})
+        self.diagnostics.sort(key=lambda diagnostic: diagnostic.lineno)
+        return self.diagnostics
+
+    # --- Comandos ---
+
+    def block(self, statements, state):
+        for node in statements: self.statement(node, state)
+        return state
+
+    def statement(self, node, state):
+        node_type = type(node)
+        if node_type is Declaration:
+            declared, _ = state.get(node.name, (NO, NO))
+            if declared == YES: self._report(node, f"Erro Semântico: Variável '{node.name}' já declarada.", 'semantic')
+            elif declared == MAYBE: self._report(node, f"Variável '{node.name}' pode já estar declarada neste ponto (ex: declaração dentro de um laço).", 'semantic', 'warning')
+            self.types[node.name] = node.var_type
+            state[node.name] = (YES, NO)
+        elif node_type is Assignment:
+            value_type = self.expression(node.expr, state)
+            target_type = self._access(node.name, state, node, reads=False)
+            if target_type is not None and value_type is not None and value_type != target_type and not (value_type in NUMERIC and target_type in NUMERIC):
+                self._report(node, f"Erro de Tipo: Atribuição de {value_type} à variável '{node.name}' ({target_type}).", 'type')
+            if state.get(node.name, (NO, NO))[0] != NO: state[node.name] = (YES, YES)
+        elif node_type is PrintStatement:
+            self.expression(node.expr, state)
+        elif node_type is IfStatement:
+            self._expect(node, self.expression(node.condition, state), (BOOL,), "A condição do IF")
+            then_state = self.block(node.then_body, dict(state))
+            else_state = self.block(node.else_body, dict(state)) if node.else_body is not None else dict(state)
+            state.clear(); state.update(meet(then_state, else_state))
+        elif node_type is WhileStatement:
+            head = loop_head_state(node.body, state)
+            self._expect(node, self.expression(node.condition, head), (BOOL,), "A condição do WHILE")
+            self.block(node.body, dict(head))
+            state.clear(); state.update(head)
+        elif node_type is ForStatement:
+            self._expect(node, self.expression(node.start, state), NUMERIC, "O início do FOR") # Convertidos para INT.
+            self._expect(node, self.expression(node.end, state), NUMERIC, "O fim do FOR")
+            self._expect(node, self._access(node.var_name, state, node, reads=False), (INT,), f"A variável de controle '{node.var_name}'")
+            if state.get(node.var_name, (NO, NO))[0] != NO: state[node.var_name] = (YES, state[node.var_name][1])
+            head = loop_head_state(node.body, state)
+            body_state = dict(head)
+            if node.var_name in body_state: body_state[node.var_name] = (YES, YES)
+            self.block(node.body, body_state)
+            state.clear(); state.update(head)
+
+    # --- Expressões ---
+
+    def expression(self, node, state):
+        """Verifica a expressão e devolve o tipo do resultado (None se ele não pode ser determinado).
+        A árvore é percorrida sem recursão (reduce_expression), na mesma ordem do resolvedor."""
+        def visit(node, left=None, right=None):
+            node_type = type(node)
+            if node_type is Literal: return literal_type(node.value)
+            if node_type is Variable: return self._access(node.name, state, node, reads=True)
+            if node_type is Convert: return node.target # Só aparece numa árvore que já passou pela inferência de tipos.
+            if node_type is NotOp:
+                self._expect(node, left, (BOOL,), "O operando de NOT")
+                return BOOL
+            if node_type is LogicOp:
+                for side in (left, right): self._expect(node, side, (BOOL,), f"O operando de {node.op}")
+                return BOOL
+            if node_type is Comparison:
+                if node.op in (TokenType.EQ, TokenType.NEQ): # = e <> comparam dois números ou dois BOOLs.
+                    if left is not None and right is not None and (left == BOOL) != (right == BOOL):
+                        self._report(node, f"Erro de Tipo: Comparação '{node.op}' entre {left} e {right}.", 'type')
+                else:
+                    for side in (left, right): self._expect(node, side, NUMERIC, f"O operando de '{node.op}'")
+                return BOOL
+            # ArithOp
+            for side in (left, right): self._expect(node, side, NUMERIC, f"O operando de '{node.op}'")
+            return arithmetic_type(left, right) # INT / INT é a divisão inteira (veja scl_types.py).
+        return reduce_expression(node, visit)
+
+
+def check_source(source):
+    """Verifica um código-fonte SCL e devolve a lista de diagnósticos (vazia se está tudo certo)."""
+    diagnostics = []
+    parser = _RecoveringParser(diagnostics)
+    parser.inicializa(source)
+    parser.tokens = parser.tokenize() # Os erros léxicos entram aqui, antes dos sintáticos.
+    parser._rewind(0)
+    program = parser.program()
+    return Checker(diagnostics).check(program)
+
+
+def check_file(path):
+    """Devolve {'path', 'errors', 'warnings', 'diagnostics'} de um arquivo."""
+    try:
+        with open(path, encoding='utf-8') as source_file: diagnostics = check_source(source_file.read())
+    except (OSError, UnicodeDecodeError) as error:
+        diagnostics = [Diagnostic(0, str(error), 'io')]
+    return {'path': path,
+            'errors': sum(diagnostic.severity == 'error' for diagnostic in diagnostics),
+            'warnings': sum(diagnostic.severity == 'warning' for diagnostic in diagnostics),
+            'diagnostics': [diagnostic.as_dict() for diagnostic in diagnostics]}
+
+
+def check_many(paths, workers=None):
+    """Verifica muitos arquivos (pastas são percorridas recursivamente), em um pool de processos."""
+    from scl_runner import find_programs
+    files = find_programs(paths)
+    start = time.perf_counter()
+    if workers == 1 or len(files) < 2:
+        results = [check_file(path) for path in files]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            chunksize = max(1, len(files) // ((workers or os.cpu_count() or 1) * 4))
+            results = list(pool.map(check_file, files, chunksize=chunksize))
+    return {
+        'summary': {'files': len(results), 'files_with_errors': sum(result['errors'] > 0 for result in results),
+                    'errors': sum(result['errors'] for result in results),
+                    'warnings': sum(result['warnings'] for result in results),
+                    'wall_s': time.perf_counter() - start},
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    arguments = argparse.ArgumentParser(description="Verifica programas SCL sem executá-los.")
+    arguments.add_argument('paths', nargs='+', help="arquivos .scl e/ou pastas (percorridas recursivamente)")
+    arguments.add_argument('--workers', type=int, help="número de processos (padrão: um por CPU)")
+    arguments.add_argument('--json', help="grava o relatório completo neste arquivo JSON")
+    options = arguments.parse_args()
+
+    report = check_many(options.paths, options.workers)
+    for result in report['results']:
+        for diagnostic in result['diagnostics']:
+            print(f"{result['path']}:{diagnostic['lineno']}: {'ERRO' if diagnostic['severity'] == 'error' else 'AVISO'} [{diagnostic['kind']}] {diagnostic['message']}")
+    summary = report['summary']
+    print(f"\n{summary['files']} arquivos, {summary['files_with_errors']} com erros | "
+          f"{summary['errors']} erros, {summary['warnings']} avisos | {summary['wall_s'] * 1000:.1f} ms")
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as json_file: json.dump(report, json_file, indent=2, ensure_ascii=False)
+    sys.exit(1 if summary['files_with_errors'] else 0)
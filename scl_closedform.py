@@ -0,0 +1,286 @@
+# scl_closedform.py
+
+# Execução em forma fechada de laços FOR simples.
+#
+# Muitos laços FOR só acumulam valores ou recalculam variáveis a partir da variável de controle
+# (ex: 'c := c + i', 'soma := soma + i * 0.5', 'x := 2 * i + 1'). Quando o corpo de um FOR tem
+# apenas atribuições aritméticas (nenhum IF, WHILE, FOR, PRINT ou declaração), o LoopPlan calcula
+# o estado final das variáveis sem executar as iterações uma a uma:
+#
+#   - uma variável que não lê o próprio valor anterior fica com o valor da última iteração;
+#   - um acumulador INT (v := v + termos, v := v - termos) soma os termos por fórmula fechada: eles
+#     são polinômios na variável de controle, e a soma sai das diferenças finitas (exata, com os
+#     inteiros ilimitados do Python);
+#   - um acumulador REAL é somado pelo NumPy (np.add.accumulate), termo a termo e na mesma ordem
+#     das iterações, então o arredondamento de cada soma é exatamente o do laço.
+#
+# A Tabela de Símbolos final é idêntica à da execução iterativa. Quando essa garantia depende dos
+# valores (ex: divisão por zero, inteiros grandes demais para virar float sem arredondamento, um
+# valor de tipo inesperado), o plano desiste e o laço roda normalmente, reportando os erros como sempre.
+# O NumPy é opcional: sem ele, só os acumuladores REAL deixam de usar a forma fechada.
+
+import operator
+import weakref
+from math import comb
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from token_definitions import TokenType
+from scl_ast import Assignment, ArithOp, Literal, Variable, Convert, reduce_expression
+from scl_types import INT, REAL, INT_DIV, int_div, CONVERSIONS, arithmetic_type
+
+MIN_ITERATIONS = 32 # Laços mais curtos rodam normalmente: montar a forma fechada custaria mais que iterar.
+MAX_DEGREE = 8      # Grau máximo (na variável de controle) dos termos de um acumulador INT.
+EXACT_INT = 2 ** 53 # Até aqui um INT vira float sem arredondamento (igual no Python e no NumPy).
+CHUNK = 1 << 16     # Iterações por bloco na soma com o NumPy (limita a memória usada).
+MAX_DEPTH = 100     # Profundidade máxima de uma expressão (somada à das definições que ela lê): os cálculos
+                    # do plano descem a árvore recursivamente, então expressões mais fundas rodam normalmente.
+
+ARITHMETIC = {
+    TokenType.PLUS: operator.add, TokenType.MINUS: operator.sub, TokenType.MUL: operator.mul,
+    TokenType.DIV: operator.truediv, INT_DIV: int_div,
+}
+RUNTIME_TYPES = {INT: int, REAL: float}
+
+# Cache dos planos: nó do FOR -> (layout para o qual foi analisado, LoopPlan ou None).
+_plans = weakref.WeakKeyDictionary()
+
+
+class NotClosedForm(Exception):
+    """Indica que o corpo do laço usa algo que o LoopPlan não sabe resolver (ele roda normalmente)."""
+
+
+class LoopPlan:
+    """A análise de um FOR: o que cada atribuição do corpo faz com a sua variável ao longo das iterações."""
+
+    def __init__(self, node, layout):
+        self.types = layout.types
+        self.loop_slot = node.slot
+        if self.loop_slot < 0 or self.types[self.loop_slot] != INT: raise NotClosedForm()
+        self.assigned = {} # Slot atribuído no corpo -> posição da atribuição.
+        for position, statement in enumerate(node.body):
+            slot = statement.slot if type(statement) is Assignment else -1
+            if slot < 0 or statement.checked or slot == self.loop_slot or slot in self.assigned or self.types[slot] not in RUNTIME_TYPES:
+                raise NotClosedForm()
+            self.assigned[slot] = position
+        self.node_types = {}     # Nó -> tipo (INT ou REAL).
+        self.varying = set()     # Nós cujo valor muda com a variável de controle.
+        self.definitions = {}    # Slot -> expressão das variáveis que não leem o próprio valor anterior.
+        self.depths = {}         # Slot -> profundidade da definição (veja _scan()).
+        self.inputs = {}         # Slot -> tipo das variáveis de fora do corpo lidas no laço.
+        self.guarded = []        # Nós INT que viram float: precisam caber em EXACT_INT (verificado na execução).
+        self.values = []         # (slot, expressão): valor da última iteração.
+        self.int_sums = []       # (slot, [(sinal, termo)]): acumuladores INT (self.degree é o maior grau).
+        self.float_sums = []     # (slot, [(sinal, termo)]): acumuladores REAL.
+        self.degree = 0
+        for position, statement in enumerate(node.body):
+            slot, expr = statement.slot, statement.expr
+            depth = self._scan(expr, position, slot)
+            terms = self._terms(expr, slot)
+            if terms is None:
+                self.definitions[slot] = expr; self.depths[slot] = depth; self.values.append((slot, expr))
+            elif not terms: continue # 'v := v': a variável não muda no laço.
+            elif self.types[slot] == INT:
+                if any(self.node_types[term] != INT for _, term in terms): raise NotClosedForm()
+                degree = max(self._degree(term) for _, term in terms)
+                self.degree = max(self.degree, degree)
+                self.int_sums.append((slot, terms))
+            else:
+                if np is None: raise NotClosedForm()
+                for _, term in terms: self._vectorizable(term)
+                self.float_sums.append((slot, terms))
+
+    # --- Análise (uma vez por laço) ---
+
+    def _scan(self, expr, position, target):
+        """Valida a expressão, anotando o tipo de cada nó e quais dependem da variável de controle.
+        Devolve a profundidade da expressão, contando a das definições lidas (que _value() também percorre)."""
+        def visit(node, *operands):
+            node_type = type(node)
+            depth = 1 + max((depth for _, depth in operands), default=0)
+            if node_type is Literal:
+                if type(node.value) is bool: raise NotClosedForm()
+                result = REAL if type(node.value) is float else INT
+            elif node_type is Variable:
+                slot = node.slot
+                if node.checked or slot < 0: raise NotClosedForm()
+                result = self.types[slot]
+                if slot == self.loop_slot: self.varying.add(node)
+                elif slot == target: self.varying.add(node) # O próprio acumulador (veja _terms()).
+                elif slot in self.assigned: # Só pode ler uma variável já calculada nesta mesma iteração.
+                    if self.assigned[slot] >= position or slot not in self.definitions: raise NotClosedForm()
+                    if self.definitions[slot] in self.varying: self.varying.add(node)
+                    depth += self.depths[slot]
+                else: self.inputs[slot] = result
+                if result not in RUNTIME_TYPES: raise NotClosedForm()
+            elif node_type is ArithOp:
+                (left, _), (right, _) = operands
+                if node.op == TokenType.DIV or node.op == INT_DIV: # O divisor não pode mudar no laço.
+                    if node.right in self.varying: raise NotClosedForm()
+                result = INT if node.op == INT_DIV else arithmetic_type(left, right)
+                if result is None: raise NotClosedForm()
+                if result == REAL or node.op == TokenType.DIV: # Um INT que entra numa conta com float.
+                    self.guarded.extend(child for child, child_type in ((node.left, left), (node.right, right)) if child_type == INT)
+                if node.left in self.varying or node.right in self.varying: self.varying.add(node)
+            elif node_type is Convert:
+                (operand, _), = operands
+                if node.operand in self.varying: # Só INT -> REAL é seguro em toda iteração (int() de inf falha).
+                    if node.target != REAL or operand != INT: raise NotClosedForm()
+                    self.guarded.append(node.operand); self.varying.add(node)
+                result = node.target
+                if result not in RUNTIME_TYPES: raise NotClosedForm()
+            else: raise NotClosedForm()
+            if depth > MAX_DEPTH: raise NotClosedForm()
+            self.node_types[node] = result
+            return result, depth
+        return reduce_expression(expr, visit)[1]
+
+    def _terms(self, expr, slot):
+        """Se a expressão lê a variável 'slot', ela precisa ser v + t1 - t2 ... (em qualquer ordem
+        das somas): devolve os termos (sinal, nó) na ordem em que o laço os aplica. Senão, None."""
+        reads = [node for node in walk(expr) if type(node) is Variable and node.slot == slot]
+        if not reads: return None
+        if len(reads) > 1: raise NotClosedForm()
+        terms, node = [], expr
+        while node is not reads[0]:
+            if type(node) is not ArithOp or (node.op != TokenType.PLUS and node.op != TokenType.MINUS): raise NotClosedForm()
+            if reads[0] in walk(node.left): terms.append((1 if node.op == TokenType.PLUS else -1, node.right)); node = node.left
+            elif node.op == TokenType.PLUS: terms.append((1, node.left)); node = node.right # t + v = v + t.
+            else: raise NotClosedForm()
+        terms.reverse() # O nó mais interno é somado primeiro.
+        return terms
+
+    def _degree(self, node):
+        """Grau do termo INT como polinômio na variável de controle."""
+        if node not in self.varying: return 0
+        node_type = type(node)
+        if node_type is Variable:
+            if node.slot == self.loop_slot: return 1
+            return self._degree(self.definitions[node.slot])
+        if node_type is ArithOp and node.op != INT_DIV:
+            left, right = self._degree(node.left), self._degree(node.right)
+            degree = left + right if node.op == TokenType.MUL else max(left, right)
+            if degree > MAX_DEGREE: raise NotClosedForm()
+            return degree
+        raise NotClosedForm()
+
+    def _vectorizable(self, node):
+        """Um termo REAL é calculado em arrays: as partes INT que variam viram int64 e depois float."""
+        if node not in self.varying: return
+        if type(node) is Variable:
+            if node.slot != self.loop_slot: self._vectorizable(self.definitions[node.slot])
+        elif type(node) is Convert: self._vectorizable(node.operand)
+        else:
+            if node.op == INT_DIV: raise NotClosedForm()
+            self._vectorizable(node.left); self._vectorizable(node.right)
+        if self.node_types[node] == INT: self.guarded.append(node)
+
+    # --- Execução ---
+
+    def run(self, slots, start, end):
+        """Executa o laço 'FOR ... := start TO end' em forma fechada, atualizando os slots.
+        Devolve False (sem mudar nada) quando o laço deve rodar normalmente."""
+        if type(start) is not int or type(end) is not int or end - start + 1 < MIN_ITERATIONS: return False
+        for slot, slot_type in self.inputs.items():
+            if type(slots[slot]) is not RUNTIME_TYPES[slot_type]: return False
+        results = {}
+        try:
+            for node in self.guarded:
+                low, high = self._bounds(node, slots, start, end)
+                if low < -EXACT_INT or high > EXACT_INT: return False
+            for slot, terms in self.int_sums:
+                if type(slots[slot]) is not int: return False
+                results[slot] = slots[slot] + self._int_sum(terms, slots, start, end)
+            for slot, terms in self.float_sums:
+                if type(slots[slot]) is not float: return False
+                results[slot] = self._float_sum(slots[slot], terms, slots, start, end)
+            for slot, expr in self.values: results[slot] = self._value(expr, slots, end)
+        except (ArithmeticError, ValueError, TypeError): # Ex: divisão por zero: o laço normal reporta o erro.
+            return False
+        for slot, value in results.items(): slots[slot] = value
+        slots[self.loop_slot] = end
+        return True
+
+    def _value(self, node, slots, i):
+        """O valor da expressão na iteração 'i' (as variáveis calculadas no corpo são substituídas)."""
+        node_type = type(node)
+        if node_type is Literal: return node.value
+        if node_type is Variable:
+            slot = node.slot
+            if slot == self.loop_slot: return i
+            definition = self.definitions.get(slot)
+            return slots[slot] if definition is None else self._value(definition, slots, i)
+        if node_type is Convert: return CONVERSIONS[node.target](self._value(node.operand, slots, i))
+        return ARITHMETIC[node.op](self._value(node.left, slots, i), self._value(node.right, slots, i))
+
+    def _int_sum(self, terms, slots, start, end):
+        """Soma dos termos em todas as iterações: com os valores nas primeiras grau+1 iterações, a soma de
+        um polinômio é sum(diferença_k * C(n, k + 1)), com n o número de iterações."""
+        points = [sum(sign * self._value(term, slots, i) for sign, term in terms) for i in range(start, start + self.degree + 1)]
+        total, count = 0, end - start + 1
+        for k in range(len(points)):
+            total += points[0] * comb(count, k + 1)
+            points = [b - a for a, b in zip(points, points[1:])]
+        return total
+
+    def _float_sum(self, value, terms, slots, start, end):
+        with np.errstate(all='ignore'): # inf e nan seguem as regras do float do Python, sem avisos.
+            for first in range(start, end + 1, CHUNK):
+                i = np.arange(first, min(first + CHUNK, end + 1), dtype=np.int64)
+                columns = [np.broadcast_to(np.asarray(self._vector(term, slots, i), dtype=np.float64), i.shape) for _, term in terms]
+                columns = [column if sign > 0 else -column for (sign, _), column in zip(terms, columns)]
+                # Os termos intercalados (iteração 1: t1, t2...; iteração 2: t1, t2...) somados em sequência.
+                steps = np.column_stack(columns).ravel()
+                value = np.add.accumulate(np.concatenate(([value], steps)))[-1]
+        return float(value)
+
+    def _vector(self, node, slots, i):
+        """O valor da expressão para todas as iterações do array 'i' (ou um escalar, se ela não varia)."""
+        if node not in self.varying: return self._value(node, slots, None)
+        node_type = type(node)
+        if node_type is Variable:
+            if node.slot == self.loop_slot: return i
+            return self._vector(self.definitions[node.slot], slots, i)
+        if node_type is Convert: return np.asarray(self._vector(node.operand, slots, i), dtype=np.float64)
+        right = self._vector(node.right, slots, i)
+        if node.op == TokenType.DIV and right == 0: raise ZeroDivisionError() # O NumPy daria inf, o Python não.
+        return ARITHMETIC[node.op](self._vector(node.left, slots, i), right)
+
+    def _bounds(self, node, slots, start, end):
+        """Limites (mínimo, máximo) de um nó INT em todas as iterações (aritmética de intervalos)."""
+        if node not in self.varying: value = self._value(node, slots, None); return value, value
+        if type(node) is Variable:
+            if node.slot == self.loop_slot: return start, end
+            return self._bounds(self.definitions[node.slot], slots, start, end)
+        (a, b), op = self._bounds(node.left, slots, start, end), node.op
+        if op == INT_DIV: # Divisor fixo: a divisão é monótona no dividendo.
+            divisor = self._value(node.right, slots, None)
+            return min(int_div(a, divisor), int_div(b, divisor)), max(int_div(a, divisor), int_div(b, divisor))
+        c, d = self._bounds(node.right, slots, start, end)
+        if op == TokenType.PLUS: return a + c, b + d
+        if op == TokenType.MINUS: return a - d, b - c
+        products = (a * c, a * d, b * c, b * d)
+        return min(products), max(products)
+
+
+def walk(node):
+    """Todos os nós de uma expressão."""
+    nodes = [node]
+    for current in nodes:
+        node_type = type(current)
+        if node_type is ArithOp: nodes.append(current.left); nodes.append(current.right)
+        elif node_type is Convert: nodes.append(current.operand)
+    return nodes
+
+
+def plan_loop(node, layout):
+    """Devolve o LoopPlan do FOR (analisando e guardando em cache na primeira vez), ou None."""
+    cached = _plans.get(node)
+    if cached is not None and cached[0] is layout: return cached[1]
+    try: plan = LoopPlan(node, layout)
+    except NotClosedForm: plan = None
+    _plans[node] = (layout, plan)
+    return plan
@@ -0,0 +1,59 @@
+# scl_errors.py
+
+# As exceções dos erros de um programa SCL. Todo erro (léxico, sintático, semântico ou de execução)
+# é lançado como um SCLError, sem encerrar o processo: quem chama decide o que fazer com ele
+# (o main.py imprime a mensagem; o scl_runner.py guarda o erro no relatório e segue para o próximo programa).
+#
+# str(erro) tem o mesmo formato das mensagens de sempre: "ERRO (linha N): mensagem".
+
+
+class SCLError(Exception):
+    """Base de todos os erros de um programa SCL."""
+    kind = 'error' # Categoria do erro, usada nos relatórios.
+
+    def __init__(self, message, lineno=None, token=None):
+        super().__init__(message)
+        self.message = message
+        self.lineno = lineno  # Linha do código SCL onde o erro aconteceu (ou None, se não se aplica).
+        self.token = token    # O token atual, para os erros do parser.
+
+    def __str__(self):
+        if self.lineno is None: return f"ERRO: {self.message}"
+        return f"ERRO (linha {self.lineno}): {self.message}"
+
+    def as_dict(self):
+        return {'type': self.kind, 'lineno': self.lineno, 'message': self.message}
+
+
+class SCLLexicalError(SCLError):
+    """Caractere que não pertence a nenhum token."""
+    kind = 'lexical'
+
+
+class SCLSyntaxError(SCLError):
+    """Sequência de tokens que não segue a gramática."""
+    kind = 'syntax'
+
+
+class SCLSemanticError(SCLError):
+    """Uso inválido de variáveis (não declarada, declarada duas vezes)."""
+    kind = 'semantic'
+
+
+class SCLRuntimeError(SCLError):
+    """Erro que só aparece durante a execução (ex: variável usada antes de ter valor)."""
+    kind = 'runtime'
+
+
+# Os erros do próprio Python que uma operação SCL pode provocar durante a execução (divisão por zero,
+# int() de inf/nan, range() com limites REAL). Os motores os trocam por um SCLRuntimeError com a linha
+# da operação, com a mensagem de runtime_error_message().
+PYTHON_RUNTIME_ERRORS = (ArithmeticError, ValueError, TypeError)
+
+
+def runtime_error_message(error):
+    """A mensagem SCL para um dos PYTHON_RUNTIME_ERRORS (as mesmas do modo em lote, scl_batch.py)."""
+    if isinstance(error, ZeroDivisionError): return "Erro de Execução: Divisão por zero."
+    if isinstance(error, OverflowError): return "Erro de Execução: Valor fora da faixa numérica."
+    if isinstance(error, ValueError): return "Erro de Execução: Valor inválido (NaN) convertido para INT."
+    return "Erro de Execução: Os limites do FOR devem ser inteiros." # TypeError: o range() de um FOR com limites REAL.
@@ -0,0 +1,184 @@
+# scl_evaluator.py
+
+# O SCLEvaluator é o "executor" da linguagem SCL: ele recebe a AST montada pelo
+# SCLParser (veja scl_ast.py) e a percorre, executando os comandos e calculando
+# as expressões. Como a árvore já está pronta, nenhum token é lido de novo:
+# um laço com milhares de iterações apenas visita os mesmos nós várias vezes,
+# e um bloco que não deve ser executado (ELSE falso, fim de WHILE) é simplesmente ignorado.
+# As variáveis são lidas e escritas por índice ("slot"), resolvido antes da execução.
+
+import operator
+
+from token_definitions import TokenType
+from scl_ast import (Node, Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     LogicOp, Comparison, ArithOp, NotOp, Literal, Variable, Convert)
+from scl_resolver import UNDECLARED, resolve_program
+from scl_errors import SCLSemanticError, SCLRuntimeError, PYTHON_RUNTIME_ERRORS, runtime_error_message
+from scl_types import INT_DIV, int_div, CONVERSIONS
+from scl_closedform import plan_loop
+
+# Tabela que associa cada operador binário (exceto AND/OR, que avaliam o lado direito
+# apenas quando necessário) à função Python que o implementa. INT_DIV é a divisão entre
+# dois INTs, escolhida no lugar de DIV pela inferência de tipos (scl_types.py).
+BINARY_OPERATORS = {
+    TokenType.EQ: operator.eq, TokenType.NEQ: operator.ne,
+    TokenType.LT: operator.lt, TokenType.LTE: operator.le,
+    TokenType.GT: operator.gt, TokenType.GTE: operator.ge,
+    TokenType.PLUS: operator.add, TokenType.MINUS: operator.sub,
+    TokenType.MUL: operator.mul, TokenType.DIV: operator.truediv, INT_DIV: int_div,
+}
+
+
+def print_output(value):
+    """A saída padrão do PRINT: o valor vai para o stdout."""
+    print(f"[SAÍDA SCL] {value}")
+
+
+class SCLEvaluator:
+    def __init__(self, symbol_table=None, output=print_output):
+        # Os valores das variáveis ficam em uma lista plana ('slots'), indexada pelo slot que o
+        # resolvedor (scl_resolver.py) atribuiu a cada variável. Se uma Tabela de Símbolos (dict)
+        # for passada aqui, ela é preenchida no formato {nome: {'type': ..., 'value': ...}} ao fim de run().
+        self.output_table = symbol_table
+        self.output = output # Função chamada pelo PRINT com cada valor (ex: para guardar as saídas em uma lista).
+        self.layout = None
+        self.slots = []
+
+        # Tabelas de despacho: para cada classe de nó, o método que sabe executá-la/avaliá-la.
+        self._statement_handlers = {
+            Declaration: self.declaration, Assignment: self.assignment, IfStatement: self.if_statement,
+            WhileStatement: self.while_statement, ForStatement: self.for_statement, PrintStatement: self.print_statement,
+        }
+        self._expression_handlers = {
+            LogicOp: self.logic_op, Comparison: self.binary_op, ArithOp: self.binary_op,
+            NotOp: self.not_op, Literal: self.literal, Variable: self.variable, Convert: self.convert,
+        }
+
+    @property
+    def symbol_table(self):
+        """Visão da Tabela de Símbolos montada a partir dos slots (para inspeção e JSON)."""
+        return self.layout.symbol_table(self.slots) if self.layout is not None else {}
+
+    def _runtime_error(self, message, node, error_type=SCLRuntimeError):
+        """Lança o erro (com a linha do nó), interrompendo a execução."""
+        raise error_type(message, node.lineno)
+
+    def _check_declared(self, name, slot, node):
+        if self.slots[slot] is UNDECLARED: self._runtime_error(f"Erro Semântico: Variável '{name}' não declarada.", node, SCLSemanticError)
+
+    # --- Execução de Comandos ---
+
+    def run(self, program):
+        """Ponto de entrada: resolve as variáveis (uma vez por programa) e executa todos os comandos."""
+        self.layout, errors = resolve_program(program)
+        if errors: self._runtime_error(errors[0][1], Node(errors[0][0]), SCLSemanticError)
+        self.slots = self.layout.new_slots()
+        try:
+            self.statement_list(program.statements)
+        finally:
+            if self.output_table is not None: self.output_table.clear(); self.output_table.update(self.symbol_table)
+
+    def statement_list(self, statements):
+        handlers = self._statement_handlers
+        for statement in statements: handlers[type(statement)](statement)
+
+    def declaration(self, node):
+        if self.slots[node.slot] is not UNDECLARED: self._runtime_error(f"Erro Semântico: Variável '{node.name}' já declarada.", node, SCLSemanticError)
+        self.slots[node.slot] = None # Declarada, com valor inicial nulo
+
+    def assignment(self, node):
+        if node.checked: self._check_declared(node.name, node.slot, node)
+        self.slots[node.slot] = self.evaluate(node.expr)
+
+    def print_statement(self, node):
+        self.output(self.evaluate(node.expr))
+
+    def if_statement(self, node):
+        if self.evaluate(node.condition): self.statement_list(node.then_body)
+        elif node.else_body is not None: self.statement_list(node.else_body)
+
+    def while_statement(self, node):
+        while self.evaluate(node.condition): self.statement_list(node.body)
+
+    def for_statement(self, node):
+        if node.checked: self._check_declared(node.var_name, node.slot, node)
+        start_val = self.evaluate(node.start); end_val = self.evaluate(node.end)
+        plan = plan_loop(node, self.layout) # Corpo só com atribuições aritméticas: forma fechada (scl_closedform.py).
+        if plan is not None and plan.run(self.slots, start_val, end_val): return
+        slots, slot = self.slots, node.slot
+        for i in self._for_range(start_val, end_val, node):
+            slots[slot] = i # Atualiza a variável de controle.
+            self.statement_list(node.body)
+
+    def _for_range(self, start_val, end_val, node):
+        try: return range(start_val, end_val + 1)
+        except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), node)
+
+    # --- Avaliação de Expressões ---
+
+    def evaluate(self, node):
+        """Calcula e devolve o valor de um nó de expressão.
+        A avaliação é recursiva (pelos métodos de _expression_handlers), que é o caminho rápido. Uma expressão
+        funda demais para a pilha do Python (ex: 'x + x + ... + x' gerado por máquina, com um nível por '+')
+        é refeita do início por _evaluate_deep(), com uma pilha explícita: avaliar não altera nenhuma variável."""
+        try: return self._expression_handlers[type(node)](node)
+        except RecursionError: return self._evaluate_deep(node)
+
+    def _evaluate(self, node): # Avaliação recursiva de um operando (só a raiz passa por evaluate()).
+        return self._expression_handlers[type(node)](node)
+
+    def logic_op(self, node): # OR e AND: o lado direito só é avaliado quando necessário.
+        left = self._evaluate(node.left)
+        if node.op == TokenType.OR: return left or self._evaluate(node.right)
+        return left and self._evaluate(node.right)
+
+    def binary_op(self, node): # Comparações e operadores aritméticos.
+        return self.apply_binary(node, self._evaluate(node.left), self._evaluate(node.right))
+
+    def not_op(self, node):
+        return not self._evaluate(node.operand)
+
+    def literal(self, node):
+        return node.value
+
+    def convert(self, node):
+        return self.apply_convert(node, self._evaluate(node.operand))
+
+    def apply_binary(self, node, left, right):
+        try: return BINARY_OPERATORS[node.op](left, right)
+        except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), node) # Ex: divisão por zero.
+
+    def apply_convert(self, node, value):
+        try: return CONVERSIONS[node.target](value)
+        except PYTHON_RUNTIME_ERRORS as error: self._runtime_error(runtime_error_message(error), node) # int() de inf ou nan.
+
+    def _evaluate_deep(self, node):
+        """A mesma avaliação, sem recursão. Na pilha 'pending' ficam os nós a calcular e, abaixo dos operandos de
+        cada operador, o próprio operador marcado como (nó,), aplicado quando os valores deles já estão em 'values'."""
+        values, pending = [], [node]
+        while pending:
+            node = pending.pop()
+            node_type = type(node)
+            if node_type is tuple: # Os operandos já foram calculados (no AND/OR, só o lado esquerdo).
+                node = node[0]
+                node_type = type(node)
+                if node_type is LogicOp: # O lado direito só é avaliado quando o esquerdo não decide.
+                    if (values[-1] if node.op == TokenType.OR else not values[-1]): continue
+                    values.pop(); pending.append(node.right)
+                elif node_type is NotOp: values[-1] = not values[-1]
+                elif node_type is Convert: values[-1] = self.apply_convert(node, values[-1])
+                else: right = values.pop(); values[-1] = self.apply_binary(node, values[-1], right)
+            elif node_type is Variable: values.append(self.variable(node))
+            elif node_type is Literal: values.append(node.value)
+            elif node_type is LogicOp: pending.append((node,)); pending.append(node.left)
+            elif node_type is NotOp or node_type is Convert: pending.append((node,)); pending.append(node.operand)
+            else: pending.append((node,)); pending.append(node.right); pending.append(node.left) # Comparison e ArithOp.
+        return values[0]
+
+    def variable(self, node):
+        value = self.slots[node.slot]
+        # Só os acessos que o resolvedor não conseguiu provar seguros são verificados.
+        if node.checked and (value is None or value is UNDECLARED):
+            if value is UNDECLARED: self._runtime_error(f"Erro Semântico: Variável '{node.name}' não declarada.", node, SCLSemanticError)
+            self._runtime_error(f"Erro de Execução: Variável '{node.name}' usada antes de ser inicializada.", node)
+        return value
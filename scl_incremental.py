@@ -0,0 +1,227 @@
+# scl_incremental.py
+
+# Front end incremental, para editores e para recarregar programas "a quente".
+#
+# O IncrementalDocument guarda o código-fonte dividido em unidades: cada comando de nível
+# superior (com o ';' que o termina e os espaços/comentários antes dele) é uma unidade, com
+# os seus tokens e o seu nó da AST. Uma edição (intervalo + texto novo) só analisa de novo
+# as unidades que ela toca:
+#
+#   1. O texto das unidades atingidas é tokenizado de novo (nenhum token atravessa um ';',
+#      então o início de uma unidade é sempre um limite de token).
+#   2. Esses tokens viram comandos com o próprio SCLParser. Se a análise "esbarra" no fim do
+#      trecho (ex: um ';' apagado, um END_IF que ficou mais abaixo, um '//' que agora comenta o
+#      ';' final), a unidade seguinte entra no trecho e a análise é refeita. Um erro antes do fim
+#      do trecho é um erro de verdade: os tokens depois dele não mudariam o resultado, então o
+#      trecho fica marcado com o erro.
+#   3. As unidades seguintes são reaproveitadas como estão. Cada unidade guarda só o seu tamanho
+#      (em caracteres e em quebras de linha), então nada precisa ser deslocado na edição: a posição
+#      absoluta sai de uma soma acumulada, e os tokens/nós só são corrigidos quando alguém os pede.
+#
+# A granularidade é o comando de nível superior: editar o corpo de um FOR analisa o FOR inteiro.
+
+import bisect
+from array import array
+from itertools import accumulate
+
+from token_definitions import TokenCode
+from scl_ast import Node, Program
+from scl_parser import SCLParser, STATEMENT_STARTERS
+from scl_errors import SCLLexicalError, SCLSyntaxError
+
+
+class _RegionError(Exception):
+    """Erro léxico/sintático dentro de um trecho; 'at_end' diz se ele aconteceu no fim do trecho."""
+    def __init__(self, lineno, message, at_end):
+        super().__init__(message)
+        self.lineno, self.message, self.at_end = lineno, message, at_end
+
+
+class _RegionParser(SCLParser):
+    """O SCLParser de sempre, mas analisando um trecho do código e lançando os erros em vez de encerrar."""
+
+    def _parser_error(self, message, error_type=SCLSyntaxError):
+        token = self.current_token # None durante a tokenização.
+        at_end = token is not None and self.token_index == len(self.tokens) - 1 # No EOF que marca o fim do trecho.
+        raise _RegionError(token.lineno if token else self.lineno, message, at_end)
+
+    def lex(self, text, base, lineno):
+        """Tokeniza 'text', que começa na posição 'base' (linha 'lineno') do código-fonte.
+        Devolve (TokenStore terminado em EOF, se a análise parou antes do fim por causa de um '#')."""
+        self.palavra, self.posicao, self.lineno = text, 0, lineno
+        self.lookAhead = text[0] if text else '#'
+        self.tokens = None
+        tokens = self.tokenize()
+        tokens.shift(base)
+        return tokens, self.posicao < len(text)
+
+    def statements(self, tokens):
+        """Analisa os comandos do trecho e devolve (nó, índice do 1º token, índice depois do ';') de cada um."""
+        self.tokens = tokens
+        self._rewind(0)
+        result = []
+        while self.current_code in STATEMENT_STARTERS:
+            first = self.token_index
+            node = self.statement()
+            self.match_token(TokenCode.SEMICOLON)
+            result.append((node, first, self.token_index))
+        self.match_token(TokenCode.EOF) # O trecho precisa terminar junto com o último comando.
+        return result
+
+
+class Unit:
+    """Um pedaço do código: um comando de nível superior ('node'), um trecho com erro ('error'),
+    ou o final do arquivo (a última unidade, com o token EOF)."""
+
+    def __init__(self, position, lineno, tokens, node=None, error=None, lexical=False):
+        # Posição e linha do início da unidade que os tokens, os nós e o erro refletem no momento.
+        # Quando a unidade "anda" no texto, eles só são corrigidos em materialize().
+        self.position, self.lineno = position, lineno
+        self.tokens = tokens
+        self.node = node
+        self.error = error # (linha, mensagem) ou None.
+        self.lexical = lexical # Se o erro é léxico (eles vêm antes dos sintáticos, como no tokenize() do SCLParser).
+
+    def materialize(self, position, lineno):
+        """Corrige as posições/linhas dos tokens e as linhas dos nós para o início atual da unidade."""
+        positions, lines = position - self.position, lineno - self.lineno
+        if not positions and not lines: return
+        for token in self.tokens: token.position += positions; token.lineno += lines
+        if lines and self.node is not None:
+            pending = [self.node]
+            while pending:
+                node = pending.pop()
+                node.lineno += lines
+                for value in vars(node).values():
+                    if isinstance(value, Node): pending.append(value)
+                    elif type(value) is list: pending.extend(value)
+        if self.error is not None: self.error = (self.error[0] + lines, self.error[1])
+        self.position, self.lineno = position, lineno
+
+
+class IncrementalDocument:
+    def __init__(self, text):
+        self.text = text
+        self.parser = _RegionParser()
+        self.relexed_tokens = 0        # Quantos tokens a última edição tokenizou de novo...
+        self.reparsed_statements = 0   # ...e quantos comandos ela analisou de novo.
+        # Começa com uma única unidade cobrindo o texto todo e a analisa como se fosse uma edição.
+        self.units = [Unit(0, 1, [])]
+        self.lengths = array('q', [len(text)])         # Tamanho de cada unidade, em caracteres...
+        self.newlines = array('q', [text.count('\n')]) # ...e em quebras de linha.
+        self._reparse(0, 0, 0, 1)
+
+    def _starts(self):
+        """Posição e linha do início de cada unidade (somas acumuladas dos tamanhos)."""
+        return list(accumulate(self.lengths, initial=0)), list(accumulate(self.newlines, initial=1))
+
+    def _materialize(self):
+        positions, lines = self._starts()
+        for unit, position, lineno in zip(self.units, positions, lines): unit.materialize(position, lineno)
+
+    # --- Consultas ---
+
+    @property
+    def errors(self):
+        """Lista de (linha, mensagem) dos erros léxicos/sintáticos atuais (vazia se o código é válido)."""
+        broken = [unit for unit in self.units if unit.error is not None]
+        if broken: self._materialize()
+        return [unit.error for unit in broken if unit.lexical] + [unit.error for unit in broken if not unit.lexical]
+
+    @property
+    def tokens(self):
+        """O fluxo completo de tokens (terminado em EOF), como o tokenize() produziria."""
+        self._materialize()
+        return [token for unit in self.units for token in unit.tokens]
+
+    def program(self):
+        """O nó Program do código atual. Os nós dos comandos que não mudaram são os mesmos de antes.
+        Se houver erro, ele é lançado como no SCLParser (SCLLexicalError ou SCLSyntaxError)."""
+        errors = self.errors
+        if errors:
+            lexical = any(unit.lexical for unit in self.units if unit.error is not None) # Os léxicos vêm primeiro.
+            raise (SCLLexicalError if lexical else SCLSyntaxError)(errors[0][1], errors[0][0])
+        self._materialize()
+        statements = [unit.node for unit in self.units if unit.node is not None]
+        return Program(statements, self.units[-1].tokens[-1].lineno) # Como no SCLParser: a linha do EOF.
+
+    def offset(self, lineno, column=0):
+        """Converte (linha, coluna), contando a partir de 1 e 0, para a posição no código-fonte."""
+        if lineno <= 1: return column
+        positions, lines = self._starts()
+        # A última unidade que começa numa linha anterior (uma unidade pode começar no meio da própria linha).
+        index = max(0, bisect.bisect_left(lines, lineno, hi=len(self.units)) - 1)
+        position, line = positions[index], lines[index]
+        while line < lineno:
+            position = self.text.index('\n', position) + 1; line += 1
+        return position + column
+
+    # --- Edição ---
+
+    def edit(self, start, end, new_text):
+        """Troca o texto entre as posições [start, end) por 'new_text' e atualiza tokens e AST."""
+        ends = list(accumulate(self.lengths))
+        # As unidades atingidas: todas que encostam no intervalo editado (inclusive nas pontas).
+        first = bisect.bisect_left(ends, start)
+        last = first
+        while last + 1 < len(ends) and ends[last] <= end: last += 1
+
+        removed = self.text[start:end]
+        self.text = self.text[:start] + new_text + self.text[end:]
+        self.lengths[last] += len(new_text) - len(removed)
+        self.newlines[last] += new_text.count('\n') - removed.count('\n')
+        self._reparse(first, last, ends[first - 1] if first else 0, 1 + sum(self.newlines[:first]))
+
+    def _reparse(self, first, last, start, start_line):
+        """Analisa de novo as unidades [first, last], que começam na posição 'start' (linha 'start_line'),
+        aumentando o trecho enquanto o erro estiver no fim dele."""
+        units, text, parser = self.units, self.text, self.parser
+        self.relexed_tokens = self.reparsed_statements = 0
+        end = start + sum(self.lengths[first:last + 1])
+        while True:
+            is_tail = last == len(units) - 1
+            try:
+                tokens, stopped = parser.lex(text[start:end], start, start_line)
+                self.relexed_tokens += len(tokens) - 1
+                if stopped and not is_tail: # Um '#' ignora todo o resto do arquivo.
+                    end, last = len(text), len(units) - 1
+                    continue
+                line_start = max(start, text.rfind('\n', start, end) + 1)
+                if '//' in text[line_start:end] and not is_tail: # O comentário da última linha continua na próxima unidade.
+                    last += 1; end += self.lengths[last]
+                    continue
+                statements = parser.statements(tokens)
+            except _RegionError as error:
+                if error.at_end and not is_tail:
+                    last += 1; end += self.lengths[last]
+                    continue
+                lexical = parser.current_token is None # O erro aconteceu ainda na tokenização.
+                broken = Unit(start, start_line, [] if lexical else tokens.to_tokens(0, -1), error=(error.lineno, error.message), lexical=lexical)
+                if is_tail and not lexical: broken.tokens += tokens.to_tokens(-1)
+                self._replace(first, last, [broken], [end - start], [text.count('\n', start, end)])
+                return
+            break
+
+        self.reparsed_statements = len(statements)
+        tokens = tokens.to_tokens() # As unidades guardam objetos Token, que materialize() corrige no lugar.
+        new_units, lengths, newlines = [], [], []
+        position, line = start, start_line
+        for node, begin, finish in statements:
+            semicolon = tokens[finish - 1]
+            new_units.append(Unit(position, line, tokens[begin:finish], node))
+            lengths.append(semicolon.position + 1 - position); newlines.append(semicolon.lineno - line)
+            position, line = semicolon.position + 1, semicolon.lineno
+        rest, rest_lines = end - position, text.count('\n', position, end)
+        if is_tail: # O resto do trecho (espaços e comentários) e o EOF formam a unidade final.
+            new_units.append(Unit(position, line, [tokens[-1]]))
+            lengths.append(rest); newlines.append(rest_lines)
+        else: # O resto do trecho passa a fazer parte do início da próxima unidade (cujos tokens não mudam de lugar).
+            following = units[last + 1]
+            following.position -= rest; following.lineno -= rest_lines
+            self.lengths[last + 1] += rest; self.newlines[last + 1] += rest_lines
+        self._replace(first, last, new_units, lengths, newlines)
+
+    def _replace(self, first, last, new_units, lengths, newlines):
+        self.units[first:last + 1] = new_units
+        self.lengths[first:last + 1] = array('q', lengths)
+        self.newlines[first:last + 1] = array('q', newlines)
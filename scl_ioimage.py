@@ -0,0 +1,255 @@
+# scl_ioimage.py
+
+# Imagem de E/S em memória compartilhada: as variáveis INT/REAL/BOOL de um programa em execução cíclica
+# (scl_scan.py) ficam em uma região de layout fixo, em multiprocessing.shared_memory ou em um arquivo
+# mapeado (mmap), e outros processos (drivers, IHMs, loggers) as leem e escrevem direto na memória,
+# sem serialização.
+#
+# O layout é gerado a partir do SymbolLayout do programa e descrito por um dicionário (image.descriptor,
+# que pode ser gravado em JSON) com a posição de cada variável; com ele outro processo abre a mesma
+# região (IOImage.open). A região tem, em little-endian e alinhado em 8 bytes:
+#
+#   cabeçalho   'SCLI', versão (uint32), número de variáveis (uint32), 4 bytes livres, sequência (uint64)
+#   estado      uma célula de 8 bytes por variável (int64 para INT e BOOL, float64 para REAL) e, depois
+#               das células, um byte por variável: 0 = não declarada, 1 = declarada sem valor,
+#               2 = com valor, 3 = valor que a célula não representa (INT fora da faixa de 64 bits, ou um valor
+#               de outro tipo no slot); nesse caso a célula fica com o último valor que coube
+#   entrada     uma célula de 8 bytes por variável e, depois, um byte por variável: 1 = valor novo escrito
+#
+# O estado é publicado no fim de cada varredura (after_scan) com um seqlock: a sequência fica ímpar
+# durante a escrita e volta a ser par no fim, e quem lê (snapshot) repete a cópia se a sequência mudou
+# ou estava ímpar. Assim a leitura sempre vê o estado inteiro de uma mesma varredura. Se a sequência
+# fica ímpar por mais de SNAPSHOT_TIMEOUT (ex: o processo do programa morreu no meio de uma publicação),
+# snapshot() desiste com um SCLError. (A escrita não usa barreiras de memória: conta com os stores
+# ficando visíveis na ordem do programa, como no x86.)
+# As escritas de fora (write) vão para a área de entrada e são aplicadas no início da próxima
+# varredura (before_scan), como as entradas de um CLP: durante a varredura elas não mudam.
+
+import json
+import mmap
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+
+from token_definitions import TokenType
+from scl_resolver import UNDECLARED
+from scl_types import CONVERSIONS
+from scl_errors import SCLError
+
+MAGIC, VERSION = b'SCLI', 1
+HEADER = struct.Struct('<4sII4xQ')
+SEQUENCE_OFFSET = 16 # O uint64 da sequência, no fim do cabeçalho.
+FORMATS = {TokenType.TYPE_INT: 'q', TokenType.TYPE_BOOL: 'q', TokenType.TYPE_REAL: 'd'}
+STATE_UNDECLARED, STATE_NULL, STATE_VALUE, STATE_INVALID = 0, 1, 2, 3
+SNAPSHOT_TIMEOUT = 1.0 # Segundos que snapshot() espera uma publicação terminar.
+SPIN_RETRIES = 100     # Tentativas de snapshot() que só cedem a vez, antes de começar a esperar 1 ms entre elas.
+
+_created = set() # Nomes dos blocos de shared_memory criados por este processo.
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def build_descriptor(names, types):
+    """O descritor do layout de uma imagem com as variáveis 'names' (dos tipos 'types'), na ordem dada."""
+    count = len(names)
+    values = HEADER.size; states = values + 8 * count
+    inputs = _align(states + count); pending = inputs + 8 * count
+    return {
+        'magic': MAGIC.decode(), 'version': VERSION, 'size': max(pending + count, HEADER.size),
+        'sequence_offset': SEQUENCE_OFFSET, 'values_offset': values, 'states_offset': states,
+        'inputs_offset': inputs, 'pending_offset': pending,
+        'variables': [{'name': name, 'type': var_type, 'format': FORMATS[var_type], 'index': index,
+                       'offset': values + 8 * index, 'state_offset': states + index,
+                       'input_offset': inputs + 8 * index, 'pending_offset': pending + index}
+                      for index, (name, var_type) in enumerate(zip(names, types))],
+    }
+
+
+class IOImage:
+    def __init__(self, layout, name=None, path=None, variables=None):
+        # Cria a região para as variáveis do SymbolLayout 'layout' (só as de 'variables', se dado; nomes
+        # internos, com '$', nunca entram). Com 'path', a região é esse arquivo mapeado; senão, um bloco
+        # de shared_memory ('name' escolhe o nome; sem ele, o sistema escolhe um).
+        slots = [slot for slot, var_name in enumerate(layout.names)
+                 if not var_name.startswith('$') and (variables is None or var_name in variables)]
+        self.slots = slots # Slot do programa de cada variável da imagem.
+        self._create(build_descriptor([layout.names[slot] for slot in slots], [layout.types[slot] for slot in slots]), name, path)
+        HEADER.pack_into(self.buffer, 0, MAGIC, VERSION, len(slots), 0)
+
+    @classmethod
+    def open(cls, descriptor):
+        """Abre (em outro processo) a região descrita por 'descriptor': o dicionário image.descriptor ou o caminho do JSON (save_descriptor)."""
+        if not isinstance(descriptor, dict):
+            with open(descriptor, encoding='utf-8') as descriptor_file: descriptor = json.load(descriptor_file)
+        image = cls.__new__(cls)
+        image.slots = None # Só o lado que executa o programa conhece os slots.
+        image._open(descriptor)
+        magic, version, count, _ = HEADER.unpack_from(image.buffer, 0)
+        if magic != MAGIC or version != VERSION or count != len(descriptor['variables']):
+            image.close()
+            raise SCLError(f"A região de memória não é uma imagem de E/S SCL compatível com o descritor (versão {version}).")
+        return image
+
+    # --- A região de memória ---
+
+    def _create(self, descriptor, name, path):
+        self.descriptor = descriptor
+        size = descriptor['size']
+        if path is not None:
+            with open(path, 'w+b') as region_file:
+                region_file.truncate(size)
+                self._region = mmap.mmap(region_file.fileno(), size)
+            descriptor['path'] = path
+        else:
+            self._region = shared_memory.SharedMemory(name, create=True, size=size)
+            descriptor['shm_name'] = self._region.name
+            _created.add(self._region.name)
+        self.owner = True
+        self._map()
+
+    def _open(self, descriptor):
+        self.descriptor = descriptor
+        if 'path' in descriptor:
+            with open(descriptor['path'], 'r+b') as region_file: self._region = mmap.mmap(region_file.fileno(), descriptor['size'])
+        else:
+            self._region = shared_memory.SharedMemory(descriptor['shm_name'])
+            # Até o Python 3.12, o resource_tracker apagaria o bloco quando ESTE processo terminasse
+            # (no processo que criou o bloco, o registro é o do criador e fica).
+            if sys.version_info < (3, 13) and self._region.name not in _created:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self._region._name, 'shared_memory')
+        self.owner = False
+        self._map()
+
+    def _map(self):
+        """Cria as visões (memoryview, sem cópia) de cada área da região."""
+        d = self.descriptor
+        count = len(d['variables'])
+        self.buffer = buffer = memoryview(self._region.buf if isinstance(self._region, shared_memory.SharedMemory) else self._region)
+        self._sequence = buffer[SEQUENCE_OFFSET:SEQUENCE_OFFSET + 8].cast('Q')
+        state = buffer[d['values_offset']:d['values_offset'] + 8 * count]
+        inputs = buffer[d['inputs_offset']:d['inputs_offset'] + 8 * count]
+        self._views = [state.cast('q'), state.cast('d'), inputs.cast('q'), inputs.cast('d'), state, inputs]
+        self._values = {'q': self._views[0], 'd': self._views[1]}
+        self._inputs = {'q': self._views[2], 'd': self._views[3]}
+        self._states = buffer[d['states_offset']:d['states_offset'] + count]
+        self._pending = buffer[d['pending_offset']:d['pending_offset'] + count]
+        self._views += [self._sequence, self._states, self._pending]
+        # (índice, formato, conversão) de cada variável, na ordem da imagem.
+        self._cells = [(variable['index'], variable['format'], CONVERSIONS[variable['type']]) for variable in d['variables']]
+        self._by_name = {variable['name']: variable for variable in d['variables']}
+
+    def close(self):
+        """Libera as visões e a região (a região continua existindo para os outros processos)."""
+        for view in self._views: view.release()
+        self._views = []
+        self.buffer.release()
+        self._region.close()
+
+    def unlink(self):
+        """Remove o bloco de shared_memory (quem criou a imagem chama isto quando ela não é mais usada)."""
+        if isinstance(self._region, shared_memory.SharedMemory): self._region.unlink()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner: self.unlink()
+
+    def save_descriptor(self, path):
+        with open(path, 'w', encoding='utf-8') as descriptor_file: json.dump(self.descriptor, descriptor_file, indent=2)
+
+    # --- Lado do programa (ScanRuntime) ---
+
+    def attach(self, runtime):
+        """Liga a imagem a um ScanRuntime: as entradas são aplicadas antes de cada varredura e o estado
+        é publicado depois dela. Publica já o estado inicial."""
+        runtime.before_scan.append(lambda runtime: self.apply_inputs(runtime.evaluator.slots, runtime.evaluator.initial_values))
+        runtime.after_scan.append(lambda runtime: self.publish(runtime.evaluator.slots))
+        self.publish(runtime.evaluator.slots)
+        return self
+
+    def publish(self, slots):
+        """Copia os valores dos slots para a área de estado, com o seqlock."""
+        values, states = self._values, self._states
+        sequence = self._sequence
+        sequence[0] += 1 # Ímpar: escrita em andamento.
+        for slot, (index, value_format, _) in zip(self.slots, self._cells):
+            value = slots[slot]
+            if value is UNDECLARED: states[index] = STATE_UNDECLARED
+            elif value is None: states[index] = STATE_NULL
+            else:
+                try: values[value_format][index] = value; states[index] = STATE_VALUE
+                except (ValueError, TypeError): states[index] = STATE_INVALID # Não cabe em 64 bits, ou não é do tipo da célula.
+        sequence[0] += 1
+
+    def apply_inputs(self, slots, initial_values):
+        """Passa os valores escritos de fora (write) para os slots. Uma variável ainda não declarada recebe o
+        valor quando for declarada (via 'initial_values', como no ScanRuntime)."""
+        pending, inputs, names = self._pending, self._inputs, self.descriptor['variables']
+        if not any(pending): return
+        for slot, (index, value_format, convert) in zip(self.slots, self._cells):
+            if not pending[index]: continue
+            pending[index] = 0 # Antes de ler o valor: uma escrita que chegue agora fica para a próxima varredura.
+            value = convert(inputs[value_format][index])
+            if slots[slot] is UNDECLARED: initial_values[names[index]['name']] = value
+            else: slots[slot] = value
+
+    # --- Lado de quem lê e escreve (outros processos) ---
+
+    def snapshot(self, timeout=SNAPSHOT_TIMEOUT):
+        """O estado de uma mesma varredura, no formato da Tabela de Símbolos ({nome: {'type', 'value'}});
+        as variáveis ainda não declaradas ficam de fora."""
+        d, sequence = self.descriptor, self._sequence
+        start, end = d['values_offset'], d['states_offset'] + len(d['variables'])
+        retries, deadline = 0, time.monotonic() + timeout
+        while True:
+            before = sequence[0]
+            if not before & 1: # Par: nenhuma publicação em andamento.
+                data = bytes(self.buffer[start:end])
+                if sequence[0] == before: break
+            if time.monotonic() > deadline:
+                raise SCLError(f"A imagem de E/S está no meio de uma publicação há mais de {timeout} s (o programa parou durante a escrita?).")
+            retries += 1
+            time.sleep(0 if retries < SPIN_RETRIES else 0.001) # Cede a vez a quem está publicando.
+        result = {}
+        for variable, (index, value_format, convert) in zip(d['variables'], self._cells):
+            state = data[d['states_offset'] - start + index]
+            if state == STATE_UNDECLARED: continue
+            value = convert(struct.unpack_from('<' + value_format, data, 8 * index)[0]) if state == STATE_VALUE else None
+            result[variable['name']] = {'type': variable['type'], 'value': value}
+        return result
+
+    def read(self, name):
+        """O valor atual de uma variável, lido direto da região (sem o seqlock; None se não tem valor)."""
+        variable = self._by_name[name]
+        index, value_format, convert = self._cells[variable['index']]
+        if self._states[index] != STATE_VALUE: return None
+        return convert(self._values[value_format][index])
+
+    def write(self, name, value):
+        """Escreve um valor na área de entrada; o programa o recebe no início da próxima varredura."""
+        variable = self._by_name[name]
+        index, value_format, convert = self._cells[variable['index']]
+        self._inputs[value_format][index] = convert(value)
+        self._pending[index] = 1 # Depois do valor: quem aplica só vê o aviso com o valor já escrito.
+
+
+def parse_value(var_type, text):
+    """Converte o texto de um valor (linha de comando) para o tipo da variável. Um INT é lido com int():
+    passar por float() perderia os dígitos acima de 2**53."""
+    if var_type == TokenType.TYPE_BOOL: return text.upper() == 'TRUE'
+    if var_type == TokenType.TYPE_INT: return int(text)
+    return float(text)
+
+
+if __name__ == '__main__':
+    # Monitor pela linha de comando: python scl_ioimage.py descritor.json [nome=valor ...]
+    image = IOImage.open(sys.argv[1])
+    for assignment in sys.argv[2:]:
+        var_name, _, text = assignment.partition('=')
+        image.write(var_name, parse_value(image._by_name[var_name]['type'], text))
+    print(json.dumps(image.snapshot(), indent=4))
+    image.close()
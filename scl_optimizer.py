@@ -0,0 +1,285 @@
+# scl_optimizer.py
+
+# Otimizador opcional da AST, executado entre a análise sintática e a execução.
+# Ele trabalha sobre uma cópia da árvore e aplica três passes:
+#
+#   1. Dobra de constantes: expressões só com literais (ex: 2.0 * 3.0, 1 < 2, TRUE AND FALSE,
+#      NOT TRUE) viram um único literal. AND/OR com o lado esquerdo literal também são simplificados.
+#   2. Eliminação de blocos mortos: IF com condição constante é trocado pelo bloco que de fato
+#      executa, e WHILE com condição FALSE é removido.
+#   3. Remoção de invariantes de laço: expressões dentro de WHILE/FOR que não mudam entre as
+#      iterações são calculadas uma vez antes do laço, em variáveis internas ('$inv0', '$inv1', ...).
+#
+# Cada passe conta o que fez (OptimizationStats), para medirmos o efeito no nosso acervo de programas.
+# Uso pela linha de comando: python scl_optimizer.py arquivo1.scl [arquivo2.scl ...]
+
+import sys
+
+from token_definitions import TokenType
+from scl_ast import (Program, Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     LogicOp, Comparison, ArithOp, NotOp, Literal, Variable, Convert,
+                     reduce_expression, walk_expression, copy_tree)
+from scl_evaluator import BINARY_OPERATORS
+from scl_types import INT, REAL, INT_DIV, CONVERSIONS, literal_type
+from scl_resolver import resolve_program, walk_statements
+from scl_errors import PYTHON_RUNTIME_ERRORS
+
+
+class OptimizationStats:
+    """Contadores de cada passe do otimizador."""
+
+    def __init__(self):
+        self.nodes_folded = 0         # Passe 1: nós de operador substituídos por um literal (ou simplificados).
+        self.blocks_removed = 0       # Passe 2: blocos THEN/ELSE/WHILE que nunca executam e foram removidos.
+        self.ifs_removed = 0          # Passe 2: comandos IF de condição constante substituídos pelo bloco vivo.
+        self.loops_optimized = 0      # Passe 3: laços dos quais pelo menos uma expressão foi retirada.
+        self.expressions_hoisted = 0  # Passe 3: expressões invariantes retiradas de dentro de laços.
+
+    def merge(self, other):
+        """Soma os contadores de outro OptimizationStats (útil para totalizar um acervo)."""
+        for name, value in vars(other).items(): setattr(self, name, getattr(self, name) + value)
+        return self
+
+    def as_dict(self):
+        return {
+            'constant_folding': {'nodes_folded': self.nodes_folded},
+            'dead_branches': {'blocks_removed': self.blocks_removed, 'ifs_removed': self.ifs_removed},
+            'loop_invariants': {'loops_optimized': self.loops_optimized, 'expressions_hoisted': self.expressions_hoisted},
+        }
+
+    def __str__(self):
+        return (f"dobra de constantes: {self.nodes_folded} nós | "
+                f"blocos mortos: {self.blocks_removed} blocos, {self.ifs_removed} IFs | "
+                f"invariantes: {self.expressions_hoisted} expressões em {self.loops_optimized} laços")
+
+
+def has_operator(node):
+    return type(node) not in (Literal, Variable)
+
+
+def operand_names(node):
+    """Os atributos que guardam os operandos do nó (para trocá-los no lugar)."""
+    if type(node) is NotOp or type(node) is Convert: return ('operand',)
+    return ('left', 'right') if has_operator(node) else ()
+
+
+def expression_type(node, layout):
+    """O tipo (TokenType.TYPE_*) do resultado de uma expressão, usado para declarar as variáveis internas."""
+    return reduce_expression(node, lambda node, *operand_types: node_type_of(node, operand_types, layout))
+
+
+def node_type_of(node, operand_types, layout):
+    """O tipo do resultado de um nó, dados os tipos dos seus operandos."""
+    node_type = type(node)
+    if node_type is Literal: return literal_type(node.value)
+    if node_type is Variable: # As variáveis internas dos laços já otimizados ainda não têm slot (nem são invariantes).
+        return layout.types[node.slot] if hasattr(node, 'slot') else None
+    if node_type is Convert: return node.target
+    if node_type is ArithOp: # A árvore já passou pela inferência de tipos: a divisão de INTs é INT_DIV.
+        if node.op == TokenType.DIV: return REAL
+        if node.op == INT_DIV: return INT
+        return REAL if REAL in operand_types else INT
+    return TokenType.TYPE_BOOL # Comparison, LogicOp e NotOp
+
+
+class Optimizer:
+    def __init__(self):
+        self.stats = OptimizationStats()
+        self.temporaries = [] # Declarações das variáveis internas criadas pelo passe 3.
+
+    def optimize(self, program):
+        """Devolve um novo Program otimizado; a árvore original não é alterada."""
+        statements = copy_tree(program.statements)
+        statements = self.fold_block(statements) # Passes 1 e 2.
+
+        # O passe 3 precisa saber quais variáveis certamente já têm valor antes de cada laço:
+        # essa informação vem do resolvedor (acessos com 'checked = False').
+        folded = Program(statements, program.lineno)
+        layout, errors = resolve_program(folded)
+        if errors: return folded # O programa vai falhar na execução de qualquer forma; nada a ganhar aqui.
+        self.layout = layout
+        statements = self.hoist_block(statements)
+        return Program(self.temporaries + statements, program.lineno)
+
+    # --- Passes 1 e 2: dobra de constantes e blocos mortos ---
+
+    def fold_block(self, statements):
+        result = []
+        for node in statements:
+            node_type = type(node)
+            if node_type is Assignment or node_type is PrintStatement:
+                node.expr = self.fold(node.expr)
+            elif node_type is IfStatement:
+                node.condition = self.fold(node.condition)
+                node.then_body = self.fold_block(node.then_body)
+                if node.else_body is not None: node.else_body = self.fold_block(node.else_body)
+                if type(node.condition) is Literal: # Só um dos blocos pode executar: ele entra no lugar do IF.
+                    self.stats.ifs_removed += 1
+                    if node.condition.value:
+                        if node.else_body is not None: self.stats.blocks_removed += 1
+                        result.extend(node.then_body)
+                    else:
+                        self.stats.blocks_removed += 1
+                        result.extend(node.else_body or [])
+                    continue
+            elif node_type is WhileStatement:
+                node.condition = self.fold(node.condition)
+                if type(node.condition) is Literal and not node.condition.value: # O corpo nunca executa.
+                    self.stats.blocks_removed += 1
+                    continue
+                node.body = self.fold_block(node.body)
+            elif node_type is ForStatement:
+                node.start, node.end = self.fold(node.start), self.fold(node.end)
+                node.body = self.fold_block(node.body)
+            result.append(node)
+        return result
+
+    def fold(self, node):
+        """Devolve a expressão com todas as subexpressões constantes já calculadas (de baixo para cima, sem recursão)."""
+        return reduce_expression(node, self.fold_node)
+
+    def fold_node(self, node, *operands):
+        """Dobra um nó cujos operandos ('operands') já foram dobrados."""
+        node_type = type(node)
+        if node_type is NotOp:
+            node.operand, = operands
+            if type(node.operand) is Literal:
+                self.stats.nodes_folded += 1
+                return Literal(not node.operand.value, node.lineno)
+        elif node_type is LogicOp:
+            node.left, node.right = operands
+            if type(node.left) is Literal: # Mesma regra do curto-circuito do SCLEvaluator.
+                self.stats.nodes_folded += 1
+                decided = bool(node.left.value) if node.op == TokenType.OR else not node.left.value
+                return node.left if decided else node.right
+        elif node_type is Comparison or node_type is ArithOp:
+            node.left, node.right = operands
+            if type(node.left) is Literal and type(node.right) is Literal:
+                op = node.op
+                # A divisão por zero fica para a execução, que reporta o erro normalmente.
+                if (op == TokenType.DIV or op == INT_DIV) and node.right.value == 0: return node
+                # Com os dois lados INT, '/' é a divisão inteira (como a inferência de tipos decidiria).
+                if op == TokenType.DIV and literal_type(node.left.value) == literal_type(node.right.value) == INT: op = INT_DIV
+                try: value = BINARY_OPERATORS[op](node.left.value, node.right.value)
+                except PYTHON_RUNTIME_ERRORS: return node # Ex: INT grande demais para REAL: também fica para a execução.
+                self.stats.nodes_folded += 1
+                return Literal(value, node.lineno)
+        elif node_type is Convert:
+            node.operand, = operands
+            if type(node.operand) is Literal:
+                try: value = CONVERSIONS[node.target](node.operand.value)
+                except PYTHON_RUNTIME_ERRORS: return node # int() de inf: a execução reporta o erro.
+                self.stats.nodes_folded += 1
+                return Literal(value, node.lineno)
+        return node
+
+    # --- Passe 3: invariantes de laço ---
+
+    def hoist_block(self, statements):
+        result = []
+        for node in statements:
+            node_type = type(node)
+            if node_type is IfStatement:
+                node.then_body = self.hoist_block(node.then_body)
+                if node.else_body is not None: node.else_body = self.hoist_block(node.else_body)
+            elif node_type is WhileStatement or node_type is ForStatement:
+                node.body = self.hoist_block(node.body) # Primeiro os laços internos.
+                result.extend(self.hoist_loop(node))
+            result.append(node)
+        return result
+
+    def hoist_loop(self, loop):
+        """Troca as expressões invariantes do laço por variáveis internas e devolve as atribuições
+        que devem ficar logo antes dele."""
+        modified = set()
+        if type(loop) is ForStatement: modified.add(loop.var_name)
+        for node in walk_statements(loop.body):
+            if type(node) in (Assignment, Declaration): modified.add(node.name)
+            elif type(node) is ForStatement: modified.add(node.var_name)
+
+        hoisted = {} # Chave estrutural da expressão -> Assignment da variável interna.
+        def hoist(node):
+            key = expression_key(node)
+            if key not in hoisted:
+                name = f"$inv{len(self.temporaries)}"
+                self.temporaries.append(Declaration(expression_type(node, self.layout), name, loop.lineno))
+                hoisted[key] = Assignment(name, node, loop.lineno)
+            self.stats.expressions_hoisted += 1
+            return Variable(hoisted[key].name, node.lineno)
+
+        def replace(root):
+            """Troca as maiores subexpressões invariantes (com algum operador) por variáveis internas,
+            da esquerda para a direita e sem recursão."""
+            invariant = self.invariant_nodes(root, modified)
+            if root in invariant and has_operator(root): return hoist(root)
+            pending = [(root, name) for name in reversed(operand_names(root))]
+            while pending:
+                parent, name = pending.pop()
+                node = getattr(parent, name)
+                if node in invariant and has_operator(node): setattr(parent, name, hoist(node))
+                else: pending.extend((node, name) for name in reversed(operand_names(node)))
+            return root
+
+        if type(loop) is WhileStatement: loop.condition = replace(loop.condition)
+        for node in walk_statements(loop.body):
+            node_type = type(node)
+            if node_type is Assignment or node_type is PrintStatement: node.expr = replace(node.expr)
+            elif node_type is IfStatement or node_type is WhileStatement: node.condition = replace(node.condition)
+            elif node_type is ForStatement: node.start, node.end = replace(node.start), replace(node.end)
+        if hoisted: self.stats.loops_optimized += 1
+        return list(hoisted.values())
+
+    def invariant_nodes(self, node, modified):
+        """Os nós da expressão que podem sair do laço: nenhuma variável deles muda dentro do laço e calculá-los
+        antes não pode causar erro (mesmo que o laço não execute nenhuma vez): todas as variáveis já têm valor
+        garantido (acesso sem 'checked'), não há divisão por algo que possa ser zero nem conta entre INT e REAL."""
+        invariant, layout = set(), self.layout
+        def visit(node, *operands): # 'operands': (invariante, tipo) de cada operando.
+            node_type = type(node)
+            operand_types = [operand_type for _, operand_type in operands]
+            if node_type is Literal: result = True
+            elif node_type is Variable: result = node.name not in modified and not getattr(node, 'checked', True)
+            elif node_type is NotOp: result = operands[0][0]
+            # Convert para INT pode falhar (ex: int() de um REAL infinito): como a divisão, não sai do laço.
+            elif node_type is Convert: result = node.target != INT and operands[0][0]
+            elif (node.op == TokenType.DIV or node.op == INT_DIV) and not (type(node.right) is Literal and node.right.value != 0): result = False
+            # Um INT grande demais para virar REAL (ex: 10 ** 400) numa conta com um REAL: OverflowError.
+            elif node_type is ArithOp and INT in operand_types and REAL in operand_types: result = False
+            else: result = operands[0][0] and operands[1][0]
+            if result: invariant.add(node)
+            return result, node_type_of(node, operand_types, layout)
+        reduce_expression(node, visit)
+        return invariant
+
+
+def expression_key(node):
+    """Uma chave que identifica expressões iguais (mesma estrutura), para reaproveitar a mesma variável interna:
+    os nós em pré-ordem (cada tipo de nó tem um número fixo de operandos, então a sequência define a árvore)."""
+    return tuple(node_key(node) for node in walk_expression(node))
+
+
+def node_key(node):
+    node_type = type(node)
+    if node_type is Literal: return ('lit', type(node.value), node.value)
+    if node_type is Variable: return ('var', node.name)
+    if node_type is NotOp: return ('not',)
+    if node_type is Convert: return ('convert', node.target)
+    return (node.op,)
+
+
+def optimize(program):
+    """Atalho: otimiza um Program e devolve (novo Program, OptimizationStats)."""
+    optimizer = Optimizer()
+    return optimizer.optimize(program), optimizer.stats
+
+
+if __name__ == '__main__':
+    from scl_parser import parse_program
+
+    total = OptimizationStats()
+    for path in sys.argv[1:]:
+        with open(path, encoding='utf-8') as source_file: program = parse_program(source_file.read())
+        _, stats = optimize(program)
+        print(f"{path}: {stats}")
+        total.merge(stats)
+    if len(sys.argv) > 2: print(f"TOTAL: {total}")
@@ -1,13 +1,75 @@
 # scl_parser.py (Versão Interpretador)
 
-# Importa as classes de definição de Token e Tipo de Token do arquivo vizinho.
-from token_definitions import TokenType, Token
+import codecs
+import re
 
-# A classe SCLParser é o nosso interpretador. Ela não herda de nenhuma outra classe,
-# sendo completamente autossuficiente.
+# Importa as classes de definição de Token e Tipo de Token do arquivo vizinho.
+from token_definitions import TokenType, TokenCode, TOKEN_TYPES, TOKEN_CODES, Token, TokenStore
+# Os nós da árvore sintática (AST) e o executor que a percorre.
+from scl_ast import (Program, Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     LogicOp, Comparison, ArithOp, NotOp, Literal, Variable)
+from scl_evaluator import SCLEvaluator, print_output
+from scl_bytecode import SCLVirtualMachine, compile_program
+from scl_transpiler import TieredEvaluator
+from scl_optimizer import optimize
+from scl_profiler import ProfilingEvaluator
+from scl_resolver import resolve_program
+from scl_errors import SCLError, SCLLexicalError, SCLSyntaxError
+
+# Os motores de execução disponíveis. Todos recebem a AST, a Tabela de Símbolos e a saída do PRINT
+# e produzem os mesmos resultados; mudam apenas a forma (e a velocidade) de execução.
+ENGINES = {
+    'ast': lambda ast, symbol_table, output=print_output: SCLEvaluator(symbol_table, output).run(ast),                        # Percorre a árvore.
+    'vm': lambda ast, symbol_table, output=print_output: SCLVirtualMachine(symbol_table, output).run(compile_program(ast)),   # Compila para bytecode.
+    'tiered': lambda ast, symbol_table, output=print_output: TieredEvaluator(symbol_table, output=output).run(ast),          # Laços quentes viram Python.
+}
+
+# O parser trabalha com os códigos inteiros dos tokens (TokenCode), e não com as strings de TokenType.
+# Os tokens que podem começar um comando (veja statement()), os que abrem um bloco e o END_* de cada bloco.
+STATEMENT_STARTERS = (TokenCode.ID, TokenCode.IF, TokenCode.WHILE, TokenCode.FOR, TokenCode.PRINT, TokenCode.TYPE_INT, TokenCode.TYPE_REAL, TokenCode.TYPE_BOOL)
+BLOCK_STARTERS = (TokenCode.IF, TokenCode.WHILE, TokenCode.FOR)
+END_TOKENS = {IfStatement: TokenCode.END_IF, WhileStatement: TokenCode.END_WHILE, ForStatement: TokenCode.END_FOR}
+
+# Os operadores binários: código do token -> (precedência, classe do nó, tipo do token). Maior precedência = liga mais forte.
+# O NOT (prefixo) fica entre o AND e as comparações: NOT a = b é NOT (a = b), e NOT a AND b é (NOT a) AND b.
+NOT_PRECEDENCE, COMPARISON_PRECEDENCE = 3, 4
+OPERATORS = {
+    TOKEN_CODES[op]: (precedence, node_class, op) for op, precedence, node_class in (
+        (TokenType.OR, 1, LogicOp), (TokenType.AND, 2, LogicOp),
+        *((op, COMPARISON_PRECEDENCE, Comparison) for op in (TokenType.EQ, TokenType.NEQ, TokenType.LT, TokenType.LTE, TokenType.GT, TokenType.GTE)),
+        (TokenType.PLUS, 5, ArithOp), (TokenType.MINUS, 5, ArithOp),
+        (TokenType.MUL, 6, ArithOp), (TokenType.DIV, 6, ArithOp))
+}
+
+# Os operadores e a pontuação, com o tipo de token de cada um.
+SINGLE_CHAR_TOKENS = {'=': TokenType.EQ, '+': TokenType.PLUS, '-': TokenType.MINUS, '*': TokenType.MUL, '/': TokenType.DIV,
+                      '(': TokenType.LPAREN, ')': TokenType.RPAREN, ';': TokenType.SEMICOLON, '<': TokenType.LT, '>': TokenType.GT}
+OPERATOR_TOKENS = {':=': TokenType.ASSIGN, '<>': TokenType.NEQ, '<=': TokenType.LTE, '>=': TokenType.GTE, **SINGLE_CHAR_TOKENS}
+
+# O lexer de tokenize(): uma única regex, aplicada ao texto com finditer(). Cada ocorrência é um
+# trio (espaços e comentários pulados antes do token, o token, outro): o token é um identificador ou
+# palavra-chave, um número ou um operador, todos em ASCII; 'outro' é qualquer outro caractere ('#',
+# caractere inválido, não-ASCII) ou o fim do texto (''), e fica com o _get_next_token(), que é a
+# definição de referência do lexer. Um identificador ou número colado a um caractere não-ASCII
+# (ex: 'ação', '1٣') também não é aceito pela regex: quantificadores possessivos, sem volta atrás.
+_SPACE = r"[\t\n\x0b\x0c\r\x1c-\x1f ]" # Os caracteres ASCII de str.isspace().
+TOKEN_REGEX = re.compile(rf"({_SPACE}*+(?://[^\n#]*+{_SPACE}*+)*+)"
+                         r"(?:([A-Za-z][A-Za-z0-9_]*+(?![^\x00-\x7f])|[0-9]++(?:\.[0-9]*+)?+(?![^\x00-\x7f])"
+                         r"|:=|<>|<=|>=|[=+\-*/();<>])|(.|\Z))", re.DOTALL)
+
+# A classe SCLParser é o nosso interpretador. Ela faz a análise léxica (tokenize),
+# a análise sintática (montando uma AST com build_ast) e, em parse(), entrega a
+# árvore ao SCLEvaluator para executar o programa.
 class SCLParser:
     # O método __init__ é o construtor, responsável por inicializar o estado interno do interpretador.
-    def __init__(self):
+    # 'engine' escolhe o motor de execução usado por parse() (uma das chaves de ENGINES);
+    # com 'optimize=True', a AST passa pelo otimizador (scl_optimizer.py) antes de ser executada.
+    # 'cache' é um ProgramCache (scl_cache.py) opcional: com ele, a AST já analisada é guardada em disco
+    # e, nas próximas execuções do mesmo código, a tokenização e a análise sintática são puladas.
+    # Com 'profile=True', o programa é executado pelo ProfilingEvaluator (scl_profiler.py), que mede
+    # o tempo de cada linha; o resultado fica em 'profile_stats'.
+    # 'output' é a função que recebe cada valor do PRINT (por padrão, print_output mostra no terminal).
+    def __init__(self, engine='ast', optimize=False, cache=None, profile=False, output=print_output):
         # --- Atributos de Estado do Analisador Léxico (Lexer) ---
         self.palavra = ''          # Armazena a string completa do código-fonte.
         self.posicao = 0           # A posição (índice) atual do caractere que estamos lendo.
@@ -15,10 +77,21 @@ class SCLParser:
         self.lineno = 1            # O número da linha atual, para mensagens de erro.
         
         # --- Atributos de Estado do Analisador Sintático (Parser) ---
-        self.current_token = None  # O objeto Token atual que foi produzido pelo lexer.
+        self.tokens = None         # O fluxo de tokens (TokenStore) produzido UMA única vez pelo lexer (em build_ast).
+        self.token_index = 0       # O índice do token atual dentro de 'self.tokens'.
+        self.current_code = None   # O código (TokenCode) do token atual: self.tokens.codes[self.token_index].
+        self.token_stream = None   # No modo streaming (inicializa_stream), o gerador de onde vêm os pedaços do fluxo.
 
         # --- Atributos do Interpretador ---
         self.symbol_table = {}     # A Tabela de Símbolos, que armazena as variáveis (tipo e valor).
+        self.ast = None            # A árvore (nó Program) montada pela última chamada a parse().
+        self.engine = engine       # O motor de execução escolhido.
+        self.optimize = optimize   # Se a AST deve ser otimizada antes da execução.
+        self.optimization_stats = None # As estatísticas do otimizador (OptimizationStats), quando ele é usado.
+        self.cache = cache         # O cache em disco das ASTs já analisadas (ou None).
+        self.profile = profile     # Se a execução deve ser medida linha a linha.
+        self.output = output       # A saída do PRINT, repassada ao motor de execução.
+        self.profile_stats = None  # O resultado do profiler (ProfileStats), quando ele é usado.
         
         # Um dicionário que mapeia as strings das palavras-chave para seus tipos de token.
         # Facilita a identificação de palavras reservadas.
@@ -40,14 +113,43 @@ class SCLParser:
         self.posicao = 0
         self.lineno = 1
         self.lookAhead = self.palavra[self.posicao] if self.palavra else '#'
-        # Pega o primeiro token para iniciar a análise.
-        self.current_token = self._get_next_token()
-        
-    def _parser_error(self, message):
-        """Lança um erro formatado e encerra a execução."""
-        print(f"\nERRO (linha {self.current_token.lineno if self.current_token else self.lineno}): {message}")
-        if self.current_token: print(f"  Token atual: {self.current_token}")
-        exit(1)
+        self.tokens = None # A tokenização só acontece quando a AST precisa ser montada (veja build_ast).
+        self.token_stream = None
+
+    def inicializa_stream(self, source, chunk_size=1 << 16):
+        """Prepara o parser para ler o código de um arquivo aberto (texto ou binário) ou de um mmap, aos pedaços.
+        Os tokens são consumidos assim que produzidos e nunca ficam todos na memória (veja stream_token_stores)."""
+        self.inicializa('')
+        self.token_stream = stream_token_stores(source, chunk_size)
+
+    @property
+    def current_token(self):
+        """O token atual (um TokenView), ou None se a análise sintática ainda não começou."""
+        return None if self.tokens is None else self.tokens[self.token_index]
+
+    def _rewind(self, index):
+        """Posiciona o parser no token de índice 'index' do fluxo já tokenizado."""
+        self.token_index = index
+        self.current_code = self.tokens.codes[index]
+
+    def _advance(self):
+        """Passa para o próximo token (no modo streaming, ao fim de um pedaço, para o 1º token do próximo)."""
+        index = self.token_index + 1
+        try: self.current_code = self.tokens.codes[index]
+        except IndexError:
+            if self.token_stream is None: raise
+            self.tokens = next(self.token_stream); index = 0
+            self.current_code = self.tokens.codes[0]
+        self.token_index = index
+
+    def _token_value(self):
+        """O valor do token atual (sem criar um TokenView)."""
+        tokens = self.tokens
+        return tokens.values[tokens.value_ids[self.token_index]]
+
+    def _parser_error(self, message, error_type=SCLSyntaxError):
+        """Lança o erro com a linha (e o token) atual, interrompendo a análise."""
+        raise error_type(message, self.current_token.lineno if self.current_token else self.lineno, self.current_token)
 
     # --- Métodos do Analisador Léxico (Lexer) ---
 
@@ -75,8 +177,8 @@ class SCLParser:
 
             # 1. Reconhecimento de Identificadores e Palavras-chave
             if self.lookAhead.isalpha():
-                ident_str = ""
-                while self.lookAhead.isalnum() or self.lookAhead == '_': ident_str += self.lookAhead; self._lexer_advance_char()
+                while self.lookAhead.isalnum() or self.lookAhead == '_': self._lexer_advance_char()
+                ident_str = self.palavra[start_pos:self.posicao] # Um único fatiamento, sem concatenar caractere a caractere.
                 upper_ident = ident_str.upper()
                 token_type = self.keywords.get(upper_ident)
                 if token_type: # Se a string é uma palavra-chave...
@@ -86,13 +188,12 @@ class SCLParser:
 
             # 2. Reconhecimento de Literais Numéricos (INT e REAL)
             elif self.lookAhead.isdigit():
-                num_str = ""
-                while self.lookAhead.isdigit(): num_str += self.lookAhead; self._lexer_advance_char()
+                while self.lookAhead.isdigit(): self._lexer_advance_char()
                 if self.lookAhead == '.': # Verifica se é um número REAL
-                    num_str += '.'; self._lexer_advance_char()
-                    while self.lookAhead.isdigit(): num_str += self.lookAhead; self._lexer_advance_char()
-                    return Token(TokenType.NUMBER_LITERAL, float(num_str), start_pos, current_lineno)
-                return Token(TokenType.NUMBER_LITERAL, int(num_str), start_pos, current_lineno) # Senão, é INT.
+                    self._lexer_advance_char()
+                    while self.lookAhead.isdigit(): self._lexer_advance_char()
+                    return Token(TokenType.NUMBER_LITERAL, float(self.palavra[start_pos:self.posicao]), start_pos, current_lineno)
+                return Token(TokenType.NUMBER_LITERAL, int(self.palavra[start_pos:self.posicao]), start_pos, current_lineno) # Senão, é INT.
             
             # 3. Reconhecimento de Operadores (2 caracteres primeiro, para evitar ambiguidades)
             elif self.lookAhead == ':' and self._peek() == '=': self._lexer_advance_char(); self._lexer_advance_char(); return Token(TokenType.ASSIGN, ':=', start_pos, current_lineno)
@@ -102,188 +203,306 @@ class SCLParser:
 
             # 4. Reconhecimento de Operadores e Pontuação (1 caractere)
             else:
-                single_char_map = {'=': TokenType.EQ, '+': TokenType.PLUS, '-': TokenType.MINUS, '*': TokenType.MUL, '/': TokenType.DIV, '(': TokenType.LPAREN, ')': TokenType.RPAREN, ';': TokenType.SEMICOLON, '<': TokenType.LT, '>': TokenType.GT}
                 char = self.lookAhead
-                if char in single_char_map:
+                if char in SINGLE_CHAR_TOKENS:
                     self._lexer_advance_char()
-                    return Token(single_char_map[char], char, start_pos, current_lineno)
+                    return Token(SINGLE_CHAR_TOKENS[char], char, start_pos, current_lineno)
                 else: # Se o caractere não for reconhecido, é um erro léxico.
-                    self._parser_error(f"Erro Léxico: Caractere inesperado '{self.lookAhead}'")
+                    self._parser_error(f"Erro Léxico: Caractere inesperado '{self.lookAhead}'", SCLLexicalError)
         return Token(TokenType.EOF, '#', self.posicao, self.lineno) # Retorna o token de Fim de Arquivo.
 
-    # --- Métodos do Analisador Sintático e Interpretador ---
-
-    def match_token(self, expected_type):
-        """Verifica se o token atual é do tipo esperado. Se for, avança para o próximo. Senão, lança um erro."""
-        if self.current_token.type == expected_type: self.current_token = self._get_next_token()
-        else: self._parser_error(f"Sintaxe inválida. Esperado '{expected_type}', mas foi encontrado '{self.current_token.type}'")
+    def tokenize(self):
+        """Executa apenas a análise léxica: percorre 'palavra' inteira (a partir de 'posicao') e devolve os tokens
+        (terminados em EOF) em um TokenStore, os mesmos que chamadas sucessivas a _get_next_token() produziriam.
+
+        Os tokens saem da TOKEN_REGEX, sem andar caractere por caractere, e vão direto para as colunas do
+        TokenStore. A posição e a linha de cada token são calculadas a partir dos comprimentos do que foi
+        pulado e do próprio token: as quebras de linha só são contadas quando o trecho pulado tem alguma.
+        O código e o valor de cada texto de token são calculados uma vez só (ex: todos os 'x' do programa)."""
+        text, length = self.palavra, len(self.palavra)
+        store = TokenStore()
+        add_code, add_position, add_lineno, add_value = store.codes.append, store.positions.append, store.linenos.append, store.value_ids.append
+        known = {} # Texto do token -> (código, índice do valor).
+        get = known.get
+        position, lineno = self.posicao, self.lineno
+        while True:
+            for found in TOKEN_REGEX.finditer(text, position):
+                skipped, lexeme, _ = found.groups()
+                if skipped:
+                    position += len(skipped)
+                    if '\n' in skipped: lineno += skipped.count('\n')
+                if lexeme:
+                    code, value_id = get(lexeme) or self._lexeme_entry(lexeme, known, store)
+                    add_code(code); add_position(position); add_lineno(lineno); add_value(value_id)
+                    position += len(lexeme)
+                    continue
+                # Fim do texto, '#' ou um caractere que a regex não aceita: um token pelo _get_next_token().
+                self.posicao, self.lineno = position, lineno
+                self.lookAhead = text[position] if position < length else '#'
+                token = self._get_next_token()
+                store.append(token)
+                if token.type == TokenType.EOF: return store
+                # A busca recomeça logo depois do token (o finditer é preguiçoso: recomeçar não custa nada).
+                position, lineno = self.posicao, self.lineno
+                break
 
-    # Os métodos abaixo implementam as regras da gramática da linguagem SCL.
-    # Cada método é responsável por analisar e EXECUTAR uma parte do código.
+    def _lexeme_entry(self, lexeme, known, store):
+        """(código, índice do valor no 'store') do token de texto 'lexeme', guardado em 'known'."""
+        if lexeme in OPERATOR_TOKENS: token_type, value = OPERATOR_TOKENS[lexeme], lexeme
+        elif lexeme[0] <= '9': token_type, value = TokenType.NUMBER_LITERAL, float(lexeme) if '.' in lexeme else int(lexeme)
+        else:
+            upper_lexeme = lexeme.upper()
+            token_type = self.keywords.get(upper_lexeme)
+            if token_type is None: token_type, value = TokenType.ID, lexeme
+            elif token_type == TokenType.BOOLEAN_LITERAL: value = upper_lexeme == "TRUE"
+            else: value = upper_lexeme
+        entry = known[lexeme] = (TOKEN_CODES[token_type], store.value_id(value))
+        return entry
+
+    # --- Métodos do Analisador Sintático (Parser) ---
+
+    def match_token(self, expected_code):
+        """Verifica se o token atual tem o código (TokenCode) esperado. Se tiver, avança para o próximo. Senão, lança um erro."""
+        if self.current_code == expected_code:
+            # O EOF é o último token do fluxo; depois dele o índice não avança mais.
+            if expected_code != TokenCode.EOF: self._advance()
+        else: self._parser_error(f"Sintaxe inválida. Esperado '{TOKEN_TYPES[expected_code]}', mas foi encontrado '{TOKEN_TYPES[self.current_code]}'")
 
     def parse(self):
-        """Ponto de entrada da análise e interpretação."""
-        self.program()
-        self.match_token(TokenType.EOF)
+        """Ponto de entrada: analisa o código UMA vez (montando a AST) e depois executa a árvore com o motor escolhido."""
+        if self.engine not in ENGINES: self._parser_error(f"Motor de execução desconhecido: '{self.engine}'. Opções: {', '.join(ENGINES)}", SCLError)
+        use_cache = self.cache is not None and self.token_stream is None # No streaming o código não está na memória.
+        cached = self.cache.load(self.palavra, self.optimize) if use_cache else None
+        if cached is not None:
+            self.ast, self.optimization_stats = cached # Mesmo código já analisado: nenhum token é lido.
+        else:
+            self.ast = self.build_ast()
+            if self.optimize: self.ast, self.optimization_stats = optimize(self.ast)
+            if use_cache:
+                resolve_program(self.ast) # A AST vai para o cache já com os slots resolvidos.
+                self.cache.store(self.palavra, (self.ast, self.optimization_stats), self.optimize)
+        if self.profile: # O profiler percorre a AST, independentemente do motor escolhido.
+            evaluator = ProfilingEvaluator(self.symbol_table, self.output)
+            self.profile_stats = evaluator.profile_stats
+            evaluator.run(self.ast)
+        else:
+            ENGINES[self.engine](self.ast, self.symbol_table, self.output)
+
+    def build_ast(self):
+        """Apenas a análise sintática: devolve o nó Program, sem executar nada."""
+        # Fase de tokenização: o código-fonte é lido uma única vez e vira um TokenStore.
+        # A partir daqui o parser trabalha só com índices, então "rebobinar" um laço é só trocar o índice.
+        if self.token_stream is not None: self.tokens = next(self.token_stream)
+        elif not self.tokens: self.tokens = self.tokenize()
+        self._rewind(0)
+        program = self.program()
+        self.match_token(TokenCode.EOF)
+        return program
+
+    # Os métodos abaixo implementam as regras da gramática da linguagem SCL.
+    # Cada método analisa uma parte do código e devolve o nó da AST correspondente (veja scl_ast.py).
 
     def program(self): # Regra: program -> statement_list
-        self.statement_list()
+        return Program(self.statement_list(), self.current_token.lineno)
 
     def statement_list(self): # Regra: statement_list -> (statement ";")*
-        """Processa uma lista de comandos, um após o outro, até não encontrar mais comandos válidos."""
-        statement_starters = [TokenType.ID, TokenType.IF, TokenType.WHILE, TokenType.FOR, TokenType.PRINT, TokenType.TYPE_INT, TokenType.TYPE_REAL, TokenType.TYPE_BOOL]
-        while self.current_token.type in statement_starters:
-            self.statement()
-            self.match_token(TokenType.SEMICOLON) # Cada comando deve terminar com ';'
+        """Lê uma lista de comandos, um após o outro, até não encontrar mais comandos válidos."""
+        return self._statements()
 
     def statement(self): # Regra: statement -> assignment | if_statement | ...
-        """Verifica qual tipo de comando é o atual e chama o método apropriado para processá-lo."""
-        token_type = self.current_token.type
-        if token_type == TokenType.ID: self.assignment()
-        elif token_type == TokenType.IF: self.if_statement()
-        elif token_type == TokenType.WHILE: self.while_statement()
-        elif token_type == TokenType.FOR: self.for_statement()
-        elif token_type == TokenType.PRINT: self.print_statement()
-        elif token_type in [TokenType.TYPE_INT, TokenType.TYPE_REAL, TokenType.TYPE_BOOL]: self.declaration()
-        else: self._parser_error("Comando inválido.")
+        """Lê um único comando (sem o ';' que o termina), com os blocos que ele tiver dentro."""
+        if self.current_code not in STATEMENT_STARTERS: self._parser_error("Comando inválido.")
+        return self._statements(single=True)[0]
+
+    def _statements(self, single=False):
+        """Lê os comandos com uma pilha explícita no lugar da recursão: um IF/WHILE/FOR é aberto (o nó já é
+        criado, com o corpo vazio), os comandos seguintes vão para o seu corpo e o END_* o fecha. Assim a
+        profundidade dos blocos aninhados não consome a pilha do Python. Com 'single', para no 1º comando."""
+        statements, blocks = [], [] # A lista sendo preenchida e os blocos abertos: (nó, lista de fora).
+        while True:
+            code = self.current_code
+            if code in STATEMENT_STARTERS:
+                opens_block = code in BLOCK_STARTERS
+                try:
+                    if opens_block:
+                        node = self.block_header()
+                        blocks.append((node, statements))
+                        statements = node.then_body if code == TokenCode.IF else node.body
+                        continue
+                    node = self.simple_statement()
+                    if single and not blocks: return [node]
+                    self.match_token(TokenCode.SEMICOLON) # Cada comando deve terminar com ';'
+                    statements.append(node)
+                except SCLSyntaxError as error: self._statement_error(error, opens_block)
+            elif not blocks: return statements
+            else: # O corpo do bloco mais interno terminou.
+                node, outer = blocks[-1]
+                if code == TokenCode.ELSE and type(node) is IfStatement and node.else_body is None:
+                    self.match_token(TokenCode.ELSE)
+                    statements = node.else_body = []
+                    continue
+                blocks.pop()
+                statements = outer
+                try: self.match_token(END_TOKENS[type(node)])
+                except SCLSyntaxError as error: self._statement_error(error, True); continue
+                if single and not blocks: return [node]
+                statements.append(node) # Com o END_* lido o bloco está completo: se faltar o ';', o erro é só do ';'.
+                try: self.match_token(TokenCode.SEMICOLON)
+                except SCLSyntaxError as error: self._statement_error(error, None)
+
+    def _statement_error(self, error, opens_block):
+        """Um erro sintático em um comando (em 'opens_block', um comando que abriu um bloco; None se só faltou
+        o ';' depois de um bloco já completo) interrompe a análise."""
+        raise error
+
+    def simple_statement(self): # Regra: simple_statement -> assignment | print_statement | declaration
+        code = self.current_code
+        if code == TokenCode.ID: return self.assignment()
+        elif code == TokenCode.PRINT: return self.print_statement()
+        else: return self.declaration()
 
     def declaration(self): # Regra: declaration -> TYPE IDENTIFIER
-        """Processa uma declaração de variável, adicionando-a à tabela de símbolos."""
-        var_type = self.current_token.type
-        self.match_token(var_type)
-        var_name = self.current_token.value
-        if var_name in self.symbol_table: self._parser_error(f"Erro Semântico: Variável '{var_name}' já declarada.")
-        self.symbol_table[var_name] = {'type': var_type, 'value': None} # Adiciona à tabela com valor inicial nulo
-        self.match_token(TokenType.ID)
-        
+        var_code, lineno = self.current_code, self.tokens.linenos[self.token_index]
+        self.match_token(var_code)
+        var_name = self._token_value()
+        self.match_token(TokenCode.ID)
+        return Declaration(TOKEN_TYPES[var_code], var_name, lineno)
+
     def assignment(self): # Regra: assignment -> ID := expression
-        """Executa uma atribuição: avalia a expressão e atualiza o valor da variável na tabela de símbolos."""
-        var_name = self.current_token.value
-        if var_name not in self.symbol_table: self._parser_error(f"Erro Semântico: Variável '{var_name}' não declarada.")
-        self.match_token(TokenType.ID)
-        self.match_token(TokenType.ASSIGN)
-        value = self.expression() # O método expression retorna o VALOR calculado
-        self.symbol_table[var_name]['value'] = value
-    
+        var_name, lineno = self._token_value(), self.tokens.linenos[self.token_index]
+        self.match_token(TokenCode.ID)
+        self.match_token(TokenCode.ASSIGN)
+        return Assignment(var_name, self.expression(), lineno)
+
     def print_statement(self): # Regra: print_statement -> PRINT expression
-        """Executa o comando PRINT: avalia a expressão e imprime o resultado no console."""
-        self.match_token(TokenType.PRINT)
-        value = self.expression()
-        print(f"[SAÍDA SCL] {value}")
-
-    # --- Métodos de Controle de Fluxo (a parte mais complexa do interpretador) ---
-    # Estes métodos precisam não só analisar a sintaxe, mas também controlar o fluxo de execução,
-    # decidindo quais blocos de código executar ou pular.
-
-    def if_statement(self): # Regra: IF expression THEN statement_list (ELSE statement_list)? END_IF
-        self.match_token(TokenType.IF)
-        condition = self.expression() # Avalia a condição, que retorna True ou False
-        self.match_token(TokenType.THEN)
-        then_block_start = self.current_token, self.posicao, self.lineno, self.lookAhead
-        if condition: # Se a condição for VERDADEIRA...
-            self.statement_list() # ...executa o bloco THEN.
-        else: # Se for FALSA...
-            # ...pula o bloco THEN. Usamos um "skipper" para avançar os tokens sem executar.
-            skipper = SCLParser(); skipper.current_token, skipper.posicao, skipper.lineno, skipper.lookAhead = then_block_start; skipper.palavra, skipper.symbol_table = self.palavra, self.symbol_table; skipper.statement_list()
-            self.current_token, self.posicao, self.lineno, self.lookAhead = skipper.current_token, skipper.posicao, skipper.lineno, skipper.lookAhead
-        
-        if self.current_token.type == TokenType.ELSE:
-            self.match_token(TokenType.ELSE)
-            if not condition: # Se a condição original era FALSA...
-                self.statement_list() # ...executa o bloco ELSE.
-            else: # Se era VERDADEIRA...
-                # ...pula o bloco ELSE.
-                skipper = SCLParser(); skipper.current_token, skipper.posicao, skipper.lineno, skipper.lookAhead = self.current_token, self.posicao, self.lineno, self.lookAhead; skipper.palavra, skipper.symbol_table = self.palavra, self.symbol_table; skipper.statement_list()
-                self.current_token, self.posicao, self.lineno, self.lookAhead = skipper.current_token, skipper.posicao, skipper.lineno, skipper.lookAhead
-        self.match_token(TokenType.END_IF)
-
-    def while_statement(self): # Regra: WHILE expression DO statement_list END_WHILE
-        self.match_token(TokenType.WHILE)
-        condition_start = self.current_token, self.posicao, self.lineno, self.lookAhead
+        lineno = self.tokens.linenos[self.token_index]
+        self.match_token(TokenCode.PRINT)
+        return PrintStatement(self.expression(), lineno)
+
+    # --- Métodos de Controle de Fluxo ---
+    # Os blocos são analisados uma única vez; quem decide qual bloco executar (e quantas vezes)
+    # é o SCLEvaluator, ao percorrer a árvore. Aqui é lido só o cabeçalho de cada bloco: o corpo
+    # e o END_* são lidos por _statements().
+
+    def block_header(self):
+        lineno, code = self.tokens.linenos[self.token_index], self.current_code
+        self.match_token(code)
+        if code == TokenCode.IF: # Regra: IF expression THEN statement_list (ELSE statement_list)? END_IF
+            condition = self.expression(); self.match_token(TokenCode.THEN)
+            return IfStatement(condition, [], None, lineno)
+        if code == TokenCode.WHILE: # Regra: WHILE expression DO statement_list END_WHILE
+            condition = self.expression(); self.match_token(TokenCode.DO)
+            return WhileStatement(condition, [], lineno)
+        # Regra: FOR ID := expr TO expr DO statement_list END_FOR
+        var_name = self._token_value()
+        self.match_token(TokenCode.ID); self.match_token(TokenCode.ASSIGN)
+        start = self.expression(); self.match_token(TokenCode.TO); end = self.expression(); self.match_token(TokenCode.DO)
+        return ForStatement(var_name, start, end, [], lineno)
+
+    # --- Análise de Expressões ---
+    # A precedência (OR < AND < NOT < comparação < + - < * /) vem da tabela OPERATORS, e não de
+    # um método por nível: expression() é um único laço com uma pilha de operadores (shunting-yard).
+
+    def expression(self):
+        """Lê uma expressão e devolve o seu nó. Os parênteses e os operadores pendentes ficam em pilhas
+        explícitas, então o tempo é linear e a pilha do Python não cresce com o aninhamento."""
+        operands, operators = [], [] # operators: (precedência, op, linha, classe do nó); um '(' é (0, ...).
+        compared = False  # Se o operando de comparação atual já tem a sua comparação (a < b < c não encadeia).
+        accepts_not = True # NOT só começa um operando lógico (não pode vir depois de '+' ou '<', por exemplo).
         while True:
-            self.current_token, self.posicao, self.lineno, self.lookAhead = condition_start # "Rebobina" para a condição
-            condition_value = self.expression()
-            self.match_token(TokenType.DO)
-            if not condition_value: # Se a condição for FALSA...
-                # ...pula o corpo do laço e sai.
-                skipper = SCLParser(); skipper.current_token, skipper.posicao, skipper.lineno, skipper.lookAhead = self.current_token, self.posicao, self.lineno, self.lookAhead; skipper.palavra, skipper.symbol_table = self.palavra, self.symbol_table; skipper.statement_list()
-                self.current_token, self.posicao, self.lineno, self.lookAhead = skipper.current_token, skipper.posicao, skipper.lineno, skipper.lookAhead
-                break
-            self.statement_list() # Se for VERDADEIRA, executa o corpo.
-        self.match_token(TokenType.END_WHILE)
-
-    def for_statement(self): # Regra: FOR ID := expr TO expr DO statement_list END_FOR
-        self.match_token(TokenType.FOR); var_name = self.current_token.value
-        if var_name not in self.symbol_table: self._parser_error(f"Erro Semântico: Variável '{var_name}' não declarada.")
-        self.match_token(TokenType.ID); self.match_token(TokenType.ASSIGN)
-        start_val = self.expression(); self.match_token(TokenType.TO); end_val = self.expression(); self.match_token(TokenType.DO)
-        
-        body_start = self.current_token, self.posicao, self.lineno, self.lookAhead
-        for i in range(start_val, end_val + 1):
-            self.symbol_table[var_name]['value'] = i # Atualiza a variável de controle.
-            self.current_token, self.posicao, self.lineno, self.lookAhead = body_start # "Rebobina" para o início do corpo.
-            self.statement_list() # Executa o corpo.
-        self.match_token(TokenType.END_FOR)
-
-    # --- Métodos de Avaliação de Expressões ---
-    # A sequência de chamadas a seguir (expression -> logic_expr -> ... -> factor)
-    # implementa a ordem de precedência dos operadores.
-
-    def expression(self): return self.logic_expr() # Ponto de entrada para qualquer expressão.
-    
-    def logic_expr(self): # Lida com o operador OR (menor precedência).
-        result = self.logic_term()
-        while self.current_token.type == TokenType.OR: self.match_token(TokenType.OR); result = result or self.logic_term()
-        return result
-
-    def logic_term(self): # Lida com o operador AND.
-        result = self.logic_factor()
-        while self.current_token.type == TokenType.AND: self.match_token(TokenType.AND); result = result and self.logic_factor()
-        return result
-
-    def logic_factor(self): # Lida com o operador NOT.
-        if self.current_token.type == TokenType.NOT: self.match_token(TokenType.NOT); return not self.logic_factor()
-        return self.comparison()
-
-    def comparison(self): # Lida com operadores de comparação (>, <, =, etc.).
-        left = self.arith_expr()
-        op_type = self.current_token.type
-        if op_type in [TokenType.EQ, TokenType.NEQ, TokenType.LT, TokenType.LTE, TokenType.GT, TokenType.GTE]:
-            self.match_token(op_type); right = self.arith_expr()
-            if op_type == TokenType.EQ: return left == right
-            if op_type == TokenType.NEQ: return left != right
-            if op_type == TokenType.LT: return left < right
-            if op_type == TokenType.LTE: return left <= right
-            if op_type == TokenType.GT: return left > right
-            if op_type == TokenType.GTE: return left >= right
-        return left
-
-    def arith_expr(self): # Lida com Adição e Subtração.
-        result = self.term()
-        while self.current_token.type in [TokenType.PLUS, TokenType.MINUS]:
-            op_type = self.current_token.type; self.match_token(op_type)
-            if op_type == TokenType.PLUS: result += self.term()
-            else: result -= self.term()
-        return result
-
-    def term(self): # Lida com Multiplicação e Divisão (maior precedência aritmética).
-        result = self.factor()
-        while self.current_token.type in [TokenType.MUL, TokenType.DIV]:
-            op_type = self.current_token.type; self.match_token(op_type)
-            if op_type == TokenType.MUL: result *= self.factor()
-            else: result /= self.factor()
-        return result
-
-    def factor(self): # É a base da recursão das expressões. Lida com os valores "atômicos".
-        token_type = self.current_token.type
-        if token_type == TokenType.NUMBER_LITERAL: value = self.current_token.value; self.match_token(TokenType.NUMBER_LITERAL); return value
-        elif token_type == TokenType.BOOLEAN_LITERAL: value = self.current_token.value; self.match_token(TokenType.BOOLEAN_LITERAL); return value
-        elif token_type == TokenType.ID: # Se for uma variável...
-            var_name = self.current_token.value
-            if var_name not in self.symbol_table: self._parser_error(f"Erro Semântico: Variável '{var_name}' não declarada.")
-            value = self.symbol_table[var_name]['value'] # ...busca seu valor na tabela de símbolos.
-            if value is None: self._parser_error(f"Erro de Execução: Variável '{var_name}' usada antes de ser inicializada.")
-            self.match_token(TokenType.ID); return value
-        elif token_type == TokenType.LPAREN: # Lida com expressões entre parênteses.
-            self.match_token(TokenType.LPAREN); result = self.expression(); self.match_token(TokenType.RPAREN); return result
-        else: self._parser_error("Fator inválido na expressão.")
\ No newline at end of file
+            code = self.current_code
+            # Espera um operando (factor), que pode vir depois de NOTs e '('.
+            if code == TokenCode.NOT and accepts_not:
+                operators.append((NOT_PRECEDENCE, TokenType.NOT, self.tokens.linenos[self.token_index], NotOp)); self._advance(); continue
+            if code == TokenCode.LPAREN:
+                operators.append((0, None, compared, None)) # Guarda o estado de fora do parêntese.
+                compared, accepts_not = False, True; self._advance(); continue
+            # O valor e a linha do operando são lidos direto das colunas do TokenStore.
+            tokens, index = self.tokens, self.token_index
+            if code == TokenCode.NUMBER_LITERAL or code == TokenCode.BOOLEAN_LITERAL: operands.append(Literal(tokens.values[tokens.value_ids[index]], tokens.linenos[index]))
+            elif code == TokenCode.ID: operands.append(Variable(tokens.values[tokens.value_ids[index]], tokens.linenos[index])) # Leitura de variável.
+            else: self._parser_error("Fator inválido na expressão.")
+            self._advance()
+            # Depois do operando: um operador binário, um ')' ou o fim da expressão.
+            while True:
+                operator = OPERATORS.get(self.current_code)
+                if operator is not None and not (compared and operator[0] == COMPARISON_PRECEDENCE): break
+                # O fim do operando atual: reduz os operadores até o '(' aberto (ou até o início).
+                while operators and operators[-1][0]: self._reduce(operands, operators.pop())
+                if not operators: return operands[0]
+                self.match_token(TokenCode.RPAREN) # Dentro de um parêntese, só um ')' pode vir aqui.
+                compared = operators.pop()[2]
+            precedence = operator[0]
+            while operators and operators[-1][0] >= precedence: self._reduce(operands, operators.pop())
+            operators.append((precedence, operator[2], self.tokens.linenos[self.token_index], operator[1]))
+            if precedence == COMPARISON_PRECEDENCE: compared, accepts_not = True, False
+            else: accepts_not = operator[1] is LogicOp
+            if accepts_not: compared = False
+            self._advance()
+
+    @staticmethod
+    def _reduce(operands, operator):
+        """Aplica um operador da pilha aos operandos do topo, trocando-os pelo nó criado."""
+        _, op_type, lineno, node_class = operator
+        if node_class is NotOp: operands[-1] = NotOp(operands[-1], lineno)
+        else:
+            right = operands.pop()
+            operands[-1] = node_class(op_type, operands[-1], right, lineno)
+
+def tokenize(palavra_input):
+    """API apenas léxica: transforma um código-fonte SCL nos seus tokens (um TokenStore), sem analisar nem executar nada."""
+    lexer = SCLParser()
+    lexer.palavra, lexer.posicao, lexer.lineno = palavra_input, 0, 1
+    lexer.lookAhead = palavra_input[0] if palavra_input else '#'
+    return lexer.tokenize()
+
+
+def stream_token_stores(source, chunk_size=1 << 16, encoding='utf-8'):
+    """Versão em streaming de tokenize(): lê 'source' (arquivo aberto em modo texto ou binário, ou um mmap)
+    em pedaços de 'chunk_size' e devolve um gerador de TokenStores que, em sequência, têm os mesmos tokens,
+    com 'position' e 'lineno' absolutos (só o último termina em EOF).
+
+    Nenhum token atravessa uma quebra de linha, então cada pedaço é analisado até a sua última '\\n'
+    e o resto da linha é guardado para o próximo pedaço. A memória usada fica limitada ao tamanho
+    do pedaço (ou da maior linha do arquivo), e não ao tamanho do código-fonte."""
+    lexer = SCLParser()
+    decoder = codecs.getincrementaldecoder(encoding)() # Um caractere UTF-8 pode ficar dividido entre dois pedaços.
+    pending, base = '', 0 # Texto ainda não analisado e a posição absoluta do seu primeiro caractere.
+    while True:
+        chunk = source.read(chunk_size)
+        at_end = not chunk
+        if isinstance(chunk, (bytes, bytearray)): chunk = decoder.decode(chunk, final=at_end)
+        text = pending + chunk
+        cut = len(text) if at_end else text.rfind('\n') + 1
+        if cut == 0 and not at_end: pending = text; continue # A linha ainda não terminou: lê mais um pedaço.
+        segment, pending = text[:cut], text[cut:]
+        lexer.palavra, lexer.posicao = segment, 0 # O 'lineno' do lexer continua de onde o pedaço anterior parou.
+        lexer.lookAhead = segment[0] if segment else '#'
+        tokens = lexer.tokenize()
+        tokens.shift(base)
+        # Um '#' no meio do texto encerra a análise, como no tokenize(): o EOF do pedaço é o do fluxo.
+        if at_end or lexer.posicao < len(segment):
+            yield tokens
+            return
+        tokens.pop() # O EOF do pedaço.
+        if tokens: yield tokens
+        base += cut
+
+
+def stream_tokens(source, chunk_size=1 << 16, encoding='utf-8'):
+    """Como stream_token_stores(), mas devolvendo um token (TokenView) de cada vez."""
+    for tokens in stream_token_stores(source, chunk_size, encoding): yield from tokens
+
+
+def parse_stream(source, chunk_size=1 << 16):
+    """Como parse_program(), mas lendo o código de um arquivo aberto ou mmap, aos pedaços."""
+    parser = SCLParser()
+    parser.inicializa_stream(source, chunk_size)
+    return parser.build_ast()
+
+
+def parse_program(palavra_input):
+    """API apenas sintática: transforma um código-fonte SCL na sua AST (nó Program), sem executar nada."""
+    parser = SCLParser()
+    parser.inicializa(palavra_input)
+    return parser.build_ast()
@@ -0,0 +1,160 @@
+# scl_profiler.py
+
+# Profiler por comando: descobre quais linhas de um programa SCL gastam mais tempo.
+#
+# O ProfilingEvaluator é um SCLEvaluator cuja tabela de despacho de comandos foi trocada
+# por versões que medem cada execução. Sem profiler, o SCLEvaluator normal roda sem nenhuma
+# verificação extra (a troca acontece só no objeto que está medindo), então o custo quando
+# o recurso está desligado é zero.
+#
+# Para cada linha são contadas as execuções e o tempo acumulado: o tempo total (incluindo os
+# comandos de dentro, ex: o corpo de um FOR) e o tempo próprio (sem eles). Comandos de dentro que
+# estão na mesma linha (ex: 'FOR ... DO s := s + i; END_FOR;' numa linha só) não somam de novo
+# no tempo total dela: ele é medido só no comando mais externo da linha. Laços também contam
+# execuções e iterações, e cada IF conta quantas vezes entrou no THEN, no ELSE, ou foi pulado.
+#
+# Uso: SCLParser(profile=True) e, depois de parse(), parser.profile_stats.report() ou .as_dict().
+# Pela linha de comando: python scl_profiler.py arquivo.scl [--json saida.json]
+
+import sys
+import time
+
+from scl_ast import IfStatement, WhileStatement, ForStatement
+from scl_evaluator import SCLEvaluator, print_output
+
+
+class LineStats:
+    def __init__(self):
+        self.count = 0          # Execuções de comandos desta linha.
+        self.total_time = 0.0   # Tempo total, incluindo comandos aninhados, contado uma vez por linha (segundos).
+        self.self_time = 0.0    # Tempo sem os comandos aninhados.
+
+
+class LoopStats:
+    def __init__(self, kind):
+        self.kind = kind        # 'WHILE' ou 'FOR'.
+        self.executions = 0     # Quantas vezes o laço começou.
+        self.iterations = 0     # Quantas vezes o corpo executou (somando todas as execuções).
+
+
+class BranchStats:
+    def __init__(self):
+        self.then_taken = 0     # Condição verdadeira: executou o THEN.
+        self.else_taken = 0     # Condição falsa, com ELSE.
+        self.skipped = 0        # Condição falsa, sem ELSE: nada executou.
+
+
+class ProfileStats:
+    """O resultado do profiler, com as estatísticas indexadas pela linha do comando."""
+
+    def __init__(self):
+        self.lines = {}
+        self.loops = {}
+        self.branches = {}
+        self.total_time = 0.0
+
+    def as_dict(self):
+        return {
+            'total_time': self.total_time,
+            'lines': {lineno: vars(stats) for lineno, stats in sorted(self.lines.items())},
+            'loops': {lineno: vars(stats) for lineno, stats in sorted(self.loops.items())},
+            'branches': {lineno: vars(stats) for lineno, stats in sorted(self.branches.items())},
+        }
+
+    def report(self, top=20):
+        """Tabela das linhas mais quentes (por tempo próprio), seguida dos laços e dos IFs."""
+        total = self.total_time or 1.0
+        rows = sorted(self.lines.items(), key=lambda item: item[1].self_time, reverse=True)[:top]
+        lines = [f"{'Linha':>6s} {'Execuções':>10s} {'Total (ms)':>11s} {'Próprio (ms)':>13s} {'% próprio':>10s}"]
+        for lineno, stats in rows:
+            lines.append(f"{lineno:6d} {stats.count:10d} {stats.total_time * 1000:11.3f} "
+                         f"{stats.self_time * 1000:13.3f} {stats.self_time / total * 100:9.1f}%")
+        if self.loops:
+            lines.append("\nLaços:")
+            for lineno, loop in sorted(self.loops.items()):
+                average = loop.iterations / loop.executions if loop.executions else 0
+                lines.append(f"  linha {lineno} ({loop.kind}): {loop.executions} execuções, {loop.iterations} iterações "
+                             f"({average:.1f} por execução), {self.lines[lineno].total_time * 1000:.3f} ms")
+        if self.branches:
+            lines.append("\nIFs:")
+            for lineno, branch in sorted(self.branches.items()):
+                lines.append(f"  linha {lineno}: THEN {branch.then_taken}x, ELSE {branch.else_taken}x, pulado {branch.skipped}x")
+        lines.append(f"\nTempo total: {self.total_time * 1000:.3f} ms")
+        return "\n".join(lines)
+
+
+class ProfilingEvaluator(SCLEvaluator):
+    def __init__(self, symbol_table=None, output=print_output, clock=time.perf_counter):
+        super().__init__(symbol_table, output)
+        self.profile_stats = ProfileStats()
+        self.clock = clock
+        self._child_time = 0.0 # Tempo gasto pelos comandos aninhados no comando que está executando.
+        self._active_lines = set() # Linhas com um comando em execução (o tempo total fica com o mais externo).
+        # Cada handler de comando é trocado pela versão que mede o tempo.
+        self._statement_handlers = {node_type: self._timed(handler) for node_type, handler in self._statement_handlers.items()}
+
+    def run(self, program):
+        start = self.clock()
+        try:
+            super().run(program)
+        finally:
+            self.profile_stats.total_time = self.clock() - start
+
+    def _timed(self, handler):
+        lines, clock, active_lines = self.profile_stats.lines, self.clock, self._active_lines
+        def timed_handler(node):
+            lineno = node.lineno
+            stats = lines.get(lineno)
+            if stats is None: stats = lines[lineno] = LineStats()
+            outermost = lineno not in active_lines
+            if outermost: active_lines.add(lineno)
+            outer_child_time, self._child_time = self._child_time, 0.0
+            start = clock()
+            try:
+                handler(node)
+            finally:
+                elapsed = clock() - start
+                stats.count += 1; stats.self_time += elapsed - self._child_time
+                if outermost: stats.total_time += elapsed; active_lines.discard(lineno)
+                self._child_time = outer_child_time + elapsed
+        return timed_handler
+
+    def _loop_stats(self, node, kind):
+        stats = self.profile_stats.loops.get(node.lineno)
+        if stats is None: stats = self.profile_stats.loops[node.lineno] = LoopStats(kind)
+        stats.executions += 1
+        return stats
+
+    def if_statement(self, node):
+        stats = self.profile_stats.branches.get(node.lineno)
+        if stats is None: stats = self.profile_stats.branches[node.lineno] = BranchStats()
+        if self.evaluate(node.condition): stats.then_taken += 1; self.statement_list(node.then_body)
+        elif node.else_body is not None: stats.else_taken += 1; self.statement_list(node.else_body)
+        else: stats.skipped += 1
+
+    def while_statement(self, node):
+        stats = self._loop_stats(node, 'WHILE')
+        while self.evaluate(node.condition): stats.iterations += 1; self.statement_list(node.body)
+
+    def for_statement(self, node):
+        stats = self._loop_stats(node, 'FOR')
+        if node.checked: self._check_declared(node.var_name, node.slot, node)
+        start_val = self.evaluate(node.start); end_val = self.evaluate(node.end)
+        slots, slot = self.slots, node.slot
+        for i in self._for_range(start_val, end_val, node):
+            slots[slot] = i
+            stats.iterations += 1
+            self.statement_list(node.body)
+
+
+if __name__ == '__main__':
+    import json
+    from scl_parser import parse_program
+
+    with open(sys.argv[1], encoding='utf-8') as source_file: program = parse_program(source_file.read())
+    evaluator = ProfilingEvaluator(output=lambda value: None) # As saídas do PRINT não interessam aqui.
+    evaluator.run(program)
+    print(evaluator.profile_stats.report())
+    if '--json' in sys.argv:
+        with open(sys.argv[sys.argv.index('--json') + 1], 'w', encoding='utf-8') as json_file:
+            json.dump(evaluator.profile_stats.as_dict(), json_file, indent=2)
@@ -0,0 +1,196 @@
+# scl_resolver.py
+
+# Resolução de variáveis: antes da execução, cada variável declarada recebe um índice
+# fixo ("slot") em uma lista plana de valores. Os nós da AST que leem ou escrevem variáveis
+# (Variable, Assignment, ForStatement, Declaration) ganham o atributo 'slot', e os motores
+# de execução passam a usar 'slots[indice]' em vez de 'symbol_table[nome]['value']'.
+#
+# O resolvedor também faz uma análise de fluxo simples: para cada acesso ele sabe se a
+# variável está CERTAMENTE declarada e inicializada naquele ponto. Quando está, o nó é
+# marcado com 'checked = False' e a execução nem verifica nada; quando não se sabe
+# (ex: a variável só é atribuída dentro de um IF), o acesso continua verificado.
+# Uma variável que certamente NÃO foi declarada é um erro já na resolução.
+#
+# Na mesma passagem é feita a inferência de tipos (regras em scl_types.py): cada expressão
+# tem o seu tipo calculado a partir dos tipos declarados, a divisão entre INTs é especializada
+# e as atribuições recebem as conversões para o tipo da variável.
+
+from token_definitions import TokenType
+from scl_ast import (Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     ArithOp, NotOp, Literal, Variable, Convert, reduce_expression)
+from scl_types import INT, BOOL, INT_DIV, strip_conversion, convert, literal_type, arithmetic_type
+
+# Marcador guardado no slot enquanto a declaração da variável ainda não foi executada.
+# (Uma variável declarada, mas ainda sem valor, guarda None, como na Tabela de Símbolos.)
+class _Undeclared:
+    def __repr__(self): return "UNDECLARED"
+    def __reduce__(self): return "UNDECLARED" # Continua sendo o mesmo objeto depois de pickle/cópia.
+
+UNDECLARED = _Undeclared()
+
+# Estados da análise de fluxo (para "declarada" e para "inicializada").
+NO, MAYBE, YES = 0, 1, 2
+
+
+class SymbolLayout:
+    """A disposição das variáveis nos slots: nome e tipo de cada índice."""
+
+    def __init__(self):
+        self.names = []  # slot -> nome da variável
+        self.types = []  # slot -> tipo declarado (TokenType.TYPE_*)
+        self.index = {}  # nome -> slot
+
+    def add(self, name, var_type):
+        if name not in self.index:
+            self.index[name] = len(self.names); self.names.append(name); self.types.append(var_type)
+        return self.index[name]
+
+    def new_slots(self):
+        """Uma lista de slots novinha, com todas as variáveis ainda não declaradas."""
+        return [UNDECLARED] * len(self.names)
+
+    def symbol_table(self, slots):
+        """Monta a visão "clássica" da Tabela de Símbolos ({nome: {'type', 'value'}}) a partir dos slots.
+        Serve para inspeção e para o json.dumps do main.py; nomes internos (com '$') ficam de fora."""
+        return {name: {'type': var_type, 'value': value}
+                for name, var_type, value in zip(self.names, self.types, slots)
+                if value is not UNDECLARED and not name.startswith('$')}
+
+
+class Resolver:
+    def __init__(self):
+        self.layout = SymbolLayout()
+        self.errors = [] # Lista de (linha, mensagem) dos erros encontrados.
+
+    def resolve(self, program):
+        """Resolve todos os acessos a variáveis do programa e devolve o SymbolLayout."""
+        # 1ª etapa: todo nome declarado em qualquer ponto do código ganha um slot (na ordem do texto).
+        for node in walk_statements(program.statements):
+            if type(node) is Declaration: node.slot = self.layout.add(node.name, node.var_type)
+        # 2ª etapa: análise de fluxo, marcando cada acesso com o seu slot e se precisa ser verificado.
+        self.block(program.statements, {})
+        return self.layout
+
+    def _error(self, message, node):
+        self.errors.append((node.lineno, message))
+
+    def _slot(self, name, state, node):
+        """Devolve (slot, estado) de um nome acessado; registra erro se ele certamente não foi declarado."""
+        declared, initialized = state.get(name, (NO, NO))
+        if declared == NO: self._error(f"Erro Semântico: Variável '{name}' não declarada.", node)
+        return self.layout.index.get(name, -1), declared, initialized
+
+    # --- Comandos ---
+
+    def block(self, statements, state):
+        """Percorre uma lista de comandos; 'state' mapeia nome -> (declarada, inicializada) e é atualizado."""
+        for node in statements: self.statement(node, state)
+        return state
+
+    def statement(self, node, state):
+        node_type = type(node)
+        if node_type is Declaration:
+            state[node.name] = (YES, NO)
+        elif node_type is Assignment:
+            node.expr = strip_conversion(node.expr)
+            value_type = self.expression(node.expr, state)
+            node.slot, declared, _ = self._slot(node.name, state, node)
+            node.checked = declared != YES
+            node.expr = convert(node.expr, value_type, self._type(node.slot)) # O valor guardado tem o tipo da variável.
+            state[node.name] = (YES, YES) # Se a atribuição passou, a variável existe e tem valor.
+        elif node_type is PrintStatement:
+            self.expression(node.expr, state)
+        elif node_type is IfStatement:
+            self.expression(node.condition, state)
+            then_state = self.block(node.then_body, dict(state))
+            else_state = self.block(node.else_body, dict(state)) if node.else_body is not None else dict(state)
+            state.clear(); state.update(meet(then_state, else_state))
+        elif node_type is WhileStatement:
+            head = loop_head_state(node.body, state)
+            self.expression(node.condition, head)
+            self.block(node.body, dict(head))
+            state.clear(); state.update(head)
+        elif node_type is ForStatement:
+            node.start, node.end = strip_conversion(node.start), strip_conversion(node.end)
+            start_type, end_type = self.expression(node.start, state), self.expression(node.end, state)
+            node.slot, declared, _ = self._slot(node.var_name, state, node)
+            if self._type(node.slot) == INT: # Os limites de um FOR com variável INT são convertidos para INT.
+                node.start, node.end = convert(node.start, start_type, INT), convert(node.end, end_type, INT)
+            node.checked = declared != YES
+            state[node.var_name] = (YES, state.get(node.var_name, (NO, NO))[1]) # O FOR verifica a declaração.
+            head = loop_head_state(node.body, state)
+            body_state = dict(head); body_state[node.var_name] = (YES, YES)
+            self.block(node.body, body_state)
+            state.clear(); state.update(head)
+
+    # --- Expressões ---
+
+    def expression(self, node, state):
+        """Resolve as variáveis da expressão e devolve o tipo do resultado (None quando não se sabe).
+        A árvore é percorrida sem recursão (reduce_expression), de baixo para cima."""
+        def visit(node, *operand_types):
+            node_type = type(node)
+            if node_type is Variable:
+                node.slot, declared, initialized = self._slot(node.name, state, node)
+                node.checked = not (declared == YES and initialized == YES)
+                return self._type(node.slot)
+            if node_type is Literal: return literal_type(node.value)
+            if node_type is NotOp: return BOOL
+            if node_type is Convert: return node.target
+            if node_type is not ArithOp: return BOOL # LogicOp e Comparison.
+            result = arithmetic_type(*operand_types)
+            if node.op == TokenType.DIV or node.op == INT_DIV: node.op = INT_DIV if result == INT else TokenType.DIV
+            return result
+        return reduce_expression(node, visit)
+
+    def _type(self, slot):
+        return self.layout.types[slot] if slot >= 0 else None
+
+
+def meet(state_a, state_b):
+    """Junta os estados de dois caminhos: só continua YES (ou NO) o que for igual nos dois."""
+    result = {}
+    for name in state_a.keys() | state_b.keys():
+        a, b = state_a.get(name, (NO, NO)), state_b.get(name, (NO, NO))
+        result[name] = (a[0] if a[0] == b[0] else MAYBE, a[1] if a[1] == b[1] else MAYBE)
+    return result
+
+
+def loop_head_state(body, state):
+    """O estado no início de cada iteração: o que o corpo declara ou atribui (e ainda não era certo
+    antes do laço) passa a ser "talvez", porque depende de quantas vezes o corpo já rodou."""
+    head = dict(state)
+    for node in walk_statements(body):
+        names = ()
+        if type(node) is Declaration: names = ((node.name, True),)
+        elif type(node) is Assignment: names = ((node.name, False),)
+        elif type(node) is ForStatement: names = ((node.var_name, False),)
+        for name, is_declaration in names:
+            declared, initialized = head.get(name, (NO, NO))
+            head[name] = (declared if declared == YES else MAYBE,
+                          NO if is_declaration and initialized == NO else (initialized if initialized == YES else MAYBE))
+    return head
+
+
+def walk_statements(statements):
+    """Percorre (em pré-ordem) todos os comandos de uma lista, incluindo os de blocos aninhados."""
+    pending = list(reversed(statements))
+    while pending:
+        node = pending.pop()
+        yield node
+        node_type = type(node)
+        if node_type is IfStatement:
+            if node.else_body is not None: pending.extend(reversed(node.else_body))
+            pending.extend(reversed(node.then_body))
+        elif node_type is WhileStatement or node_type is ForStatement:
+            pending.extend(reversed(node.body))
+
+
+def resolve_program(program):
+    """Resolve o programa uma única vez (o resultado fica guardado em program.layout).
+    Devolve (layout, erros); quem chama decide como reportar os erros."""
+    if getattr(program, 'layout', None) is None:
+        resolver = Resolver()
+        program.layout = resolver.resolve(program)
+        program.resolve_errors = resolver.errors
+    return program.layout, program.resolve_errors
@@ -0,0 +1,136 @@
+# scl_runner.py
+
+# Executa muitos programas SCL de uma vez (ex: uma pasta com milhares de arquivos gerados),
+# distribuídos por um pool de processos.
+#
+# Cada programa roda isolado: um erro em um arquivo (léxico, sintático, semântico ou de execução)
+# vira um registro no relatório, e os outros arquivos continuam normalmente. Para cada arquivo
+# o relatório guarda as linhas do PRINT, a Tabela de Símbolos final (também quando há erro: é o
+# estado no momento do erro), o erro estruturado ({'type', 'lineno', 'message'}) e os tempos
+# da análise (tokenização + AST + otimizador) e da execução.
+#
+# Uso pela linha de comando:
+#   python scl_runner.py pasta/ [outra_pasta/ arquivo.scl ...] [--engine vm] [-O] [--workers 8] [--json relatorio.json]
+# O código de saída é 1 se algum programa falhou.
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from scl_parser import SCLParser, ENGINES
+from scl_optimizer import optimize as optimize_program
+from scl_errors import SCLError
+
+
+def run_source(source, engine='ast', optimize=False):
+    """Analisa e executa um código-fonte SCL sem imprimir nada. Devolve o resultado como um dicionário."""
+    output, symbol_table = [], {}
+    result = {'ok': True, 'output': output, 'symbol_table': symbol_table, 'error': None}
+    timings = result['timings'] = {'parse_s': 0.0, 'exec_s': 0.0}
+    start = phase_start = time.perf_counter()
+    phase = 'parse_s' # A fase que está sendo medida (se der erro, o tempo até o erro conta para ela).
+    try:
+        parser = SCLParser()
+        parser.inicializa(source)
+        ast = parser.build_ast()
+        if optimize: ast, _ = optimize_program(ast)
+        now = time.perf_counter()
+        timings['parse_s'], phase, phase_start = now - phase_start, 'exec_s', now
+        ENGINES[engine](ast, symbol_table, lambda value: output.append(f"[SAÍDA SCL] {value}"))
+    except SCLError as error:
+        result['ok'], result['error'] = False, error.as_dict()
+    except Exception as error: # Erros inesperados do próprio Python (divisão por zero etc. já chegam como SCLRuntimeError).
+        result['ok'] = False
+        result['error'] = {'type': 'runtime', 'lineno': None, 'message': f"{type(error).__name__}: {error}"}
+    end = time.perf_counter()
+    timings[phase] = end - phase_start
+    timings['total_s'] = end - start
+    return result
+
+
+def run_file(path, engine='ast', optimize=False):
+    """run_source() sobre um arquivo; um arquivo que não pode ser lido também vira um erro no resultado."""
+    try:
+        with open(path, encoding='utf-8') as source_file: source = source_file.read()
+    except (OSError, UnicodeDecodeError) as error:
+        return {'path': path, 'ok': False, 'output': [], 'symbol_table': {},
+                'error': {'type': 'io', 'lineno': None, 'message': str(error)},
+                'timings': {'parse_s': 0.0, 'exec_s': 0.0, 'total_s': 0.0}}
+    return {'path': path, **run_source(source, engine, optimize)}
+
+
+def find_programs(paths, extension='.scl'):
+    """Os arquivos a executar: os arquivos passados, mais os '.scl' de cada pasta (recursivamente), em ordem."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path): files.append(path); continue
+        for folder, _, names in os.walk(path):
+            files.extend(os.path.join(folder, name) for name in names if name.endswith(extension))
+    return sorted(files)
+
+
+def run_many(paths, engine='ast', optimize=False, workers=None):
+    """Executa os programas em um pool de processos ('workers=1' executa tudo neste processo).
+    Devolve o relatório: {'summary': {...}, 'results': [um resultado de run_file() por arquivo]}."""
+    if engine not in ENGINES: raise SCLError(f"Motor de execução desconhecido: '{engine}'. Opções: {', '.join(ENGINES)}")
+    files = find_programs(paths)
+    start = time.perf_counter()
+    if workers == 1 or len(files) < 2:
+        results = [run_file(path, engine, optimize) for path in files]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            # Blocos de vários arquivos por tarefa: com programas pequenos, o custo de enviar cada
+            # tarefa para outro processo seria maior que o de executá-la.
+            chunksize = max(1, len(files) // ((workers or os.cpu_count() or 1) * 4))
+            results = list(pool.map(run_file, files, repeat(engine), repeat(optimize), chunksize=chunksize))
+    wall_time = time.perf_counter() - start
+    failed = [result for result in results if not result['ok']]
+    return {
+        'summary': {
+            'programs': len(results), 'ok': len(results) - len(failed), 'failed': len(failed),
+            'errors_by_type': dict(Counter(result['error']['type'] for result in failed)),
+            'engine': engine, 'optimize': optimize,
+            'wall_s': wall_time,
+            'parse_s': sum(result['timings']['parse_s'] for result in results),
+            'exec_s': sum(result['timings']['exec_s'] for result in results),
+        },
+        'results': results,
+    }
+
+
+def format_report(report):
+    lines = []
+    for result in report['results']:
+        ms = result['timings']['total_s'] * 1000
+        if result['ok']: lines.append(f"OK    {result['path']} ({ms:.2f} ms)")
+        else:
+            error = result['error']
+            where = f" (linha {error['lineno']})" if error['lineno'] is not None else ""
+            lines.append(f"ERRO  {result['path']} ({ms:.2f} ms): {error['type']}{where}: {error['message']}")
+    summary = report['summary']
+    by_type = ", ".join(f"{kind}: {count}" for kind, count in sorted(summary['errors_by_type'].items()))
+    lines.append(f"\n{summary['programs']} programas, {summary['ok']} OK, {summary['failed']} com erro" + (f" ({by_type})" if by_type else ""))
+    lines.append(f"Tempo: {summary['wall_s'] * 1000:.1f} ms no total | análise {summary['parse_s'] * 1000:.1f} ms, "
+                 f"execução {summary['exec_s'] * 1000:.1f} ms (somando todos os processos)")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    arguments = argparse.ArgumentParser(description="Executa muitos programas SCL em paralelo.")
+    arguments.add_argument('paths', nargs='+', help="arquivos .scl e/ou pastas (percorridas recursivamente)")
+    arguments.add_argument('--engine', default='ast', choices=list(ENGINES), help="motor de execução (padrão: ast)")
+    arguments.add_argument('-O', dest='optimize', action='store_true', help="liga o otimizador")
+    arguments.add_argument('--workers', type=int, help="número de processos (padrão: um por CPU)")
+    arguments.add_argument('--json', help="grava o relatório completo neste arquivo JSON")
+    options = arguments.parse_args()
+
+    report = run_many(options.paths, options.engine, options.optimize, options.workers)
+    print(format_report(report))
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as json_file: json.dump(report, json_file, indent=2, ensure_ascii=False)
+    sys.exit(1 if report['summary']['failed'] else 0)
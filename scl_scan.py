@@ -0,0 +1,164 @@
+# scl_scan.py
+
+# Execução cíclica no estilo CLP ("scan cycle").
+#
+# Um CLP não executa o programa uma vez só: ele repete o programa inteiro a cada período
+# fixo (ex: a cada 10 ms), e as variáveis mantêm os valores de uma varredura para a outra.
+# O ScanRuntime faz isso com um programa já analisado (a AST é montada e resolvida uma vez):
+#
+#   - Na 1ª varredura o programa roda normalmente. Nas seguintes, as declarações de variáveis
+#     que já existem são ignoradas (funcionam como o bloco VAR do CLP), então os valores persistem.
+#     Valores iniciais ('initial_values') entram na variável quando ela é declarada pela 1ª vez.
+#   - Cada varredura começa em um instante agendado (início + n * período). O atraso em relação
+#     a esse instante é o "jitter"; uma varredura que demora mais do que o período é um "overrun".
+#   - ScanStats guarda o tempo de execução de cada varredura e calcula p50/p99 do tempo e do jitter.
+#
+# Uso pela linha de comando: python scl_scan.py arquivo.scl [período_ms] [varreduras] [descritor.json]
+# (com o descritor, as variáveis ficam em uma imagem de E/S em memória compartilhada, veja scl_ioimage.py)
+
+import sys
+import time
+from array import array
+
+from scl_ast import Node
+from scl_evaluator import SCLEvaluator, print_output
+from scl_transpiler import TieredEvaluator
+from scl_resolver import UNDECLARED, resolve_program
+from scl_errors import SCLSemanticError
+
+
+class RetainedDeclarations:
+    """Mistura para os motores baseados no SCLEvaluator: uma declaração de uma variável que já
+    existia em uma varredura anterior não faz nada (a variável mantém o valor)."""
+    retained = frozenset() # Slots declarados nas varreduras anteriores.
+    initial_values = {}    # Nome -> valor recebido na 1ª declaração (em vez de nulo).
+
+    def declaration(self, node):
+        if node.slot in self.retained: return
+        super().declaration(node)
+        if node.name in self.initial_values: self.slots[node.slot] = self.initial_values[node.name]
+
+
+class ScanEvaluator(RetainedDeclarations, SCLEvaluator): pass
+class TieredScanEvaluator(RetainedDeclarations, TieredEvaluator): pass
+
+# Motores que podem ser usados na execução cíclica (o estado fica nos slots do avaliador).
+SCAN_ENGINES = {'ast': ScanEvaluator, 'tiered': TieredScanEvaluator}
+
+
+def percentile(values, fraction):
+    """Percentil pelo método do "rank mais próximo" (ex: fraction=0.99 para o p99)."""
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(fraction * len(ordered) + 0.5) - 1))]
+
+
+class ScanStats:
+    """Tempos (em segundos) de cada varredura."""
+
+    def __init__(self, period):
+        self.period = period
+        self.exec_times = array('d')  # Duração de cada varredura.
+        self.jitters = array('d')     # Atraso do início de cada varredura em relação ao instante agendado.
+        self.overruns = 0             # Varreduras que passaram do período.
+
+    @property
+    def scans(self):
+        return len(self.exec_times)
+
+    def record(self, exec_time, jitter):
+        self.exec_times.append(exec_time); self.jitters.append(jitter)
+        if exec_time > self.period: self.overruns += 1
+
+    def as_dict(self):
+        return {
+            'scans': self.scans, 'period': self.period, 'overruns': self.overruns,
+            'exec_time': {'mean': sum(self.exec_times) / self.scans if self.scans else 0.0, 'max': max(self.exec_times, default=0.0),
+                          'p50': percentile(self.exec_times, 0.50), 'p99': percentile(self.exec_times, 0.99)},
+            'jitter': {'max': max(self.jitters, default=0.0),
+                       'p50': percentile(self.jitters, 0.50), 'p99': percentile(self.jitters, 0.99)},
+        }
+
+    def __str__(self):
+        ms = lambda seconds: f"{seconds * 1000:.3f} ms"
+        data = self.as_dict(); exec_time, jitter = data['exec_time'], data['jitter']
+        return (f"{self.scans} varreduras (período {ms(self.period)}), {self.overruns} overruns | "
+                f"execução p50 {ms(exec_time['p50'])}, p99 {ms(exec_time['p99'])}, máx {ms(exec_time['max'])} | "
+                f"jitter p50 {ms(jitter['p50'])}, p99 {ms(jitter['p99'])}, máx {ms(jitter['max'])}")
+
+
+class ScanRuntime:
+    def __init__(self, program, period=0.01, engine='ast', initial_values=None, clock=time.perf_counter, sleep=time.sleep,
+                 output=print_output):
+        # 'program' é um nó Program (ex: de parse_program); ele é resolvido aqui uma única vez.
+        # 'clock' e 'sleep' podem ser trocados (ex: para simulação ou para um relógio de tempo real).
+        # 'output' recebe os valores do PRINT, como nos outros motores.
+        self.program = program
+        self.period = period
+        self.clock, self.sleep = clock, sleep
+        self.evaluator = SCAN_ENGINES[engine](output=output)
+        self.evaluator.initial_values = dict(initial_values or {})
+        self.stats = ScanStats(period)
+        # Ganchos chamados antes e depois de cada varredura com o próprio ScanRuntime
+        # (ex: ler as entradas do processo e publicar as saídas).
+        self.before_scan = []
+        self.after_scan = []
+
+        layout, errors = resolve_program(program)
+        if errors: self.evaluator._runtime_error(errors[0][1], Node(errors[0][0]), SCLSemanticError)
+        self.evaluator.layout = layout
+        self.evaluator.slots = layout.new_slots()
+
+    @property
+    def symbol_table(self):
+        """O estado atual das variáveis (no formato {nome: {'type', 'value'}})."""
+        return self.evaluator.symbol_table
+
+    def scan(self):
+        """Executa uma varredura agora (sem esperar o período) e devolve o tempo gasto."""
+        evaluator = self.evaluator
+        for hook in self.before_scan: hook(self)
+        start = self.clock()
+        evaluator.statement_list(self.program.statements)
+        exec_time = self.clock() - start
+        evaluator.retained = frozenset(slot for slot, value in enumerate(evaluator.slots) if value is not UNDECLARED)
+        for hook in self.after_scan: hook(self)
+        return exec_time
+
+    def run(self, scans=None, duration=None):
+        """Executa varreduras no período configurado até completar 'scans' varreduras ou 'duration' segundos
+        (o que vier primeiro; sem nenhum dos dois, roda até ser interrompido). Devolve o ScanStats."""
+        clock = self.clock
+        scheduled = first = clock()
+        done = 0
+        while (scans is None or done < scans) and (duration is None or scheduled - first < duration):
+            now = clock()
+            if now < scheduled: self.sleep(scheduled - now); now = clock()
+            self.stats.record(self.scan(), now - scheduled)
+            done += 1
+            scheduled += self.period
+            # Se a varredura atrasou tanto que perdeu o próximo instante, o ciclo é realinhado em vez de
+            # disparar várias varreduras seguidas para "recuperar" o tempo (como faz o watchdog de um CLP).
+            now = clock()
+            if now > scheduled + self.period: scheduled = now
+        return self.stats
+
+
+if __name__ == '__main__':
+    import json
+    from scl_parser import parse_program
+
+    with open(sys.argv[1], encoding='utf-8') as source_file: program = parse_program(source_file.read())
+    period = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.01
+    scans = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    runtime = ScanRuntime(program, period)
+    image = None
+    if len(sys.argv) > 4:
+        from scl_ioimage import IOImage
+        image = IOImage(runtime.evaluator.layout).attach(runtime)
+        image.save_descriptor(sys.argv[4])
+    try: stats = runtime.run(scans)
+    finally:
+        if image is not None: image.close(); image.unlink()
+    print(stats)
+    print(json.dumps(runtime.symbol_table, indent=4))
@@ -0,0 +1,249 @@
+# scl_transpiler.py
+
+# Compilação em camadas ("tiered") de laços SCL para código Python nativo.
+#
+# O TieredEvaluator começa executando o programa como o SCLEvaluator (percorrendo a AST),
+# mas conta as iterações de cada laço WHILE/FOR. Quando um laço passa do limite
+# ('threshold'), o PythonTranspiler traduz o laço inteiro para código-fonte Python,
+# que é compilado com compile() e passa a executar as iterações restantes.
+# Dentro do código gerado as variáveis SCL viram variáveis locais do Python, então
+# um laço como 'c := c + i' roda praticamente na velocidade de Python puro.
+#
+# O código compilado fica guardado por laço (por nó da AST) e é reaproveitado
+# nas próximas vezes que o mesmo laço for executado.
+
+import weakref
+
+from token_definitions import TokenType
+from scl_ast import (Node, Declaration, Assignment, IfStatement, WhileStatement, ForStatement, PrintStatement,
+                     LogicOp, Comparison, ArithOp, NotOp, Literal, Variable, Convert, reduce_expression)
+from scl_evaluator import SCLEvaluator, print_output
+from scl_errors import PYTHON_RUNTIME_ERRORS, runtime_error_message
+from scl_resolver import UNDECLARED
+from scl_types import INT_DIV, int_div, CONVERSIONS
+from scl_closedform import plan_loop
+
+# Operadores SCL -> operadores Python equivalentes.
+PYTHON_OPERATORS = {
+    TokenType.PLUS: '+', TokenType.MINUS: '-', TokenType.MUL: '*', TokenType.DIV: '/',
+    TokenType.EQ: '==', TokenType.NEQ: '!=', TokenType.LT: '<', TokenType.LTE: '<=', TokenType.GT: '>', TokenType.GTE: '>=',
+    TokenType.AND: 'and', TokenType.OR: 'or',
+}
+
+# Profundidade máxima de uma expressão no código gerado (o parser do Python não aceita mais que 200
+# parênteses aninhados). Um laço com uma expressão mais profunda continua no interpretador.
+MAX_NESTING = 100
+
+# Cache dos laços já compilados: nó do laço -> CompiledLoop (ou None, se o laço não puder ser compilado).
+_compiled_loops = weakref.WeakKeyDictionary()
+
+
+class NotTranspilable(Exception):
+    """Indica que um laço usa algo que o transpilador não suporta (ele continua no interpretador)."""
+
+
+class PythonTranspiler:
+    """Traduz um laço WHILE/FOR (e tudo o que há dentro dele) para o código-fonte de uma função Python."""
+
+    def __init__(self):
+        self.lines = []
+        self.read_names = {}      # Variáveis lidas no laço: nome -> slot.
+        self.assigned_names = {}  # Variáveis escritas no laço (precisam voltar para os slots): nome -> slot.
+        self.line_numbers = []    # Linha do código SCL de cada linha gerada (para reportar os erros de execução).
+        self.lineno = None        # Linha do comando que está sendo traduzido.
+
+    def transpile_loop(self, node):
+        """Devolve o código-fonte da função '_scl_loop'. Ela recebe os slots e a saída do PRINT; para um FOR, também o início e o fim."""
+        self.lineno = node.lineno
+        if type(node) is ForStatement:
+            # O início e o fim já foram avaliados pelo interpretador; a função continua de '_start'.
+            self.assigned_names[node.var_name] = node.slot
+            self.emit(f"for {self.var(node.slot)} in range(_start, _end + 1):", 2)
+            self.statement_list(node.body, 3)
+        else:
+            self.emit(f"while {self.expression(node.condition)}:", 2)
+            self.statement_list(node.body, 3)
+
+        names = sorted({**self.read_names, **self.assigned_names}.items())
+        header = ["def _scl_loop(_slots, _print, _start=None, _end=None):"]
+        # Carrega os valores dos slots em variáveis locais.
+        header += [f"    {self.var(slot)} = _slots[{slot}]" for name, slot in names]
+        header.append("    try:")
+        # O 'finally' devolve os valores aos slots mesmo se um erro (ex: divisão por zero) interromper o laço.
+        footer = ["    finally:"] + [f"        _slots[{slot}] = {self.var(slot)}" for name, slot in sorted(self.assigned_names.items())]
+        if not self.assigned_names: footer.append("        pass")
+        self.line_numbers = [node.lineno] * len(header) + self.line_numbers + [node.lineno] * len(footer)
+        return "\n".join(header + self.lines + footer) + "\n"
+
+    # --- Utilitários ---
+
+    def emit(self, line, depth):
+        self.lines.append("    " * depth + line); self.line_numbers.append(self.lineno)
+
+    def var(self, slot):
+        # A variável local é nomeada pelo slot, e não pelo nome SCL: um identificador SCL aceita qualquer
+        # caractere alfanumérico (ex: 'x²', que não é um nome Python válido), e o Python normaliza os nomes
+        # (NFKC), o que juntaria variáveis SCL diferentes (ex: 'ﬁx' e 'fix') em uma só.
+        return f"v{slot}"
+
+    # --- Comandos ---
+
+    def statement_list(self, statements, depth):
+        if not statements: self.emit("pass", depth)
+        for statement in statements: self.statement(statement, depth)
+
+    def statement(self, node, depth):
+        node_type = type(node)
+        self.lineno = node.lineno
+        if node_type is Assignment:
+            self.assigned_names[node.name] = node.slot
+            self.emit(f"{self.var(node.slot)} = {self.expression(node.expr)}", depth)
+        elif node_type is PrintStatement:
+            self.emit(f"_print({self.expression(node.expr)})", depth)
+        elif node_type is IfStatement:
+            self.emit(f"if {self.expression(node.condition)}:", depth)
+            self.statement_list(node.then_body, depth + 1)
+            if node.else_body is not None:
+                self.emit("else:", depth)
+                self.statement_list(node.else_body, depth + 1)
+        elif node_type is WhileStatement:
+            self.emit(f"while {self.expression(node.condition)}:", depth)
+            self.statement_list(node.body, depth + 1)
+        elif node_type is ForStatement:
+            self.assigned_names[node.var_name] = node.slot
+            start, end = self.expression(node.start), self.expression(node.end)
+            self.emit(f"for {self.var(node.slot)} in range({start}, {end} + 1):", depth)
+            self.statement_list(node.body, depth + 1)
+        else: # Declaration: declarar dentro de um laço falha na 2ª iteração; o interpretador cuida do erro.
+            raise NotTranspilable(f"comando não suportado na linha {node.lineno}")
+
+    # --- Expressões ---
+
+    def expression(self, node):
+        """O código Python da expressão, montado de baixo para cima sem recursão (reduce_expression)."""
+        def visit(node, *operands):
+            node_type = type(node)
+            if node_type is Literal: return repr(node.value), 0
+            if node_type is Variable: self.read_names[node.name] = node.slot; return self.var(node.slot), 0
+            depth = 1 + max(depth for _, depth in operands)
+            # Cada nível vira um par de parênteses, e o compile() do Python recusa aninhamentos muito fundos.
+            if depth > MAX_NESTING: raise NotTranspilable(f"expressão profunda demais na linha {node.lineno}")
+            code = [code for code, _ in operands]
+            if node_type is NotOp: return f"(not {code[0]})", depth
+            if node_type is Convert: return f"{CONVERSIONS[node.target].__name__}({code[0]})", depth # int(), float() ou bool().
+            if node.op == INT_DIV: return f"_int_div({code[0]}, {code[1]})", depth
+            # LogicOp, Comparison e ArithOp: sempre entre parênteses, para manter a precedência da AST
+            # (e para que 'a < b < c' não vire uma comparação encadeada do Python).
+            return f"({code[0]} {PYTHON_OPERATORS[node.op]} {code[1]})", depth
+        return reduce_expression(node, visit)[0]
+
+
+class CompiledLoop:
+    """Uma função Python gerada para um laço, junto com os slots de que ela precisa."""
+    def __init__(self, function, source, names, types=None, line_numbers=None):
+        self.function = function
+        self.source = source
+        self.line_numbers = line_numbers or [] # Linha SCL de cada linha de 'source'.
+        self.names = names # Nome -> slot usado no código gerado.
+        self.types = types or {} # Nome -> tipo de cada variável quando o código foi gerado.
+        self.slots = sorted(set(names.values()))
+
+    def matches(self, layout):
+        """O código gerado tem os slots (e as conversões de tipo) fixos: ele só vale se as variáveis continuam
+        nos mesmos slots e com os mesmos tipos (um mesmo nó pode ser reaproveitado em outro programa, ex: pelo
+        front end incremental)."""
+        return all(layout.index.get(name) == slot and layout.types[slot] == self.types.get(name, layout.types[slot])
+                   for name, slot in self.names.items())
+
+    def ready(self, slots, loop_slot=None):
+        """O código compilado não verifica declarações nem valores nulos: isso é checado aqui, uma vez,
+        antes de entrar. Se algo faltar, o interpretador continua e reporta o erro normalmente."""
+        for slot in self.slots:
+            value = slots[slot]
+            if value is UNDECLARED or (value is None and slot != loop_slot): return False
+        return True
+
+    def error_line(self, error):
+        """A linha do código SCL em que uma operação do código gerado falhou com 'error' (ou None, se o erro
+        não veio dele, ou veio de uma função que ele chamou, como a saída do PRINT)."""
+        lineno, traceback = None, error.__traceback__
+        while traceback is not None: # Do quadro mais externo para o mais interno.
+            code = traceback.tb_frame.f_code
+            if code is self.function.__code__: lineno = self.line_numbers[traceback.tb_lineno - 1]
+            elif code is not int_div.__code__: lineno = None
+            traceback = traceback.tb_next
+        return lineno
+
+
+def compile_loop(node, layout=None):
+    """Devolve o CompiledLoop do laço (compilando e guardando em cache na primeira vez), ou None."""
+    if node in _compiled_loops:
+        compiled = _compiled_loops[node]
+        if compiled is None or layout is None or compiled.matches(layout): return compiled
+    transpiler = PythonTranspiler()
+    try:
+        source = transpiler.transpile_loop(node)
+        namespace = {'_int_div': int_div}
+        exec(compile(source, f"<laço SCL da linha {node.lineno}>", "exec"), namespace)
+        names = {**transpiler.read_names, **transpiler.assigned_names}
+        types = {name: layout.types[slot] for name, slot in names.items()} if layout is not None else None
+        compiled = CompiledLoop(namespace['_scl_loop'], source, names, types, transpiler.line_numbers)
+    except (NotTranspilable, SyntaxError, RecursionError, MemoryError): # Ex: laços aninhados além do limite do Python.
+        compiled = None
+    _compiled_loops[node] = compiled
+    return compiled
+
+
+class TieredEvaluator(SCLEvaluator):
+    """Um SCLEvaluator que troca os laços "quentes" por código Python compilado."""
+
+    def __init__(self, symbol_table=None, threshold=50, output=print_output):
+        super().__init__(symbol_table, output)
+        self.threshold = threshold # Número de iterações (somando todas as execuções do laço) até compilar.
+        self.loop_counts = {}      # Nó do laço -> iterações já feitas no interpretador.
+
+    def _try_compiled(self, node, loop_slot=None):
+        """Devolve o laço compilado se ele estiver pronto para rodar agora; senão, None."""
+        compiled = compile_loop(node, self.layout)
+        if compiled is not None and compiled.ready(self.slots, loop_slot): return compiled
+        return None
+
+    def _run_compiled(self, compiled, node, *bounds):
+        try: compiled.function(self.slots, self.output, *bounds)
+        except PYTHON_RUNTIME_ERRORS as error: # Ex: divisão por zero, com a linha de onde o código gerado parou.
+            lineno = compiled.error_line(error)
+            if lineno is None: raise # Ex: um erro da saída do PRINT chega a quem chamou como aconteceu.
+            self._runtime_error(runtime_error_message(error), Node(lineno))
+
+    def _next_try(self, node, count):
+        """Se o laço não pôde trocar de camada, só tentamos de novo depois de mais 'threshold' iterações
+        (ou nunca, se o laço simplesmente não é compilável)."""
+        return count + self.threshold if compile_loop(node, self.layout) is not None else float('inf')
+
+    def while_statement(self, node):
+        count = self.loop_counts.get(node, 0); next_try = max(count, self.threshold)
+        while self.evaluate(node.condition):
+            self.statement_list(node.body)
+            count += 1
+            if count >= next_try: # O laço ficou "quente": troca para o código compilado.
+                compiled = self._try_compiled(node)
+                if compiled is not None: self.loop_counts[node] = count; self._run_compiled(compiled, node); return
+                next_try = self._next_try(node, count)
+        self.loop_counts[node] = count
+
+    def for_statement(self, node):
+        if node.checked: self._check_declared(node.var_name, node.slot, node)
+        start_val = self.evaluate(node.start); end_val = self.evaluate(node.end)
+        plan = plan_loop(node, self.layout)
+        if plan is not None and plan.run(self.slots, start_val, end_val): return
+        slots, slot = self.slots, node.slot
+        count = self.loop_counts.get(node, 0); next_try = max(count, self.threshold)
+        for i in self._for_range(start_val, end_val, node):
+            if count >= next_try: # O laço ficou "quente": o código compilado continua a partir de 'i'.
+                compiled = self._try_compiled(node, slot)
+                if compiled is not None: self.loop_counts[node] = count; self._run_compiled(compiled, node, i, end_val); return
+                next_try = self._next_try(node, count)
+            slots[slot] = i # Atualiza a variável de controle.
+            self.statement_list(node.body)
+            count += 1
+        self.loop_counts[node] = count
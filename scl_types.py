@@ -0,0 +1,68 @@
+# scl_types.py
+
+# Inferência de tipos: usa os tipos declarados (INT, REAL, BOOL) para especializar as operações
+# e deixar as conversões explícitas na AST, antes da execução.
+#
+# A inferência acontece dentro do resolvedor (scl_resolver.py), na mesma passagem pela árvore que
+# resolve os slots (uma vez por programa), e todos os motores executam o resultado:
+#
+#   - '/' entre dois INTs vira a divisão inteira (INT_DIV), que trunca em direção a zero (7 / 2 = 3,
+#     -7 / 2 = -3); com algum REAL ela continua sendo a divisão real.
+#   - Uma atribuição converte o valor para o tipo da variável: REAL := INT guarda um REAL (5 vira 5.0),
+#     INT := REAL trunca, e o mesmo vale para o início e o fim de um FOR com variável de controle INT.
+#     A conversão é um nó Convert; se o valor é um literal, ele já é trocado pelo literal convertido.
+#   - Entre INT e REAL dentro de uma expressão (ex: i * 2.0) nenhum nó é inserido: a promoção do
+#     Python (int -> float) é exatamente a conversão do SCL, e um nó a mais só custaria tempo.
+#
+# Uma árvore já resolvida pode ser resolvida de novo (ex: o mesmo nó reaproveitado em outro programa
+# pelo front end incremental, com outras declarações): as conversões de antes são desfeitas e tudo
+# é decidido de novo a partir dos tipos atuais. Este módulo tem as regras; o resolvedor as aplica.
+
+from token_definitions import TokenType
+from scl_ast import Literal, Convert
+from scl_errors import PYTHON_RUNTIME_ERRORS
+
+INT, REAL, BOOL = TokenType.TYPE_INT, TokenType.TYPE_REAL, TokenType.TYPE_BOOL
+NUMERIC = (INT, REAL)
+
+INT_DIV = "DIV_INT" # O operador de divisão especializado para dois INTs (ocupa o lugar de TokenType.DIV no nó).
+
+
+def int_div(left, right):
+    """A divisão de INTs do SCL: trunca em direção a zero (o '//' do Python arredonda para baixo)."""
+    quotient = left // right
+    if quotient < 0 and quotient * right != left: quotient += 1
+    return quotient
+
+
+# Tipo de destino -> função Python que faz a conversão (int() trunca em direção a zero).
+CONVERSIONS = {INT: int, REAL: float, BOOL: bool}
+
+
+def literal_type(value):
+    if type(value) is bool: return BOOL
+    return REAL if type(value) is float else INT
+
+
+def arithmetic_type(left, right):
+    """O tipo do resultado de +, -, * e / (None se algum operando não é um número de tipo conhecido)."""
+    if left not in NUMERIC or right not in NUMERIC: return None
+    return INT if left == right == INT else REAL
+
+
+def strip_conversion(node):
+    """Desfaz a conversão que uma resolução anterior colocou no topo de uma expressão (se houver)."""
+    if type(node) is Convert: return node.operand
+    return getattr(node, 'source', node) if type(node) is Literal else node
+
+
+def convert(node, source, target):
+    """Converte a expressão 'node' (do tipo 'source') para 'target', se os dois tipos são conhecidos e diferentes."""
+    if target is None or source is None or source == target: return node
+    if type(node) is Literal: # Literal: a conversão é feita agora, uma vez só.
+        try: value = CONVERSIONS[target](node.value)
+        except PYTHON_RUNTIME_ERRORS: return Convert(target, node, node.lineno) # Ex: int() de inf: o erro fica para a execução.
+        converted = Literal(value, node.lineno)
+        converted.source = node # O literal original, para uma nova resolução.
+        return converted
+    return Convert(target, node, node.lineno)
@@ -0,0 +1,9 @@
+# tests/conftest.py
+
+# Os módulos do interpretador ficam na raiz do repositório (não há pacote instalável):
+# os testes os importam de lá, rodando 'python -m pytest' de qualquer pasta.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
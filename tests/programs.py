@@ -0,0 +1,72 @@
+# tests/programs.py
+
+# Programas SCL usados por vários testes. Todos começam declarando 'INT n', a "entrada":
+# with_input() a inicializa para os motores escalares e o modo em lote recebe os valores em 'inputs'.
+
+ARITHMETIC = """INT n; INT a; REAL r; BOOL b;
+a := n * 3 - 7;
+r := a / 2.0 + n;
+b := a > r OR n = 0;
+PRINT a / 4; PRINT (0 - a) / 4; PRINT r; PRINT b;
+PRINT NOT b AND a <> 0;
+"""
+
+LOOPS = """INT n; INT i; INT s; INT k; INT c; REAL x;
+s := 0; x := 1.0;
+FOR i := 1 TO n DO s := s + i * 2; x := x * 1.5; END_FOR;
+PRINT s; PRINT x; PRINT i;
+k := n + 1; c := 0;
+WHILE k > 1 DO
+    IF k / 2 * 2 = k THEN k := k / 2; ELSE k := 3 * k + 1; END_IF;
+    c := c + 1;
+END_WHILE;
+PRINT c;
+"""
+
+NESTED_LOOPS = """INT n; INT i; INT j; INT t; REAL m;
+t := 0; m := 0.0;
+FOR i := 1 TO 40 DO
+    FOR j := 1 TO n DO t := t + i * j; m := m + i / 4.0; END_FOR;
+    IF i / 10 * 10 = i THEN PRINT t; END_IF;
+END_FOR;
+PRINT m;
+"""
+
+SHORT_CIRCUIT = """INT n; BOOL b;
+IF n <> 0 AND 10 / n > 2 THEN PRINT 10 / n; ELSE PRINT 0; END_IF;
+b := n = 0 OR 100 / n > 30;
+PRINT b;
+"""
+
+DIVISION_BY_ZERO = """INT n; INT q;
+PRINT n;
+q := 10 / (n - 3);
+PRINT q;
+"""
+
+UNINITIALIZED = """INT n; INT u;
+IF n > 2 THEN u := n * n; END_IF;
+PRINT u + 1;
+"""
+
+# inf (n = 0 e 2..4) ou nan (n = 5, 6) convertido para INT: um erro em todos os motores.
+NON_FINITE = """INT n; INT i; INT k; REAL y;
+y := n - 1.0;
+FOR k := 1 TO 120 DO y := y * 1000.0; END_FOR;
+IF n > 4 THEN y := y - y; END_IF;
+i := y;
+PRINT i;
+"""
+
+PROGRAMS = {
+    'arithmetic': ARITHMETIC, 'loops': LOOPS, 'nested_loops': NESTED_LOOPS,
+    'short_circuit': SHORT_CIRCUIT, 'division_by_zero': DIVISION_BY_ZERO, 'uninitialized': UNINITIALIZED,
+    'non_finite': NON_FINITE,
+}
+
+INPUTS = list(range(7))
+
+
+def with_input(source, n):
+    """O programa com a entrada 'n' já atribuída (para os motores que rodam uma instância só)."""
+    return source.replace("INT n;", f"INT n; n := {n};", 1)
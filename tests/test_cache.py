@@ -0,0 +1,63 @@
+# tests/test_cache.py
+
+import os
+
+import pytest
+
+from scl_cache import ProgramCache
+from scl_parser import SCLParser
+from programs import PROGRAMS, with_input
+
+
+def run(source, cache, engine='ast', optimize=False):
+    output = []
+    parser = SCLParser(engine, optimize, cache=cache, output=output.append)
+    parser.inicializa(source)
+    parser.parse()
+    return output, parser.symbol_table
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("engine", ["ast", "vm", "tiered"])
+def test_round_trip(tmp_path, engine, optimize):
+    cache = ProgramCache(str(tmp_path))
+    for name in ('arithmetic', 'loops', 'nested_loops', 'short_circuit'):
+        source = with_input(PROGRAMS[name], 5)
+        expected = run(source, None, engine, optimize)
+        assert run(source, cache, engine, optimize) == expected # Analisa e grava...
+        assert run(source, cache, engine, optimize) == expected # ...e depois só lê.
+    assert (cache.misses, cache.hits) == (4, 4)
+
+
+def test_key_depends_on_source_and_optimization(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    source = with_input(PROGRAMS['loops'], 3)
+    run(source, cache)
+    assert cache.load(source, optimize=True) is None
+    assert cache.load(source + " ") is None
+    assert cache.load(source) is not None
+
+
+def test_corrupted_entry_is_recompiled(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    source = with_input(PROGRAMS['arithmetic'], 2)
+    expected = run(source, cache)
+    path = os.path.join(str(tmp_path), cache.key(source) + ".sclc")
+    with open(path, "wb") as cache_file: cache_file.write(b"lixo")
+    assert run(source, cache) == expected
+    assert cache.hits == 0 and cache.load(source) is not None # Gravado de novo, agora válido.
+
+
+def test_deep_program_runs_without_cache_entry(tmp_path):
+    # Uma AST funda demais para o pickle simplesmente não vai para o cache.
+    cache = ProgramCache(str(tmp_path))
+    source = "INT x; INT y; x := 1; y := " + " + ".join(["x"] * 12000) + "; PRINT y;"
+    assert run(source, cache) == ([12000], {'x': {'type': 'INT', 'value': 1}, 'y': {'type': 'INT', 'value': 12000}})
+    assert run(source, cache)[0] == [12000]
+    assert cache.hits == 0 and os.listdir(str(tmp_path)) == []
+
+
+def test_disabled_cache_writes_nothing(tmp_path):
+    cache = ProgramCache(str(tmp_path / "cache"), enabled=False)
+    run(with_input(PROGRAMS['loops'], 3), cache)
+    assert not os.path.exists(str(tmp_path / "cache"))
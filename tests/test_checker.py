@@ -0,0 +1,28 @@
+# tests/test_checker.py
+
+import pytest
+
+from scl_checker import check_source
+from scl_runner import run_source
+
+
+@pytest.mark.parametrize("source, output", [
+    ("INT i; REAL r; r := 7.9; i := r * 2.0; PRINT i;", ["15"]),             # INT := REAL trunca.
+    ("INT i; REAL r; i := 3; r := i; PRINT r / 2;", ["1.5"]),                 # REAL := INT promove.
+    ("INT i; FOR i := 1 TO 3.7 DO PRINT i; END_FOR;", ["1", "2", "3"]),       # Limites do FOR viram INT.
+    ("INT a; INT b; REAL r; a := 7; b := 2; r := a / b; PRINT r;", ["3.0"]),  # INT / INT é a divisão inteira.
+])
+def test_checker_accepts_what_the_engines_convert(source, output):
+    assert check_source(source) == []
+    for engine in ("ast", "vm", "tiered"):
+        assert run_source(source, engine)['output'] == [f"[SAÍDA SCL] {value}" for value in output], engine
+
+
+@pytest.mark.parametrize("source, message", [
+    ("BOOL b; b := 1;", "Erro de Tipo: Atribuição de INT à variável 'b' (BOOL)."),
+    ("INT i; i := TRUE;", "Erro de Tipo: Atribuição de BOOL à variável 'i' (INT)."),
+    ("REAL r; FOR r := 1 TO 3 DO PRINT r; END_FOR;", "Erro de Tipo: A variável de controle 'r' deve ser INT, mas é REAL."),
+    ("INT i; i := 1; IF i + 1 THEN PRINT i; END_IF;", "Erro de Tipo: A condição do IF deve ser BOOL, mas é INT."),
+])
+def test_checker_reports_bool_and_number_mixing(source, message):
+    assert message in [diagnostic.message for diagnostic in check_source(source)]
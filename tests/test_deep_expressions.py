@@ -0,0 +1,54 @@
+# tests/test_deep_expressions.py
+
+# Expressões muito fundas (geradas por máquina): a árvore de 'x + x + ... + x' tem um nível por '+',
+# e nenhum motor pode depender da pilha do Python para percorrê-la.
+
+import pytest
+
+from scl_runner import run_source
+from scl_checker import check_source
+from scl_batch import run_batch
+
+TERMS = 12000
+
+CHAIN = "INT x; INT y; x := 1; y := " + " + ".join(["x"] * TERMS) + "; PRINT y;"
+NESTED = "INT x; INT y; x := 1; y := " + "(" * TERMS + "x" + " + 1)" * TERMS + "; PRINT y;"
+NOTS = "BOOL b; b := " + "NOT " * TERMS + "TRUE; PRINT b;"
+ANDS = "INT x; BOOL b; x := 1; b := " + " AND ".join(["x > 0"] * TERMS) + "; PRINT b;"
+# Dentro de um laço: o tiered tenta compilar o laço e o closedform tenta resolvê-lo em forma fechada.
+IN_LOOP = ("INT i; INT y; y := 0; FOR i := 1 TO 20 DO y := y + " + "(" * TERMS + "i" + " - 1)" * TERMS
+           + "; END_FOR; PRINT y;")
+
+PROGRAMS = [(CHAIN, str(TERMS)), (NESTED, str(TERMS + 1)), (NOTS, "True"), (ANDS, "True"),
+            (IN_LOOP, str(sum(i - TERMS for i in range(1, 21))))]
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("engine", ["ast", "vm", "tiered"])
+@pytest.mark.parametrize("source, expected", PROGRAMS, ids=["chain", "nested", "not", "and", "loop"])
+def test_deep_expression_runs_on_every_engine(source, expected, engine, optimize):
+    result = run_source(source, engine, optimize)
+    assert result['ok'], result['error']
+    assert result['output'] == [f"[SAÍDA SCL] {expected}"]
+
+
+@pytest.mark.parametrize("source, expected", PROGRAMS, ids=["chain", "nested", "not", "and", "loop"])
+def test_deep_expression_in_batch(source, expected):
+    batch = run_batch(source, 3)
+    assert batch.errors == [None] * 3
+    values, mask = batch.prints[-1]
+    assert mask.all() and [str(value) for value in values] == [expected] * 3
+
+
+def test_deep_expression_is_checked():
+    assert check_source(CHAIN) == []
+    diagnostics = check_source("INT x; BOOL b; x := 1; b := " + " + ".join(["x"] * TERMS) + ";")
+    assert [diagnostic.kind for diagnostic in diagnostics] == ['type']
+
+
+def test_deep_expression_error_keeps_its_line():
+    # O erro de execução acontece no fundo da árvore, depois da troca para a pilha explícita.
+    source = "INT x; INT y; x := 0;\ny := " + "(" * TERMS + "1 / x" + " + 1)" * TERMS + ";"
+    for engine in ("ast", "vm", "tiered"):
+        result = run_source(source, engine)
+        assert not result['ok'] and result['error']['lineno'] == 2, (engine, result['error'])
@@ -0,0 +1,80 @@
+# tests/test_engines.py
+
+# Todos os motores de execução devem produzir as mesmas saídas, a mesma Tabela de Símbolos
+# e os mesmos erros; o AST (SCLEvaluator) é a referência.
+
+import pytest
+
+from scl_runner import run_source
+from scl_batch import run_batch
+from scl_parser import ENGINES, parse_program
+from scl_errors import SCLRuntimeError
+from programs import PROGRAMS, INPUTS, with_input
+
+
+def outcome(result):
+    # A Tabela de Símbolos vai como texto: um REAL nan nunca é igual a ele mesmo.
+    return result['output'], repr(result['symbol_table']), result['error']
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("engine", ["vm", "tiered"])
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_engine_matches_ast(name, engine, optimize):
+    for n in INPUTS:
+        source = with_input(PROGRAMS[name], n)
+        assert outcome(run_source(source, engine, optimize)) == outcome(run_source(source)), n
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_optimizer_keeps_ast_results(name):
+    for n in INPUTS:
+        source = with_input(PROGRAMS[name], n)
+        assert outcome(run_source(source, 'ast', True)) == outcome(run_source(source)), n
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_batch_matches_ast(name, optimize):
+    batch = run_batch(PROGRAMS[name], len(INPUTS), {'n': INPUTS}, optimize)
+    for k, n in enumerate(INPUTS):
+        expected = run_source(with_input(PROGRAMS[name], n))
+        assert batch.output(k) == expected['output'], n
+        if expected['ok']:
+            assert batch.errors[k] is None and batch.symbol_table(k) == expected['symbol_table'], n
+        else:
+            error = expected['error']
+            assert batch.errors[k] == f"ERRO (linha {error['lineno']}): {error['message']}", n
+
+
+def test_programs_cover_errors():
+    # Os programas com erro só servem para a comparação se o erro realmente acontece para alguma entrada.
+    for name in ('division_by_zero', 'uninitialized', 'non_finite'):
+        results = [run_source(with_input(PROGRAMS[name], n)) for n in INPUTS]
+        assert any(result['ok'] for result in results) and not all(result['ok'] for result in results), name
+
+
+HOT_LOOP = """INT i; INT s;
+s := 0;
+FOR i := 1 TO 200 DO
+    s := s + 10 / (150 - i);
+    IF i > 120 THEN PRINT s; END_IF;
+END_FOR;
+"""
+
+
+@pytest.mark.parametrize("engine", ["ast", "vm", "tiered"])
+def test_output_errors_reach_the_caller(engine):
+    # Um erro da saída do PRINT não é um erro do programa SCL: ele não pode virar um SCLRuntimeError.
+    def output(value): raise ValueError("saída fechada")
+    with pytest.raises(ValueError, match="saída fechada"):
+        ENGINES[engine](parse_program(HOT_LOOP), {}, output)
+
+
+@pytest.mark.parametrize("engine", ["ast", "vm", "tiered"])
+def test_runtime_error_in_hot_loop(engine):
+    output = []
+    with pytest.raises(SCLRuntimeError) as error:
+        ENGINES[engine](parse_program(HOT_LOOP), {}, output.append)
+    assert error.value.lineno == 4 and error.value.message == "Erro de Execução: Divisão por zero."
+    assert len(output) == 29
@@ -0,0 +1,73 @@
+# tests/test_incremental.py
+
+# Depois de cada edição, o IncrementalDocument deve ter os mesmos tokens, a mesma AST e os mesmos
+# erros que uma análise completa do texto novo.
+
+import random
+
+import pytest
+
+from scl_ast import Node
+from scl_errors import SCLError
+from scl_incremental import IncrementalDocument
+from scl_parser import parse_program, tokenize
+from programs import PROGRAMS
+
+RESOLVER_ATTRIBUTES = ('slot', 'checked', 'layout', 'resolve_errors')
+
+
+def dump(value):
+    if type(value) is list: return [dump(item) for item in value]
+    if isinstance(value, Node):
+        return type(value).__name__, {name: dump(item) for name, item in vars(value).items() if name not in RESOLVER_ATTRIBUTES}
+    return value
+
+
+def full_parse(text):
+    try: tokens = [(token.type, token.value, token.position, token.lineno) for token in tokenize(text)]
+    except SCLError as error: return None, None, str(error)
+    try: return dump(parse_program(text)), tokens, None
+    except SCLError as error: return None, None, str(error)
+
+
+def incremental(document):
+    if document.errors:
+        lineno, message = document.errors[0]
+        return None, None, f"ERRO (linha {lineno}): {message}"
+    tokens = [(token.type, token.value, token.position, token.lineno) for token in document.tokens]
+    return dump(document.program()), tokens, None
+
+
+SOURCE = PROGRAMS['loops'] + PROGRAMS['nested_loops'].replace("INT n; ", "") + "\nIF s > 1 THEN\n  s := 2;\nELSE\n  s := 3; // fim\nEND_IF;\n"
+
+
+def test_fresh_document_matches_full_parse():
+    assert incremental(IncrementalDocument(SOURCE)) == full_parse(SOURCE)
+
+
+def test_edit_reuses_untouched_statements():
+    document = IncrementalDocument(SOURCE)
+    before = document.program().statements
+    position = document.offset(2, 5) # Dentro de 's := 0;'.
+    document.edit(position, position + 1, "7")
+    after = document.program().statements
+    assert document.reparsed_statements == 1
+    assert sum(old is new for old, new in zip(before, after)) == len(before) - 1
+    assert incremental(document) == full_parse(document.text)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_edits_match_full_parse(seed):
+    snippets = [';', 'END_IF;', 'IF s > 2 THEN ', '\n', ' ', 'x', 'INT z;\n', 'PRINT 3;', ':=', '1', '//', '#', '$',
+                'WHILE FALSE DO ', 'END_WHILE;', '', '(', ')']
+    rng = random.Random(seed)
+    text = SOURCE
+    document = IncrementalDocument(text)
+    for step in range(300):
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.choice([0, 0, 1, 2, 5, 12]))
+        snippet = rng.choice(snippets)
+        text = text[:start] + snippet + text[end:]
+        document.edit(start, end, snippet)
+        assert document.text == text
+        assert incremental(document) == full_parse(text), step
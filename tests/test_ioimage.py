@@ -0,0 +1,28 @@
+# tests/test_ioimage.py
+
+# Valores escritos na imagem de E/S pela linha de comando (python scl_ioimage.py descritor.json nome=valor).
+
+from token_definitions import TokenType
+from scl_parser import parse_program
+from scl_resolver import resolve_program
+from scl_ioimage import IOImage, parse_value
+
+BIG = 2 ** 53 + 1 # O primeiro INT que um float não representa.
+
+
+def test_parse_value_keeps_int_precision():
+    assert parse_value(TokenType.TYPE_INT, str(BIG)) == BIG
+    assert parse_value(TokenType.TYPE_REAL, "2.5") == 2.5
+    assert parse_value(TokenType.TYPE_BOOL, "true") is True
+
+
+def test_write_int_from_text(tmp_path):
+    layout, _ = resolve_program(parse_program("INT big; REAL r;"))
+    with IOImage(layout, path=str(tmp_path / "image.bin")) as image:
+        image.save_descriptor(str(tmp_path / "image.json"))
+        monitor = IOImage.open(str(tmp_path / "image.json"))
+        monitor.write('big', parse_value(monitor._by_name['big']['type'], str(BIG)))
+        slots = [None, None]
+        image.apply_inputs(slots, {})
+        monitor.close()
+    assert slots[0] == BIG
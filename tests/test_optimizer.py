@@ -0,0 +1,33 @@
+# tests/test_optimizer.py
+
+# O otimizador não pode mudar o resultado de um programa: uma expressão só sai do laço se
+# calculá-la antes não pode causar um erro que o laço original não causaria.
+
+import pytest
+
+from scl_runner import run_source
+from scl_parser import parse_program
+from scl_optimizer import optimize
+
+HUGE_INT = """INT n; INT big; INT i; REAL r; REAL s; REAL t;
+big := """ + "1" + "0" * 400 + """; r := 1.5; s := 0.0; t := 0.0;
+FOR i := 1 TO n DO s := s + big * r; t := t + r * 2.0; END_FOR;
+PRINT s; PRINT t;
+"""
+
+
+@pytest.mark.parametrize("n", [0, 1])
+@pytest.mark.parametrize("engine", ["ast", "vm", "tiered"])
+def test_hoisting_does_not_raise_early(engine, n):
+    # big * r estoura (OverflowError ao converter big para REAL): com n = 0 o laço não executa e não há erro;
+    # com n = 1 o erro acontece dentro do laço, como sem o otimizador.
+    source = HUGE_INT.replace("INT n;", f"INT n; n := {n};", 1)
+    expected = run_source(source)
+    assert (expected['error'] is None) == (n == 0)
+    result = run_source(source, engine, True)
+    assert (result['output'], result['error']) == (expected['output'], expected['error'])
+
+
+def test_mixed_arithmetic_stays_in_loop():
+    _, stats = optimize(parse_program(HUGE_INT))
+    assert stats.loops_optimized == 1 and stats.expressions_hoisted == 1 # Só r * 2.0 sai do laço.
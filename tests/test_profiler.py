@@ -0,0 +1,37 @@
+# tests/test_profiler.py
+
+from itertools import count
+
+from scl_parser import parse_program
+from scl_profiler import ProfilingEvaluator
+
+SOURCE = """INT i; INT s; s := 0;
+FOR i := 1 TO 3 DO s := s + i; END_FOR;
+WHILE s > 0 DO
+    s := s - 2;
+END_WHILE;
+"""
+
+
+def profile(source):
+    # Um relógio que avança 1 a cada leitura: os tempos ficam exatos.
+    evaluator = ProfilingEvaluator(output=lambda value: None, clock=count().__next__)
+    evaluator.run(parse_program(source))
+    return evaluator.profile_stats
+
+
+def test_same_line_statements_are_counted_once():
+    stats = profile(SOURCE).lines[2]
+    assert stats.count == 4 # O FOR e as 3 execuções da atribuição.
+    # Tempo do FOR: 3 atribuições de 2 leituras do relógio cada, mais a leitura do fim (1 + 3 * 2).
+    assert stats.total_time == 7
+    assert stats.self_time == stats.total_time # Nenhum comando de outra linha dentro dele.
+
+
+def test_total_time_includes_other_lines():
+    stats = profile(SOURCE)
+    loop, body = stats.lines[3], stats.lines[4]
+    assert body.count == 3 and body.total_time == body.self_time == 3
+    assert loop.total_time == loop.self_time + body.total_time
+    assert stats.loops[3].iterations == 3 and stats.loops[2].iterations == 3
+    assert sum(line.self_time for line in stats.lines.values()) <= stats.total_time
@@ -1,5 +1,7 @@
 # token_definitions.py
 
+from array import array
+
 # A classe TokenType funciona como um "catálogo" ou "enumeração". 
 # Ela centraliza todos os nomes dos tipos de tokens que nossa linguagem possui.
 # Usar constantes (variáveis com nomes em maiúsculas) em vez de strings literais
@@ -64,11 +66,27 @@ class TokenType:
     # Token especial para marcar o Fim do Arquivo (End Of File)
     EOF = "EOF"
 
+# Cada tipo de token também tem um código inteiro pequeno (a posição dele em TOKEN_TYPES), com o
+# mesmo nome em TokenCode (ex: TokenCode.IF). Os tokens guardados no TokenStore têm só o código, e o
+# parser compara códigos; as strings de TokenType continuam nos nós da AST e nas mensagens de erro.
+TOKEN_TYPES = tuple(value for name, value in vars(TokenType).items() if not name.startswith('__'))
+TOKEN_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+
+class TokenCode:
+    pass
+
+for _name, _token_type in vars(TokenType).items():
+    if not _name.startswith('__'): setattr(TokenCode, _name, TOKEN_CODES[_token_type])
+
 # A classe Token define a estrutura de um único token.
 # Cada vez que o analisador léxico reconhece uma parte do código (como um número,
 # uma palavra-chave ou um operador), ele cria um objeto desta classe
 # para armazenar todas as informações sobre o que foi encontrado.
+# (O tokenize() do SCLParser guarda os tokens em um TokenStore, abaixo; objetos Token
+# avulsos só aparecem no lexer caractere por caractere e onde os tokens são alterados.)
 class Token:
+    __slots__ = ('type', 'value', 'position', 'lineno')
+
     # O método __init__ é o construtor do objeto Token.
     def __init__(self, type, value, position=0, lineno=1):
         # self.type armazena o TIPO do token. Será uma das constantes da classe TokenType.
@@ -88,9 +106,96 @@ class Token:
         # Essencial para fornecer mensagens de erro claras ao usuário.
         self.lineno = lineno
 
+    @property
+    def code(self):
+        return TOKEN_CODES[self.type]
+
     # O método especial __str__ define como o objeto Token será exibido
     # quando tentarmos "imprimi-lo" (com o comando print).
     # Isso é extremamente útil para depurar o analisador, pois podemos ver
     # facilmente a sequência de tokens que está sendo gerada.
     def __str__(self):
-        return f"Token(type={self.type}, value='{self.value}', pos={self.position}, line={self.lineno})"
\ No newline at end of file
+        return f"Token(type={self.type}, value='{self.value}', pos={self.position}, line={self.lineno})"
+
+
+# Uma sequência de tokens guardada em colunas (struct-of-arrays) em vez de um objeto por token:
+# o código do tipo em um array('B'), a posição, a linha e o índice do valor em arrays('I'), e os
+# valores (nomes, números, palavras-chave) uma única vez cada, na tabela 'values'. São 13 bytes
+# por token, mais os valores distintos. store[i] devolve um TokenView, que tem a mesma interface
+# do Token (type, value, position, lineno), só para leitura.
+class TokenStore:
+    __slots__ = ('codes', 'positions', 'linenos', 'value_ids', 'values', 'value_index')
+
+    def __init__(self):
+        self.codes = array('B')
+        self.positions = array('I')
+        self.linenos = array('I')
+        self.value_ids = array('I')
+        self.values = []       # A tabela de valores (sem repetições).
+        self.value_index = {}  # (tipo Python, valor) -> índice em 'values' (True, 1 e 1.0 são valores diferentes).
+
+    def value_id(self, value):
+        """O índice de 'value' na tabela de valores (acrescentado, se ainda não está lá)."""
+        key = (type(value), value)
+        value_id = self.value_index.get(key)
+        if value_id is None:
+            value_id = self.value_index[key] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def append(self, token):
+        """Acrescenta um Token avulso (ou um TokenView) ao final."""
+        self.codes.append(TOKEN_CODES[token.type]); self.positions.append(token.position)
+        self.linenos.append(token.lineno); self.value_ids.append(self.value_id(token.value))
+
+    def pop(self):
+        """Remove o último token."""
+        self.codes.pop(); self.positions.pop(); self.linenos.pop(); self.value_ids.pop()
+
+    def shift(self, positions):
+        """Soma 'positions' à posição de todos os tokens (ex: o texto analisado era um trecho de um código maior)."""
+        if positions: self.positions = array('I', [position + positions for position in self.positions])
+
+    def to_tokens(self, start=0, stop=None):
+        """Os tokens [start, stop) como objetos Token avulsos (que podem ser alterados)."""
+        start, stop, _ = slice(start, stop).indices(len(self.codes))
+        values, value_ids, positions, linenos = self.values, self.value_ids, self.positions, self.linenos
+        return [Token(TOKEN_TYPES[code], values[value_ids[index]], positions[index], linenos[index])
+                for index, code in enumerate(self.codes[start:stop], start)]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice): return [TokenView(self, i) for i in range(*index.indices(len(self.codes)))]
+        if index < 0: index += len(self.codes)
+        if not 0 <= index < len(self.codes): raise IndexError("índice de token fora do TokenStore")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        return (TokenView(self, index) for index in range(len(self.codes)))
+
+
+class TokenView:
+    """Um token de um TokenStore, lido das colunas quando é pedido."""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store, self.index = store, index
+
+    @property
+    def code(self): return self.store.codes[self.index]
+
+    @property
+    def type(self): return TOKEN_TYPES[self.store.codes[self.index]]
+
+    @property
+    def value(self): return self.store.values[self.store.value_ids[self.index]]
+
+    @property
+    def position(self): return self.store.positions[self.index]
+
+    @property
+    def lineno(self): return self.store.linenos[self.index]
+
+    __str__ = Token.__str__